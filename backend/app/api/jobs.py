@@ -0,0 +1,26 @@
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException
+from app.models.job import Job
+from app.services.jobs.queue import get_job_queue
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+job_queue = get_job_queue()
+
+@router.get("", response_model=List[Job])
+async def list_jobs(project_id: Optional[str] = None):
+    return await asyncio.to_thread(job_queue.list, project_id)
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/{job_id}/cancel", response_model=Job)
+async def cancel_job(job_id: str):
+    job = await job_queue.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,82 +1,190 @@
 import os
+import uuid
+import asyncio
 import shutil
-from typing import List
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
-from app.models.project import Project, ProjectStatus
-from app.models.book import Book
+from typing import List, Literal, Optional
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.models.project import Project, ProjectStatus, ImportResult
+from app.models.book import Book, Sentence, SentencePatch, ChapterSummary, SentencePage
+from app.models.job import Job, JobType
 from app.services.project.manager import ProjectManager
+from app.services.project.storage import StoreBusy, VersionConflict
+from app.services.parser.validator import FileValidator
+from app.services.jobs.queue import get_job_queue
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 manager = ProjectManager()
 
+# Long-running work runs on the job queue, not inside the request
+job_queue = get_job_queue()
+job_queue.register(JobType.ANALYZE, manager.analyze_project)
+job_queue.register(JobType.SYNTHESIZE, manager.synthesize_project)
+
 @router.get("", response_model=List[Project])
-async def list_projects():
-    return manager.list_projects()
+async def list_projects(response: Response,
+                        status: Optional[ProjectStatus] = None,
+                        sort: Literal["updated_at", "created_at", "name", "status"] = "updated_at",
+                        order: Literal["asc", "desc"] = "desc",
+                        offset: int = Query(0, ge=0),
+                        limit: Optional[int] = Query(None, ge=1, le=1000)):
+    # Served from the project index; the total (before paging) is in X-Total-Count
+    projects, total = await asyncio.to_thread(manager.list_projects, status, sort, order == "desc", offset, limit)
+    response.headers["X-Total-Count"] = str(total)
+    return projects
 
 @router.post("", response_model=Project)
-async def create_project(file: UploadFile = File(...)):
+async def create_project(request: Request, file: UploadFile = File(...)):
+    # Refuse obviously oversized uploads before reading the body
+    try:
+        content_length = int(request.headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if content_length > (FileValidator.MAX_SIZE_MB + 1) * 1024 * 1024:
+        raise HTTPException(status_code=413, detail=f"File too large. Max: {FileValidator.MAX_SIZE_MB}MB")
+
     # Save temp file
     temp_dir = "backend/data/temp"
     os.makedirs(temp_dir, exist_ok=True)
-    temp_path = os.path.join(temp_dir, file.filename)
+    temp_path = os.path.join(temp_dir, os.path.basename(file.filename))
     
     try:
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Copied in chunks, size-checked as it streams
+        await FileValidator.save_upload(file, temp_path)
             
-        project = manager.create_project(temp_path, file.filename)
-        return project
+        # Parsed in a worker process, the event loop stays free
+        return await manager.import_book(temp_path, file.filename)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if os.path.exists(temp_path):
-            os.remove(temp_path)
+            await asyncio.to_thread(os.remove, temp_path)
+
+@router.post("/bulk", response_model=List[ImportResult])
+async def bulk_import(files: List[UploadFile] = File(...)):
+    # Parsing runs in the process pool; each book reports its own timing or error
+    temp_dir = os.path.join("backend/data/temp", str(uuid.uuid4()))
+    os.makedirs(temp_dir, exist_ok=True)
+    try:
+        saved = []
+        # A rejected upload (too large, wrong type) is reported in its slot, the others still import
+        rejected = {}
+        for index, file in enumerate(files):
+            # Own sub directory per file: same-named uploads must not overwrite each other
+            temp_path = os.path.join(temp_dir, str(index), os.path.basename(file.filename))
+            os.makedirs(os.path.dirname(temp_path))
+            try:
+                await FileValidator.save_upload(file, temp_path)
+            except HTTPException as e:
+                rejected[index] = ImportResult(filename=file.filename, error=str(e.detail))
+                continue
+            except Exception as e:
+                rejected[index] = ImportResult(filename=file.filename, error=str(e))
+                continue
+            saved.append((temp_path, file.filename))
+
+        imported = iter(await manager.import_books(saved))
+        return [rejected[i] if i in rejected else next(imported) for i in range(len(files))]
+    finally:
+        await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
 
 @router.get("/{project_id}", response_model=Project)
 async def get_project(project_id: str):
-    project = manager.get_project(project_id)
+    project = await asyncio.to_thread(manager.get_project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 @router.get("/{project_id}/content", response_model=Book)
 async def get_project_content(project_id: str):
-    book = manager.get_book_content(project_id)
-    if not book:
+    store = await asyncio.to_thread(manager.get_book_store, project_id)
+    if not store:
         raise HTTPException(status_code=404, detail="Book content not found")
-    return book
+    # Streamed straight from the chapter shards (sync iterator -> threadpool): the
+    # book is never parsed or serialized as a whole, which would hold the GIL for seconds
+    return StreamingResponse(store.iter_json(), media_type="application/json")
 
 @router.put("/{project_id}/content", response_model=Project)
 async def update_project_content(project_id: str, book: Book):
     try:
-        return manager.update_book_content(project_id, book)
+        return await asyncio.to_thread(manager.update_book_content, project_id, book)
+    except StoreBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError:
         raise HTTPException(status_code=404, detail="Project not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/{project_id}/analyze", response_model=Project)
-async def analyze_project(project_id: str, background_tasks: BackgroundTasks):
+@router.get("/{project_id}/chapters", response_model=List[ChapterSummary])
+async def list_chapters(project_id: str):
+    chapters = await asyncio.to_thread(manager.list_chapters, project_id)
+    if chapters is None:
+        raise HTTPException(status_code=404, detail="Book content not found")
+    return chapters
+
+@router.get("/{project_id}/chapters/{chapter_id}/sentences", response_model=SentencePage)
+async def get_chapter_sentences(project_id: str,
+                                chapter_id: str,
+                                offset: int = Query(0, ge=0),
+                                limit: int = Query(200, ge=1, le=2000),
+                                fields: Optional[str] = None):
+    # fields=text,speaker returns only those (plus id and version, needed for PATCH)
+    include = None
+    if fields:
+        include = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = include - set(Sentence.model_fields)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+        include |= {"id", "version"}
+
+    chapter = await asyncio.to_thread(manager.get_chapter, project_id, chapter_id)
+    if not chapter:
+        raise HTTPException(status_code=404, detail="Chapter not found")
+
+    page = chapter.sentences[offset:offset + limit]
+    return SentencePage(
+        chapter_id=chapter_id,
+        total=len(chapter.sentences),
+        offset=offset,
+        limit=limit,
+        sentences=[s.model_dump(mode="json", include=include) for s in page]
+    )
+
+@router.patch("/{project_id}/chapters/{chapter_id}/sentences", response_model=List[Sentence])
+async def patch_chapter_sentences(project_id: str, chapter_id: str, patches: List[SentencePatch]):
+    # All patches apply or none do; a stale version answers 409 with the current versions
+    if len({p.id for p in patches}) != len(patches):
+        raise HTTPException(status_code=400, detail="Each sentence may be patched only once per request")
     try:
-        # For MVP, we run inline or background? 
-        # User wants "Human-in-the-loop", so we should probably await it or use WebSocket.
-        # For now, let's await it to return the updated state immediately for the UI to refresh.
-        # Warning: This might timeout for large books.
-        return await manager.analyze_project(project_id)
-    except ValueError as e:
+        return await asyncio.to_thread(manager.patch_sentences, project_id, chapter_id, patches)
+    except VersionConflict as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "conflicts": e.conflicts})
+    except StoreBusy as e:
+        # An analysis or synthesis job is running on the book
+        raise HTTPException(status_code=409, detail=str(e))
+    except (ValueError, KeyError) as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/{project_id}/synthesize", response_model=Project)
-async def synthesize_project(project_id: str, background_tasks: BackgroundTasks):
+@router.post("/{project_id}/analyze", response_model=Job, status_code=202)
+async def analyze_project(project_id: str, resume: bool = False):
+    if not await asyncio.to_thread(manager.get_project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    # Poll GET /api/jobs/{job_id} for progress; the project becomes "analyzed" when it finishes.
+    # resume=true keeps sentences already analyzed by a failed or cancelled run.
+    return await job_queue.submit(project_id, JobType.ANALYZE, resume=resume)
+
+@router.post("/{project_id}/synthesize", response_model=Job, status_code=202)
+async def synthesize_project(project_id: str, resume: bool = False):
     try:
-        # Synthesis takes long, so background task is better.
-        # But for MVP simplicity and "Step-by-step" confirmation, let's use background 
-        # and frontend polls status.
-        background_tasks.add_task(manager.synthesize_project, project_id)
-        return manager.update_project_status(project_id, ProjectStatus.SYNTHESIZED)
+        # Frontend moves to the workbench right away and polls the job
+        await asyncio.to_thread(manager.update_project_status, project_id, ProjectStatus.SYNTHESIZED)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # resume=true keeps clips that an earlier run already produced
+    return await job_queue.submit(project_id, JobType.SYNTHESIZE, resume=resume)
+
+@router.get("/{project_id}/jobs", response_model=List[Job])
+async def list_project_jobs(project_id: str):
+    return await asyncio.to_thread(job_queue.list, project_id)
@@ -0,0 +1,48 @@
+import asyncio
+from fastapi import APIRouter
+from app.services.cleaner.llm_cache import get_llm_cache
+from app.services.tts.clip_cache import get_clip_cache
+from app.services.tts.voices import get_voice_cache
+from app.services.project.index import get_project_index
+from app.services.project.manager import PROJECTS_DIR
+from app.services.executors import executor_stats
+from app.services.loop_monitor import get_loop_monitor
+from app.services.http_clients import get_http_clients
+
+router = APIRouter(prefix="/api/system", tags=["system"])
+
+@router.get("/llm-cache")
+async def llm_cache_stats():
+    cache = get_llm_cache()
+    if not cache:
+        return {"enabled": False}
+    return {"enabled": True, **(await asyncio.to_thread(cache.stats))}
+
+@router.get("/clip-cache")
+async def clip_cache_stats():
+    cache = get_clip_cache()
+    if not cache:
+        return {"enabled": False}
+    return {"enabled": True, **(await asyncio.to_thread(cache.stats))}
+
+@router.get("/voice-cache")
+async def voice_cache_stats():
+    return get_voice_cache().stats()
+
+@router.get("/project-index")
+async def project_index_stats():
+    return {"projects": await asyncio.to_thread(get_project_index().count)}
+
+@router.post("/project-index/rebuild")
+async def rebuild_project_index():
+    # Re-sync after project directories were copied in or removed by hand
+    return {"projects": await asyncio.to_thread(get_project_index().rebuild, PROJECTS_DIR)}
+
+@router.get("/runtime")
+async def runtime_stats():
+    # Event-loop lag plus executor load, to check the loop stays responsive under load
+    return {"loop_lag": get_loop_monitor().stats(), "executors": executor_stats()}
+
+@router.get("/http-clients")
+async def http_client_stats():
+    return get_http_clients().stats()
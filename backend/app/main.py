@@ -1,11 +1,36 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.projects import router as project_router
+from app.api.jobs import router as job_router
+from app.api.system import router as system_router
+from app.services.jobs.queue import get_job_queue
+from app.services.executors import install_thread_pool, shutdown_executors
+from app.services.loop_monitor import get_loop_monitor
+from app.services.http_clients import get_http_clients
 
 from fastapi.staticfiles import StaticFiles
 import os
 
-app = FastAPI(title="Novel-to-Audio Tool")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Blocking work is offloaded; see app/services/executors.py
+    install_thread_pool(asyncio.get_running_loop())
+    loop_monitor = get_loop_monitor()
+    loop_monitor.start()
+    # Pooled LLM/TTS connections shared by every job
+    http_clients = get_http_clients()
+    http_clients.open()
+    job_queue = get_job_queue()
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    await http_clients.aclose()
+    await loop_monitor.stop()
+    shutdown_executors()
+
+app = FastAPI(title="Novel-to-Audio Tool", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -22,7 +47,11 @@ app.mount("/static", StaticFiles(directory="backend/data"), name="static")
 
 # Include Routers
 app.include_router(project_router)
+app.include_router(job_router)
+app.include_router(system_router)
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    # Loop lag tells whether requests are being served promptly, not just accepted
+    lag = get_loop_monitor().stats()
+    return {"status": "healthy", "loop_lag_ms": {k: lag.get(k) for k in ("last_ms", "p99_ms", "max_ms")}}
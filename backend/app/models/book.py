@@ -1,7 +1,10 @@
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
 
+# Emotion vector length the TTS server expects
+EMOTION_VECTOR_DIMS = 8
+
 class Sentence(BaseModel):
     id: str
     text: str
@@ -13,10 +16,14 @@ class Sentence(BaseModel):
     speaker: Optional[str] = None
     emotion_vector: Optional[List[float]] = None
     audio_path: Optional[str] = None
+    # Bumped on every partial update, used for optimistic concurrency
+    version: int = 0
 
 class Chapter(BaseModel):
     id: str
     title: str
+    # Header type that started the chapter: chapter, prologue, epilogue, extra
+    kind: Optional[str] = None
     sentences: List[Sentence] = Field(default_factory=list)
     audio_path: Optional[str] = None
     duration: float = 0.0
@@ -29,3 +36,42 @@ class Book(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
     created_at: datetime = Field(default_factory=datetime.now)
     status: str = "UPLOADED" # UPLOADED, PARSING, CLEANING, SYNTHESIZING, COMPLETED, FAILED
+
+class SentencePatch(BaseModel):
+    """
+    Partial update of one sentence. Only the fields that are sent are changed;
+    metadata is merged key by key (null removes a key). version must match the
+    stored version or the patch is rejected.
+    """
+    id: str
+    version: int
+    text: Optional[str] = None
+    is_noise: Optional[bool] = None
+    speaker: Optional[str] = None
+    emotion_vector: Optional[List[float]] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+    @model_validator(mode="after")
+    def check_values(self) -> "SentencePatch":
+        # Optional here only so that absent fields stay unchanged; the sentence needs a value
+        for field in ("text", "is_noise"):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f"{field} cannot be null")
+        if self.emotion_vector is not None and len(self.emotion_vector) != EMOTION_VECTOR_DIMS:
+            raise ValueError(f"emotion_vector must have {EMOTION_VECTOR_DIMS} values")
+        return self
+
+class ChapterSummary(BaseModel):
+    id: str
+    title: str
+    kind: Optional[str] = None
+    audio_path: Optional[str] = None
+    duration: float = 0.0
+    sentence_count: int = 0
+
+class SentencePage(BaseModel):
+    chapter_id: str
+    total: int
+    offset: int
+    limit: int
+    sentences: List[Dict[str, Any]] = Field(default_factory=list)
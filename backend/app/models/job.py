@@ -0,0 +1,37 @@
+from enum import Enum
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class JobType(str, Enum):
+    ANALYZE = "analyze"
+    SYNTHESIZE = "synthesize"
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class Job(BaseModel):
+    id: str
+    project_id: str
+    type: JobType
+    status: JobStatus = JobStatus.QUEUED
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    # Skip work already checkpointed by an earlier, interrupted run
+    resume: bool = False
+
+    # Progress counters (sentences)
+    done: int = 0
+    total: int = 0
+    throughput: Optional[float] = None # sentences / second
+    eta_seconds: Optional[float] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (JobStatus.QUEUED, JobStatus.RUNNING)
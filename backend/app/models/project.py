@@ -21,3 +21,15 @@ class Project(BaseModel):
     # Paths to data files
     book_path: Optional[str] = None # Path to book.json
     audio_dir: Optional[str] = None # Path to output audio
+
+class ImportResult(BaseModel):
+    """
+    Outcome of one book in a bulk import.
+    """
+    filename: str
+    project_id: Optional[str] = None
+    error: Optional[str] = None
+    chapters: int = 0
+    sentences: int = 0
+    parse_seconds: float = 0.0 # time spent in the worker
+    total_seconds: float = 0.0 # including time queued for a worker
@@ -0,0 +1,403 @@
+import sys
+import threading
+from array import array
+from itertools import accumulate, chain, repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import numpy as np
+from app.models.book import Book, Chapter, Sentence
+
+# [高兴, 愤怒, 悲伤, 害怕, 厌恶, 忧郁, 惊讶, 平静]
+EMOTION_DIMS = 8
+# Short metadata strings (content types, voice paths, emotion labels) repeat on
+# almost every sentence and are interned; longer ones are usually unique
+INTERN_MAX_LEN = 64
+
+_MISSING = object()
+_NO_EMOTION = (0.0,) * EMOTION_DIMS
+
+class SentenceTable:
+    """
+    Struct-of-arrays form of a book's sentences for pipeline work.
+
+    One row per sentence, in reading order. Fixed-width fields are NumPy
+    columns (emotions as an (n, 8) float32 matrix), speakers and voice ids are
+    interned into small lookup lists, and sentence texts are offsets into one
+    string per chapter. Metadata is stored per key, not per sentence.
+
+    The analysis job works on this form from BookStore.load_table to
+    save_table. Sentence/Chapter models are only built at the API boundary:
+    sentence(i) (a row handed to a per-sentence LLM prompt), iter_chapters()
+    or to_book().
+
+    Rows are written on the event loop while a checkpoint thread may be
+    encoding chapters; both sides take lock, so a saved row is never half-updated.
+    """
+    def __init__(self, book: Book):
+        # Book-level fields only; chapters live in the table
+        self.book = book.model_copy(update={"chapters": []})
+        # Chapter shells without sentences; chapter c owns rows offsets[c]:offsets[c + 1]
+        self.chapters: List[Chapter] = []
+        self.offsets: List[int] = [0]
+        self.speakers: List[str] = []
+        self.voices: List[str] = []
+        self.lock = threading.Lock()
+
+        self._texts: List[str] = []
+        self._text_overrides: Dict[int, str] = {}
+        self._id_overrides: Dict[int, str] = {}
+        self._audio_paths: Dict[int, str] = {}
+        # Vectors that are not EMOTION_DIMS long (hand-edited) stay as lists
+        self._odd_emotions: Dict[int, List[float]] = {}
+        # Metadata key -> one value per row; voice_id has its own interned column and
+        # only keeps its place here (None) so dicts come back in the original key order
+        self._meta: Dict[str, Optional[List[Any]]] = {}
+        self._speaker_index: Dict[str, int] = {}
+        self._voice_index: Dict[str, int] = {}
+        self._columns = {
+            name: array(code) for name, code in (
+                ("chapter", "i"), ("id_num", "i"), ("text_start", "i"), ("text_end", "i"),
+                ("start_pos", "i"), ("end_pos", "i"), ("speaker_idx", "i"), ("voice_idx", "i"),
+                ("version", "i"), ("is_noise", "b"), ("has_emotion", "b"), ("emotions", "f")
+            )
+        }
+
+    # Construction
+
+    @classmethod
+    def from_book(cls, book: Book) -> "SentenceTable":
+        return cls.from_chapters(book, book.chapters)
+
+    @classmethod
+    def from_chapters(cls, book: Book, chapters: Iterable[Chapter]) -> "SentenceTable":
+        """
+        Builds the table chapter by chapter, so the chapters can be streamed
+        from storage without holding the whole Book.
+        """
+        return cls.from_chapter_dicts(book, (chapter.model_dump() for chapter in chapters))
+
+    @classmethod
+    def from_chapter_dicts(cls, book: Book, chapters: Iterable[Dict[str, Any]]) -> "SentenceTable":
+        """
+        Same, from plain chapter dicts (e.g. json.loads of a stored shard), which
+        skips building the models altogether. The dicts are trusted, not validated.
+        """
+        table = cls(book)
+        for chapter in chapters:
+            table._add_chapter(chapter)
+        table._freeze()
+        return table
+
+    def _add_chapter(self, chapter: Dict[str, Any]):
+        # Column at a time rather than row at a time: one comprehension per field
+        c = len(self.chapters)
+        sentences = chapter.get("sentences") or []
+        self.chapters.append(Chapter(**{k: v for k, v in chapter.items() if k != "sentences"}))
+        cols = self._columns
+        first = self.offsets[-1]
+        n = len(sentences)
+
+        cols["chapter"].extend([c] * n)
+        prefix = f"{chapter['id']}_s"
+        for k, sentence in enumerate(sentences):
+            num = self._id_num(prefix, sentence["id"])
+            cols["id_num"].append(num)
+            if num < 0:
+                self._id_overrides[first + k] = sentence["id"]
+
+        texts = [sentence["text"] for sentence in sentences]
+        ends = list(accumulate(len(t) for t in texts))
+        cols["text_start"].extend([0] + ends[:-1] if ends else [])
+        cols["text_end"].extend(ends)
+        self._texts.append("".join(texts))
+
+        for field in ("start_pos", "end_pos"):
+            values = [sentence.get(field) for sentence in sentences]
+            cols[field].extend([-1 if v is None else v for v in values])
+        cols["version"].extend([sentence.get("version", 0) for sentence in sentences])
+        cols["is_noise"].extend([bool(sentence.get("is_noise")) for sentence in sentences])
+        cols["speaker_idx"].extend([self._intern_speaker(sentence.get("speaker")) for sentence in sentences])
+
+        vectors = [sentence.get("emotion_vector") for sentence in sentences]
+        has_emotion = [v is not None and len(v) == EMOTION_DIMS for v in vectors]
+        cols["has_emotion"].extend(has_emotion)
+        cols["emotions"].extend(chain.from_iterable(
+            v if ok else _NO_EMOTION for v, ok in zip(vectors, has_emotion)
+        ))
+        for k, (v, ok) in enumerate(zip(vectors, has_emotion)):
+            if v is not None and not ok:
+                self._odd_emotions[first + k] = list(v)
+
+        for k, sentence in enumerate(sentences):
+            if sentence.get("audio_path") is not None:
+                self._audio_paths[first + k] = sentence["audio_path"]
+
+        metas = [sentence.get("metadata") or {} for sentence in sentences]
+        # Keys in first-seen order, so dicts come back in the same order
+        for key in dict.fromkeys(key for meta in metas for key in meta):
+            if key == "voice_id":
+                self._meta.setdefault(key, None)
+                continue
+            values = self._meta.get(key)
+            if values is None:
+                values = self._meta[key] = []
+            values.extend([_MISSING] * (first - len(values)))
+            values.extend([
+                sys.intern(v) if type(v) is str and len(v) <= INTERN_MAX_LEN else v
+                for v in (meta.get(key, _MISSING) for meta in metas)
+            ])
+        cols["voice_idx"].extend([self._intern_voice(meta.get("voice_id", _MISSING)) for meta in metas])
+        self.offsets.append(first + n)
+
+    def _freeze(self):
+        # Build-time arrays become fixed-size NumPy columns
+        cols = self._columns
+        n = len(self)
+        for name in ("chapter", "id_num", "text_start", "text_end", "start_pos", "end_pos",
+                     "speaker_idx", "voice_idx", "version"):
+            setattr(self, name, np.frombuffer(cols[name], dtype=np.int32).copy())
+        self.is_noise = np.frombuffer(cols["is_noise"], dtype=np.int8).astype(bool)
+        self.has_emotion = np.frombuffer(cols["has_emotion"], dtype=np.int8).astype(bool)
+        self.emotions = np.frombuffer(cols["emotions"], dtype=np.float32).reshape(n, EMOTION_DIMS).copy()
+        for values in self._meta.values():
+            if values is not None:
+                values.extend([_MISSING] * (n - len(values)))
+        self._columns = {}
+
+    def __len__(self) -> int:
+        return self.offsets[-1]
+
+    # Interning
+
+    def _intern_speaker(self, speaker: Optional[str]) -> int:
+        if speaker is None:
+            return -1
+        index = self._speaker_index.get(speaker)
+        if index is None:
+            index = self._speaker_index[speaker] = len(self.speakers)
+            self.speakers.append(speaker)
+        return index
+
+    def _intern_voice(self, voice: Any) -> int:
+        if voice is _MISSING:
+            return -1
+        index = self._voice_index.get(voice)
+        if index is None:
+            index = self._voice_index[voice] = len(self.voices)
+            self.voices.append(voice)
+        return index
+
+    @staticmethod
+    def _id_num(prefix: str, sentence_id: str) -> int:
+        # Splitter ids are "<chapter id>_s<n>" and are stored as n alone
+        num = sentence_id[len(prefix):] if sentence_id.startswith(prefix) else ""
+        if num.isdigit() and str(int(num)) == num:
+            return int(num)
+        return -1
+
+    def _set_meta(self, row: int, key: str, value: Any):
+        values = self._meta.get(key)
+        if values is None:
+            values = self._meta[key] = []
+        if len(values) <= row:
+            values.extend([_MISSING] * (row + 1 - len(values)))
+        if isinstance(value, str) and len(value) <= INTERN_MAX_LEN:
+            value = sys.intern(value)
+        values[row] = value
+
+    # Row access
+
+    def chapter_rows(self, c: int) -> range:
+        return range(self.offsets[c], self.offsets[c + 1])
+
+    def sentence_id(self, i: int) -> str:
+        num = self.id_num[i]
+        if num < 0:
+            return self._id_overrides[i]
+        return f"{self.chapters[self.chapter[i]].id}_s{num}"
+
+    def text(self, i: int) -> str:
+        override = self._text_overrides.get(i)
+        if override is not None:
+            return override
+        return self._texts[self.chapter[i]][self.text_start[i]:self.text_end[i]]
+
+    def set_text(self, i: int, text: str):
+        if text == self._texts[self.chapter[i]][self.text_start[i]:self.text_end[i]]:
+            self._text_overrides.pop(i, None)
+        else:
+            self._text_overrides[i] = text
+
+    def speaker(self, i: int) -> Optional[str]:
+        index = self.speaker_idx[i]
+        return self.speakers[index] if index >= 0 else None
+
+    def set_speaker(self, i: int, speaker: Optional[str]):
+        self.speaker_idx[i] = self._intern_speaker(speaker)
+
+    def emotion_vector(self, i: int) -> Optional[List[float]]:
+        if self.has_emotion[i]:
+            return np.round(self.emotions[i].astype(np.float64), 6).tolist()
+        return self._odd_emotions.get(i)
+
+    def set_emotion_vector(self, i: int, vector: Optional[List[float]]):
+        self._odd_emotions.pop(i, None)
+        if vector is not None and len(vector) == EMOTION_DIMS:
+            self.emotions[i] = vector
+            self.has_emotion[i] = True
+            return
+        self.emotions[i] = 0.0
+        self.has_emotion[i] = False
+        if vector is not None:
+            self._odd_emotions[i] = list(vector)
+
+    def metadata(self, i: int) -> Dict[str, Any]:
+        return self._sentence_dicts(i, i + 1)[0]["metadata"]
+
+    def get_metadata(self, i: int, key: str, default: Any = None) -> Any:
+        if key == "voice_id":
+            return self.voices[self.voice_idx[i]] if self.voice_idx[i] >= 0 else default
+        values = self._meta.get(key)
+        if values is None or values[i] is _MISSING:
+            return default
+        return values[i]
+
+    def column(self, key: str) -> List[Any]:
+        """
+        One metadata key for every row (None where unset).
+        """
+        if key == "voice_id":
+            return [self.voices[v] if v >= 0 else None for v in self.voice_idx.tolist()]
+        values = self._meta.get(key)
+        if values is None:
+            return [None] * len(self)
+        return [None if v is _MISSING else v for v in values]
+
+    def set_metadata(self, i: int, key: str, value: Any):
+        if key == "voice_id":
+            self._meta.setdefault(key, None)
+            self.voice_idx[i] = self._intern_voice(value)
+            return
+        if key not in self._meta:
+            self._meta[key] = [_MISSING] * len(self)
+        self._set_meta(i, key, value)
+
+    def pop_metadata(self, i: int, key: str):
+        if key == "voice_id":
+            self.voice_idx[i] = -1
+            return
+        values = self._meta.get(key)
+        if values is not None:
+            values[i] = _MISSING
+
+    # Model boundary
+
+    def sentence(self, i: int) -> Sentence:
+        return Sentence.model_construct(**self._sentence_dicts(i, i + 1)[0])
+
+    def _sentence_dicts(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        # Slice every column once and zip plain Python values
+        chapter = self.chapter[start:stop].tolist()
+        id_num = self.id_num[start:stop].tolist()
+        text_start = self.text_start[start:stop].tolist()
+        text_end = self.text_end[start:stop].tolist()
+        start_pos = [p if p >= 0 else None for p in self.start_pos[start:stop].tolist()]
+        end_pos = [p if p >= 0 else None for p in self.end_pos[start:stop].tolist()]
+        speakers = [self.speakers[s] if s >= 0 else None for s in self.speaker_idx[start:stop].tolist()]
+        # float32 keeps ~7 significant digits; rounding gives back the LLM's 0.1 instead of 0.10000000149
+        emotions = np.round(self.emotions[start:stop].astype(np.float64), 6).tolist()
+        for k, has in enumerate(self.has_emotion[start:stop].tolist()):
+            if not has:
+                emotions[k] = self._odd_emotions.get(start + k)
+
+        keys = list(self._meta)
+        columns = [
+            [self.voices[v] if v >= 0 else _MISSING for v in self.voice_idx[start:stop].tolist()]
+            if values is None else values[start:stop]
+            for values in self._meta.values()
+        ]
+        metadata = [
+            {key: v for key, v in zip(keys, row) if v is not _MISSING}
+            for row in (zip(*columns) if columns else repeat((), stop - start))
+        ]
+
+        ids = [
+            f"{self.chapters[c].id}_s{num}" if num >= 0 else self._id_overrides[i]
+            for i, c, num in zip(range(start, stop), chapter, id_num)
+        ]
+        texts = [self._texts[c][s:e] for c, s, e in zip(chapter, text_start, text_end)]
+        if self._text_overrides:
+            texts = [self._text_overrides.get(i, text) for i, text in zip(range(start, stop), texts)]
+        audio_paths = [self._audio_paths.get(i) for i in range(start, stop)] if self._audio_paths else repeat(None)
+
+        # Same fields, in the same order, as Sentence
+        return [
+            {"id": sid, "text": text, "start_pos": sp, "end_pos": ep, "metadata": meta,
+             "is_noise": noise, "speaker": speaker, "emotion_vector": emotion,
+             "audio_path": audio, "version": version}
+            for sid, text, sp, ep, meta, noise, speaker, emotion, audio, version in zip(
+                ids, texts, start_pos, end_pos, metadata, self.is_noise[start:stop].tolist(),
+                speakers, emotions, audio_paths, self.version[start:stop].tolist()
+            )
+        ]
+
+    def set_sentence(self, i: int, sentence: Sentence):
+        """
+        Writes a (modified) sentence model back into row i.
+        """
+        self.id_num[i] = self._id_num(f"{self.chapters[self.chapter[i]].id}_s", sentence.id)
+        if self.id_num[i] < 0:
+            self._id_overrides[i] = sentence.id
+        else:
+            self._id_overrides.pop(i, None)
+        self.set_text(i, sentence.text)
+        self.start_pos[i] = -1 if sentence.start_pos is None else sentence.start_pos
+        self.end_pos[i] = -1 if sentence.end_pos is None else sentence.end_pos
+        self.is_noise[i] = sentence.is_noise
+        self.speaker_idx[i] = self._intern_speaker(sentence.speaker)
+        self.set_emotion_vector(i, sentence.emotion_vector)
+        if sentence.audio_path is None:
+            self._audio_paths.pop(i, None)
+        else:
+            self._audio_paths[i] = sentence.audio_path
+        self.version[i] = sentence.version
+        for values in self._meta.values():
+            if values is not None:
+                values[i] = _MISSING
+        self.voice_idx[i] = -1
+        for key, value in sentence.metadata.items():
+            self.set_metadata(i, key, value)
+
+    def chapter_dict(self, c: int) -> Dict[str, Any]:
+        """
+        Chapter c as a plain dict (Chapter.model_dump() shape), for writing its
+        shard without building the models.
+        """
+        chapter = self.chapters[c].model_dump()
+        with self.lock:
+            chapter["sentences"] = self._sentence_dicts(self.offsets[c], self.offsets[c + 1])
+        return chapter
+
+    def iter_chapter_dicts(self) -> Iterator[Dict[str, Any]]:
+        for c in range(len(self.chapters)):
+            yield self.chapter_dict(c)
+
+    def iter_chapters(self) -> Iterator[Chapter]:
+        for c, shell in enumerate(self.chapters):
+            # Values come from validated models or trusted shards, so skip validation
+            sentences = [Sentence.model_construct(**d) for d in self._sentence_dicts(self.offsets[c], self.offsets[c + 1])]
+            yield shell.model_copy(update={"sentences": sentences})
+
+    def to_book(self) -> Book:
+        return self.book.model_copy(update={"chapters": list(self.iter_chapters())})
+
+    def nbytes(self) -> int:
+        """
+        Approximate footprint: NumPy columns plus chapter texts and side tables.
+        """
+        arrays = sum(getattr(self, name).nbytes for name in (
+            "chapter", "id_num", "text_start", "text_end", "start_pos", "end_pos",
+            "speaker_idx", "voice_idx", "version", "is_noise", "has_emotion", "emotions"
+        ))
+        texts = sum(sys.getsizeof(t) for t in self._texts)
+        meta = sum(sys.getsizeof(values) for values in self._meta.values() if values is not None)
+        return arrays + texts + meta
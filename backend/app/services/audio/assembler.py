@@ -4,62 +4,143 @@ import shutil
 import subprocess
 from typing import List
 from app.models.book import Book, Chapter
+from app.services.audio.wav import DEFAULT_FORMAT, concat_wav, read_wav_info, silence_frames
 
 class AudioAssembler:
-    def __init__(self):
+    def __init__(self, use_pcm: bool = True):
         self.silence_duration_ms = 300
         self.chapter_silence_ms = 1000
+        # Concatenate PCM WAV clips in-process; ffmpeg is only used when formats differ
+        self.use_pcm = use_pcm
 
     def assemble_book(self, book: Book, output_dir: str) -> str:
         """
         Assembles the book audio and returns the path to the output directory.
         """
+        book_dir = self.prepare_book(book, output_dir)
+        
+        for chapter in book.chapters:
+            self.assemble_chapter(chapter, book_dir, output_dir)
+
+        # Generate metadata
+        self.write_metadata(book, book_dir)
+        self.finish_book(output_dir)
+        
+        return book_dir
+
+    def prepare_book(self, book: Book, output_dir: str) -> str:
+        """
+        Creates the output layout. Chapters can then be assembled one by one
+        with assemble_chapter.
+        """
         book_dir = os.path.join(output_dir, self._sanitize_filename(book.title))
         chapters_dir = os.path.join(book_dir, "chapters")
         os.makedirs(chapters_dir, exist_ok=True)
+        return book_dir
+
+    def assemble_chapter(self, chapter: Chapter, book_dir: str, output_dir: str) -> float:
+        """
+        Concatenates one chapter's clips, sets chapter.audio_path/duration
+        and returns the duration.
+        """
+        chapters_dir = os.path.join(book_dir, "chapters")
+        chapter_filename = f"{chapter.id}_{self._sanitize_filename(chapter.title)}.wav"
+        chapter_path = os.path.join(chapters_dir, chapter_filename)
+        clips = [
+            s.audio_path for s in chapter.sentences
+            if s.audio_path and os.path.exists(s.audio_path)
+        ]
+
+        duration = self._concat_pcm(clips, chapter_path) if self.use_pcm else None
+        if duration is None:
+            duration = self._concat_ffmpeg(clips, chapter_path, chapters_dir, chapter.id, output_dir)
+
+        chapter.audio_path = chapter_path
+        chapter.duration = duration
+        return duration
+
+    def _concat_pcm(self, clips: List[str], chapter_path: str):
+        """
+        In-process concatenation. Returns the duration, or None when the clips
+        are not all PCM WAV of the same format.
+        """
+        fmt = None
+        total_frames = 0
+        for clip in clips:
+            info = read_wav_info(clip)
+            if info is None or (fmt is not None and info[0] != fmt):
+                return None
+            fmt = info[0]
+            total_frames += info[1]
+
+        fmt = fmt or DEFAULT_FORMAT
+        sentence_gap = silence_frames(fmt, self.silence_duration_ms)
+        chapter_gap = silence_frames(fmt, self.chapter_silence_ms)
+
+        # Same layout as the ffmpeg path: clip, gap, clip, gap, ..., chapter gap
+        layout = []
+        for clip in clips:
+            layout.append(clip)
+            layout.append(sentence_gap)
+        layout.append(chapter_gap)
+        total_frames += sentence_gap * len(clips) + chapter_gap
 
-        total_duration = 0
+        concat_wav(layout, chapter_path, fmt, total_frames)
+        return total_frames / fmt.framerate
+
+    def _concat_ffmpeg(self, clips: List[str], chapter_path: str, chapters_dir: str, chapter_id: str, output_dir: str) -> float:
+        silence_sentence_path = self._silence_path(output_dir, "sentence")
+        silence_chapter_path = self._silence_path(output_dir, "chapter")
+        # Silence files are only needed on this path, create them once per book
+        if not os.path.exists(silence_sentence_path):
+            self._create_silence(silence_sentence_path, self.silence_duration_ms)
+        if not os.path.exists(silence_chapter_path):
+            self._create_silence(silence_chapter_path, self.chapter_silence_ms)
+
+        file_list_path = os.path.join(chapters_dir, f"{chapter_id}_files.txt")
+        with open(file_list_path, "w") as f:
+            for clip in clips:
+                f.write(f"file '{os.path.abspath(clip)}'\n")
+                f.write(f"file '{os.path.abspath(silence_sentence_path)}'\n")
+            
+            # Add chapter silence at end
+            f.write(f"file '{os.path.abspath(silence_chapter_path)}'\n")
         
-        # Create silence files
-        silence_sentence_path = os.path.join(output_dir, "silence_sentence.wav")
-        silence_chapter_path = os.path.join(output_dir, "silence_chapter.wav")
-        self._create_silence(silence_sentence_path, self.silence_duration_ms)
-        self._create_silence(silence_chapter_path, self.chapter_silence_ms)
+        # Concatenate
+        self._concat_files(file_list_path, chapter_path)
         
-        for chapter in book.chapters:
-            file_list_path = os.path.join(chapters_dir, f"{chapter.id}_files.txt")
-            with open(file_list_path, "w") as f:
-                for sentence in chapter.sentences:
-                    if sentence.audio_path and os.path.exists(sentence.audio_path):
-                        f.write(f"file '{os.path.abspath(sentence.audio_path)}'\n")
-                        f.write(f"file '{os.path.abspath(silence_sentence_path)}'\n")
-                
-                # Add chapter silence at end
-                f.write(f"file '{os.path.abspath(silence_chapter_path)}'\n")
-            
-            # Concatenate
-            chapter_filename = f"{chapter.id}_{self._sanitize_filename(chapter.title)}.wav"
-            chapter_path = os.path.join(chapters_dir, chapter_filename)
-            
-            self._concat_files(file_list_path, chapter_path)
-            
-            # Get duration
-            duration = self._get_duration(chapter_path)
-            chapter.audio_path = chapter_path
-            chapter.duration = duration
-            total_duration += duration
-            
-            # Cleanup list
-            os.remove(file_list_path)
+        # Get duration
+        duration = self._get_duration(chapter_path)
+        
+        # Cleanup list
+        os.remove(file_list_path)
+        return duration
 
-        # Generate metadata
+    def cleanup_chapter_clips(self, chapter: Chapter):
+        """
+        Removes the per-sentence clips of an assembled chapter to free disk space.
+        Sentence audio paths are left as they are: a resumed run skips the chapter
+        by its own audio_path (see SynthesisScheduler.is_assembled).
+        """
+        for sentence in chapter.sentences:
+            if sentence.audio_path and os.path.exists(sentence.audio_path):
+                os.remove(sentence.audio_path)
+
+    def write_metadata(self, book: Book, book_dir: str):
+        """
+        (Re)writes metadata.json from the chapters assembled so far.
+        """
+        total_duration = sum(c.duration for c in book.chapters if c.audio_path)
         self._generate_metadata(book, book_dir, total_duration)
-        
+
+    def finish_book(self, output_dir: str):
         # Cleanup silence
-        if os.path.exists(silence_sentence_path): os.remove(silence_sentence_path)
-        if os.path.exists(silence_chapter_path): os.remove(silence_chapter_path)
-        
-        return book_dir
+        for kind in ("sentence", "chapter"):
+            path = self._silence_path(output_dir, kind)
+            if os.path.exists(path): os.remove(path)
+
+    def _silence_path(self, output_dir: str, kind: str) -> str:
+        return os.path.join(output_dir, f"silence_{kind}.wav")
 
     def _create_silence(self, path: str, duration_ms: int):
         duration_sec = duration_ms / 1000.0
@@ -90,6 +171,7 @@ class AudioAssembler:
             "author": book.author,
             "duration": total_duration,
             "total_chapters": len(book.chapters),
+            "assembled_chapters": sum(1 for c in book.chapters if c.audio_path),
             "chapters": [
                 {
                     "id": c.id,
@@ -0,0 +1,80 @@
+import wave
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+# Frames copied per read when streaming clip data into the output file
+COPY_FRAMES = 1 << 16
+
+class WavFormat(NamedTuple):
+    channels: int
+    sampwidth: int
+    framerate: int
+
+# What `ffmpeg -f lavfi -i anullsrc=r=24000:cl=mono` produces
+DEFAULT_FORMAT = WavFormat(channels=1, sampwidth=2, framerate=24000)
+
+def read_wav_info(path: str) -> Optional[Tuple[WavFormat, int]]:
+    """
+    Returns (format, frame count) from the header, or None if the file is not
+    plain PCM WAV (compressed, float/extensible on older Pythons, or broken).
+    """
+    try:
+        with wave.open(path, "rb") as w:
+            return WavFormat(w.getnchannels(), w.getsampwidth(), w.getframerate()), w.getnframes()
+    except (wave.Error, EOFError, OSError):
+        return None
+
+def is_valid_clip(path: str) -> bool:
+    """
+    True if path looks like a complete WAV clip (used to skip work on resume).
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(12)
+        if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+            return False
+    except OSError:
+        return False
+    info = read_wav_info(path)
+    # Non-PCM clips cannot be inspected further, trust the RIFF header
+    return info is None or info[1] > 0
+
+def silence_frames(fmt: WavFormat, duration_ms: int) -> int:
+    return int(round(fmt.framerate * duration_ms / 1000.0))
+
+# A part is either a clip path or a number of silent frames
+Part = Union[str, int]
+
+def concat_wav(parts: List[Part], output_path: str, fmt: WavFormat, total_frames: int) -> int:
+    """
+    Concatenates PCM clips and silences into output_path.
+    The header is written once with the final frame count, then clip data is
+    stream-copied and silence is written as zero-filled frames.
+    Returns the number of frames written.
+    """
+    frame_bytes = fmt.channels * fmt.sampwidth
+    with wave.open(output_path, "wb") as out:
+        out.setnchannels(fmt.channels)
+        out.setsampwidth(fmt.sampwidth)
+        out.setframerate(fmt.framerate)
+        out.setnframes(total_frames)
+
+        zero_chunk = b""
+        for part in parts:
+            if isinstance(part, int):
+                remaining = part
+                while remaining > 0:
+                    n = min(remaining, COPY_FRAMES)
+                    if len(zero_chunk) != n * frame_bytes:
+                        # 8-bit PCM is unsigned, its silence is 0x80
+                        zero_chunk = (b"\x80" if fmt.sampwidth == 1 else b"\x00") * (n * frame_bytes)
+                    out.writeframesraw(zero_chunk)
+                    remaining -= n
+                continue
+
+            with wave.open(part, "rb") as clip:
+                while True:
+                    data = clip.readframes(COPY_FRAMES)
+                    if not data:
+                        break
+                    out.writeframesraw(data)
+    return total_frames
@@ -0,0 +1,119 @@
+import json
+from typing import Any, Dict, List, Optional
+from app.services.cleaner.llm_client import LLMClient
+from app.services.cleaner.cleaner import TextCleaner
+from app.services.cleaner.emotion import EmotionAnalyzer
+from app.models.table import SentenceTable
+
+BATCH_PROMPT = """
+你是一个专业的有声书文本分析助手，负责批量分析多句文本：识别非正文内容，并给出每句的情感向量。
+
+输入：JSON 数组，按原文顺序排列，每项包含 "id" 和 "text"。
+
+输出格式（JSON），results 中每个输入句子对应一项，id 必须与输入一致：
+{
+  "results": [
+    {
+      "id": "输入中的 id",
+      "is_noise": true/false,
+      "content_type": "dialogue/narration/description/quote/footnote/noise",
+      "speaker": "角色名/无",
+      "cleaned_text": "清洗后的文本",
+      "emotion_vector": [0.1, 0.2, 0.1, 0.1, 0.1, 0.2, 0.3, 0.9],
+      "primary_emotion": "平静",
+      "emotion_intensity": 0.7
+    }
+  ]
+}
+
+规则：
+- 噪音句（页脚/旁注/脚注等）is_noise 为 true，emotion_vector 可为 null
+- 向量和 = 1.0（归一化）
+- 8维顺序：[高兴, 愤怒, 悲伤, 害怕, 厌恶, 忧郁, 惊讶, 平静]
+"""
+
+EMOTION_DIMS = 8
+
+class BatchAnalyzer:
+    """
+    Cleans and analyzes emotion for several sentences (rows of a SentenceTable)
+    in a single chat completion. Results are validated per item and written
+    straight into the table's columns by id; rows without a valid item are
+    returned to the caller so the batch can be re-split.
+    """
+    def __init__(self, llm_client: LLMClient, cleaner: TextCleaner, emotion_analyzer: EmotionAnalyzer):
+        self.llm_client = llm_client
+        self.cleaner = cleaner
+        self.emotion_analyzer = emotion_analyzer
+
+    async def analyze_rows(self, table: SentenceTable, rows: List[int]) -> List[int]:
+        """
+        Sends one request for the whole batch and applies every valid item.
+        Returns the rows that are still unresolved.
+        """
+        keys = [table.sentence_id(i) for i in rows]
+        if len(set(keys)) != len(keys):
+            # Ids must be unambiguous inside one request
+            keys = [str(k) for k in range(len(rows))]
+
+        items = [{"id": key, "text": table.text(i)} for key, i in zip(keys, rows)]
+        user_prompt = f"""
+分析以下句子（JSON 数组，按原文顺序）：
+{json.dumps(items, ensure_ascii=False)}
+
+请返回 JSON 格式结果。
+"""
+        messages = [
+            {"role": "system", "content": BATCH_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+
+        result = await self.llm_client.chat_completion(messages, json_mode=True)
+        by_key = self._parse_results(result, set(keys))
+
+        unresolved = []
+        for key, i in zip(keys, rows):
+            item = by_key.get(key)
+            if item is None:
+                unresolved.append(i)
+                continue
+            with table.lock:
+                self.cleaner.apply_row(table, i, item)
+                if not table.is_noise[i]:
+                    self.emotion_analyzer.apply_row(table, i, item)
+        return unresolved
+
+    def _parse_results(self, result: Any, keys: set) -> Dict[str, Dict[str, Any]]:
+        if isinstance(result, dict):
+            result = result.get("results")
+        if not isinstance(result, list):
+            return {}
+
+        by_key = {}
+        for item in result:
+            if not isinstance(item, dict):
+                continue
+            key = str(item.get("id"))
+            # Unknown or duplicated ids make the mapping ambiguous, drop them
+            if key not in keys or key in by_key:
+                by_key.pop(key, None)
+                keys = keys - {key}
+                continue
+            if self._is_valid(item):
+                by_key[key] = item
+        return by_key
+
+    def _is_valid(self, item: Dict[str, Any]) -> bool:
+        if not isinstance(item.get("is_noise"), bool):
+            return False
+        cleaned = item.get("cleaned_text")
+        if cleaned is not None and not isinstance(cleaned, str):
+            return False
+        if item["is_noise"]:
+            return True
+        return self._valid_vector(item.get("emotion_vector"))
+
+    def _valid_vector(self, vector: Optional[Any]) -> bool:
+        if not isinstance(vector, list) or len(vector) != EMOTION_DIMS:
+            return False
+        return all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in vector)
@@ -1,5 +1,8 @@
 from app.services.cleaner.llm_client import LLMClient
 from app.models.book import Sentence
+from app.models.table import SentenceTable
+from app.services.cleaner.prefilter import SentencePrefilter
+from typing import Optional
 import asyncio
 
 SYSTEM_PROMPT = """
@@ -21,10 +24,17 @@ SYSTEM_PROMPT = """
 """
 
 class TextCleaner:
-    def __init__(self, llm_client: LLMClient):
+    def __init__(self, llm_client: LLMClient, prefilter: Optional[SentencePrefilter] = None):
         self.llm_client = llm_client
+        self.prefilter = prefilter
 
     async def clean_sentence(self, sentence: Sentence, context: str = "") -> Sentence:
+        if self.prefilter:
+            # Obvious noise and plain narration are resolved locally, without a request
+            result = self.prefilter.classify(sentence.text)
+            if result:
+                return self.apply_result(sentence, result)
+
         user_prompt = f"""
 分析以下文本：
 "{sentence.text}"
@@ -42,16 +52,39 @@ class TextCleaner:
         result = await self.llm_client.chat_completion(messages, json_mode=True)
         
         if result:
-            sentence.is_noise = result.get("is_noise", False)
-            sentence.speaker = result.get("speaker") if result.get("speaker") != "无" else None
-            sentence.metadata["content_type"] = result.get("content_type")
-            sentence.metadata["cleaned_text"] = result.get("cleaned_text")
-            
-            # If cleaned text is different and valid, update it?
-            # PRD says "cleaned_text" in output. 
-            # We might want to keep original text but use cleaned for TTS.
-            # For now, let's store it in metadata or update text if it's just cleaning.
-            if result.get("cleaned_text"):
-                 sentence.text = result.get("cleaned_text")
+            self.apply_result(sentence, result)
                  
         return sentence
+
+    def apply_result(self, sentence: Sentence, result: dict) -> Sentence:
+        sentence.is_noise = result.get("is_noise", False)
+        sentence.speaker = result.get("speaker") if result.get("speaker") != "无" else None
+        sentence.metadata["content_type"] = result.get("content_type")
+        sentence.metadata["cleaned_text"] = result.get("cleaned_text")
+        if result.get("prefilter"):
+            sentence.metadata["prefilter"] = result["prefilter"]
+        else:
+            sentence.metadata.pop("prefilter", None)
+        
+        # If cleaned text is different and valid, update it?
+        # PRD says "cleaned_text" in output. 
+        # We might want to keep original text but use cleaned for TTS.
+        # For now, let's store it in metadata or update text if it's just cleaning.
+        if result.get("cleaned_text"):
+             sentence.text = result.get("cleaned_text")
+        return sentence
+
+    def apply_row(self, table: SentenceTable, i: int, result: dict):
+        """
+        apply_result for row i of a SentenceTable.
+        """
+        table.is_noise[i] = result.get("is_noise", False)
+        table.set_speaker(i, result.get("speaker") if result.get("speaker") != "无" else None)
+        table.set_metadata(i, "content_type", result.get("content_type"))
+        table.set_metadata(i, "cleaned_text", result.get("cleaned_text"))
+        if result.get("prefilter"):
+            table.set_metadata(i, "prefilter", result["prefilter"])
+        else:
+            table.pop_metadata(i, "prefilter")
+        if result.get("cleaned_text"):
+            table.set_text(i, result["cleaned_text"])
@@ -1,6 +1,8 @@
 from typing import List
 from app.services.cleaner.llm_client import LLMClient
 from app.models.book import Sentence
+from app.models.table import SentenceTable
+from app.services.cleaner.emotion_post import DERIVED_KEYS
 
 EMOTION_PROMPT = """
 分析文本的情感色彩，输出 8 维情感向量（0.0-1.0 浮点数）。
@@ -46,8 +48,25 @@ class EmotionAnalyzer:
         result = await self.llm_client.chat_completion(messages, json_mode=True)
         
         if result:
-            sentence.emotion_vector = result.get("emotion_vector")
-            sentence.metadata["primary_emotion"] = result.get("primary_emotion")
-            sentence.metadata["emotion_intensity"] = result.get("emotion_intensity")
+            self.apply_result(sentence, result)
             
         return sentence
+
+    def apply_result(self, sentence: Sentence, result: dict) -> Sentence:
+        sentence.emotion_vector = result.get("emotion_vector")
+        # A fresh LLM vector replaces whatever post-processing started from
+        for key in DERIVED_KEYS:
+            sentence.metadata.pop(key, None)
+        sentence.metadata["primary_emotion"] = result.get("primary_emotion")
+        sentence.metadata["emotion_intensity"] = result.get("emotion_intensity")
+        return sentence
+
+    def apply_row(self, table: SentenceTable, i: int, result: dict):
+        """
+        apply_result for row i of a SentenceTable.
+        """
+        table.set_emotion_vector(i, result.get("emotion_vector"))
+        for key in DERIVED_KEYS:
+            table.pop_metadata(i, key)
+        table.set_metadata(i, "primary_emotion", result.get("primary_emotion"))
+        table.set_metadata(i, "emotion_intensity", result.get("emotion_intensity"))
@@ -0,0 +1,169 @@
+import os
+import time
+from typing import Any, Dict, Tuple
+import numpy as np
+from app.models.table import SentenceTable
+
+EMOTION_POSTPROCESS = os.getenv("EMOTION_POSTPROCESS", "1") != "0"
+# Centered moving average over a speaker's consecutive lines within a chapter (1 = off)
+EMOTION_SMOOTH_WINDOW = int(os.getenv("EMOTION_SMOOTH_WINDOW", "3"))
+# Pull towards the speaker's book-wide mean, once they have enough lines for a stable one
+EMOTION_BASELINE_WEIGHT = float(os.getenv("EMOTION_BASELINE_WEIGHT", "0.3"))
+EMOTION_BASELINE_MIN_COUNT = int(os.getenv("EMOTION_BASELINE_MIN_COUNT", "5"))
+
+# [高兴, 愤怒, 悲伤, 害怕, 厌恶, 忧郁, 惊讶, 平静]
+EMOTION_DIMS = 8
+NEUTRAL_DIM = 7
+# Sentence metadata written by the emotion stages, so re-running them starts from
+# the same input: the LLM's vector, the vector before quantization and its prototype
+RAW_KEY = "emotion_vector_raw"
+UNQUANTIZED_KEY = "emotion_vector_unquantized"
+PROTOTYPE_KEY = "emotion_prototype"
+DERIVED_KEYS = (RAW_KEY, UNQUANTIZED_KEY, PROTOTYPE_KEY)
+
+class EmotionPostProcessor:
+    """
+    Cleans up LLM emotion vectors before synthesis, one chapter matrix at a time:
+    clamp to [0, 1] and normalize each row to sum 1, smooth each speaker's
+    lines over a moving window (narration is its own track), and blend in the
+    speaker's book-wide baseline. Noise sentences are left alone.
+    """
+    def __init__(self,
+                 window: int = EMOTION_SMOOTH_WINDOW,
+                 baseline_weight: float = EMOTION_BASELINE_WEIGHT,
+                 baseline_min_count: int = EMOTION_BASELINE_MIN_COUNT):
+        self.window = max(1, window)
+        self.baseline_weight = min(max(baseline_weight, 0.0), 1.0)
+        self.baseline_min_count = baseline_min_count
+
+    # Matrix operations (rows = sentences in reading order)
+
+    @staticmethod
+    def normalize(matrix: np.ndarray) -> np.ndarray:
+        m = np.clip(np.nan_to_num(matrix, nan=0.0, posinf=1.0, neginf=0.0), 0.0, 1.0)
+        totals = m.sum(axis=1, keepdims=True)
+        empty = totals[:, 0] <= 0
+        # All-zero (or all-negative) rows carry no emotion: treat as calm
+        m[empty] = 0.0
+        m[empty, NEUTRAL_DIM] = 1.0
+        totals[empty] = 1.0
+        return m / totals
+
+    def baselines(self, matrix: np.ndarray, speakers: np.ndarray, n_speakers: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-speaker mean vector and line count over normalized rows; speakers
+        with fewer than baseline_min_count lines get no baseline (NaN row).
+        """
+        counts = np.bincount(speakers, minlength=n_speakers)
+        sums = np.stack([np.bincount(speakers, weights=matrix[:, d], minlength=n_speakers)
+                         for d in range(matrix.shape[1])], axis=1)
+        means = np.full((n_speakers, matrix.shape[1]), np.nan)
+        stable = counts >= max(1, self.baseline_min_count)
+        means[stable] = sums[stable] / counts[stable, None]
+        return means, counts
+
+    def smooth(self, matrix: np.ndarray, speakers: np.ndarray) -> np.ndarray:
+        if self.window <= 1 or len(matrix) < 2:
+            return matrix
+        out = np.empty_like(matrix)
+        half = self.window // 2
+        for code in np.unique(speakers):
+            rows = np.flatnonzero(speakers == code)
+            track = matrix[rows]
+            n = len(rows)
+            # Moving average via cumulative sums; the window shrinks at the track ends
+            csum = np.vstack([np.zeros((1, track.shape[1])), np.cumsum(track, axis=0)])
+            index = np.arange(n)
+            lo = np.clip(index - half, 0, n)
+            hi = np.clip(index + half + 1, 0, n)
+            out[rows] = (csum[hi] - csum[lo]) / (hi - lo)[:, None]
+        return out
+
+    def process_chapter(self, matrix: np.ndarray, speakers: np.ndarray, baselines: np.ndarray) -> np.ndarray:
+        """
+        matrix: raw vectors of the chapter's voiced sentences; speakers: speaker
+        code per row (index into baselines). Returns rows summing to 1.
+        """
+        m = self.smooth(self.normalize(matrix), speakers)
+        if self.baseline_weight > 0:
+            base = baselines[speakers]
+            has_base = ~np.isnan(base[:, 0])
+            m[has_base] = (1 - self.baseline_weight) * m[has_base] + self.baseline_weight * base[has_base]
+        return m / m.sum(axis=1, keepdims=True)
+
+    # Table
+
+    def process_table(self, table: SentenceTable) -> Dict[str, Any]:
+        """
+        Rewrites the emotion vector of every voiced row that has one, keeping the
+        LLM's vector in metadata[RAW_KEY]. Returns stats, also stored in
+        table.book.metadata["emotion_postprocess"].
+        """
+        start = time.perf_counter()
+        raw = table.column(RAW_KEY)
+        has_raw = np.array([bool(v) for v in raw], dtype=bool)
+        raw_ok = np.array([bool(v) and len(v) == EMOTION_DIMS for v in raw], dtype=bool)
+        rows = np.flatnonzero(~table.is_noise & np.where(has_raw, raw_ok, table.has_emotion))
+        if not len(rows):
+            return {"sentences": 0}
+
+        # float32 column rounded back as emotion_vector() does, so a re-run (reading RAW_KEY) sees the same values
+        matrix = np.round(table.emotions[rows].astype(np.float64), 6)
+        from_raw = np.flatnonzero(has_raw[rows])
+        if len(from_raw):
+            matrix[from_raw] = np.array([raw[i] for i in rows[from_raw].tolist()], dtype=np.float64)
+        # Interned speaker index, shifted so narration (-1) is code 0
+        speakers = table.speaker_idx[rows].astype(np.intp) + 1
+        names = [None] + table.speakers
+        # Baselines are book-wide, so a character sounds the same in every chapter
+        baselines, counts = self.baselines(self.normalize(matrix), speakers, len(names))
+
+        processed = np.empty_like(matrix)
+        bounds = np.searchsorted(rows, table.offsets)
+        chapters = 0
+        jitter_before, jitter_after, pairs = 0.0, 0.0, 0
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            if lo == hi:
+                continue
+            chapters += 1
+            processed[lo:hi] = self.process_chapter(matrix[lo:hi], speakers[lo:hi], baselines)
+            before, after, n = self._jitter(self.normalize(matrix[lo:hi]), processed[lo:hi], speakers[lo:hi])
+            jitter_before, jitter_after, pairs = jitter_before + before, jitter_after + after, pairs + n
+
+        previous = matrix.tolist()
+        for k, i in enumerate(rows.tolist()):
+            if not has_raw[i]:
+                table.set_metadata(i, RAW_KEY, previous[k])
+            table.pop_metadata(i, UNQUANTIZED_KEY)
+            table.pop_metadata(i, PROTOTYPE_KEY)
+        table.emotions[rows] = np.round(processed, 4)
+        table.has_emotion[rows] = True
+
+        elapsed = time.perf_counter() - start
+        stats = {
+            "sentences": len(rows),
+            "chapters": chapters,
+            "window": self.window,
+            "baseline_weight": self.baseline_weight,
+            "baselines": [
+                {"speaker": name, "count": int(counts[i]), "vector": np.round(baselines[i], 4).tolist()}
+                for i, name in enumerate(names) if not np.isnan(baselines[i, 0])
+            ],
+            # Mean L1 distance between a speaker's consecutive lines
+            "jitter_before": round(jitter_before / pairs, 4) if pairs else 0.0,
+            "jitter_after": round(jitter_after / pairs, 4) if pairs else 0.0,
+            "ms_per_chapter": round(elapsed * 1000 / chapters, 3)
+        }
+        table.book.metadata["emotion_postprocess"] = stats
+        return stats
+
+    @staticmethod
+    def _jitter(before: np.ndarray, after: np.ndarray, speakers: np.ndarray) -> Tuple[float, float, int]:
+        order = np.argsort(speakers, kind="stable")
+        same = speakers[order][1:] == speakers[order][:-1]
+        if not same.any():
+            return 0.0, 0.0, 0
+        b, a = before[order], after[order]
+        return (float(np.abs(np.diff(b, axis=0)).sum(axis=1)[same].sum()),
+                float(np.abs(np.diff(a, axis=0)).sum(axis=1)[same].sum()),
+                int(same.sum()))
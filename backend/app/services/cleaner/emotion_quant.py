@@ -0,0 +1,186 @@
+import os
+import math
+import time
+from typing import Any, Dict, Tuple
+import numpy as np
+from app.models.table import SentenceTable
+from app.services.cleaner.emotion_post import EMOTION_DIMS, UNQUANTIZED_KEY, PROTOTYPE_KEY
+
+# Snap emotion vectors to a small per-book set of prototypes: kmeans, grid or off
+EMOTION_QUANTIZE = os.getenv("EMOTION_QUANTIZE", "kmeans")
+# Largest per-dimension change a snap may make; vectors further from every
+# prototype keep their own value
+EMOTION_QUANT_MAX_ERROR = float(os.getenv("EMOTION_QUANT_MAX_ERROR", "0.1"))
+# kmeans grows the codebook (doubling from MIN_K) until the bound holds or MAX_K is reached
+EMOTION_QUANT_MIN_K = int(os.getenv("EMOTION_QUANT_MIN_K", "8"))
+EMOTION_QUANT_MAX_K = int(os.getenv("EMOTION_QUANT_MAX_K", "64"))
+# grid rounds each dimension to a multiple of 1 / levels, with as few levels as
+# MAX_ERROR allows (see EmotionQuantizer.levels); this only sets a minimum
+EMOTION_QUANT_GRID_LEVELS = int(os.getenv("EMOTION_QUANT_GRID_LEVELS", "0"))
+
+METHODS = ("kmeans", "grid")
+
+class EmotionQuantizer:
+    """
+    Snaps emotion vectors to prototypes fitted per book, so lines that only
+    differ by LLM float noise share a TTS cache key. Runs after voices are
+    assigned; the report counts distinct (voice, prototype) combinations.
+    """
+    def __init__(self,
+                 method: str = EMOTION_QUANTIZE,
+                 max_error: float = EMOTION_QUANT_MAX_ERROR,
+                 min_k: int = EMOTION_QUANT_MIN_K,
+                 max_k: int = EMOTION_QUANT_MAX_K,
+                 grid_levels: int = EMOTION_QUANT_GRID_LEVELS,
+                 iterations: int = 25,
+                 seed: int = 0):
+        if method not in METHODS:
+            raise ValueError(f"Unknown emotion quantization method: {method}")
+        self.method = method
+        self.max_error = max_error
+        self.min_k = max(1, min_k)
+        self.max_k = max(self.min_k, max_k)
+        self.grid_levels = max(1, grid_levels)
+        self.iterations = iterations
+        self.seed = seed
+
+    @property
+    def levels(self) -> int:
+        """
+        Grid levels actually used: rounding to 1 / levels moves a value by at
+        most 1 / (2 * levels), so enough levels to keep that within max_error
+        (one more for the 4-decimal rounding of the codebook), and at least
+        grid_levels.
+        """
+        if self.max_error <= 0:
+            # Only exact matches snap; there is no bound to size the grid by
+            return self.grid_levels
+        return max(self.grid_levels, math.ceil(1 / (2 * self.max_error)) + 1)
+
+    # Matrix operations
+
+    def fit(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Codebook (k, dims) for the rows of matrix.
+        """
+        # Many rows repeat exactly; fit on the distinct ones, weighted by count
+        points, counts = np.unique(np.round(matrix, 4), axis=0, return_counts=True)
+        if self.method == "grid":
+            return np.unique(self._snap_to_grid(points), axis=0)
+
+        k = self.min_k
+        while True:
+            codebook = self._kmeans(points, counts.astype(np.float64), k)
+            _, errors = self.assign(points, codebook)
+            if errors.max() <= self.max_error or k >= self.max_k or k >= len(points):
+                return codebook
+            k = min(k * 2, self.max_k)
+
+    @staticmethod
+    def assign(matrix: np.ndarray, codebook: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Nearest prototype per row (squared L2) and the max per-dimension error of that snap.
+        """
+        distances = (
+            (matrix ** 2).sum(axis=1)[:, None]
+            - 2 * matrix @ codebook.T
+            + (codebook ** 2).sum(axis=1)[None, :]
+        )
+        labels = distances.argmin(axis=1)
+        errors = np.abs(matrix - codebook[labels]).max(axis=1)
+        return labels, errors
+
+    def _snap_to_grid(self, matrix: np.ndarray) -> np.ndarray:
+        return np.round(matrix * self.levels) / self.levels
+
+    def _kmeans(self, points: np.ndarray, weights: np.ndarray, k: int) -> np.ndarray:
+        k = min(k, len(points))
+        rng = np.random.default_rng(self.seed)
+        # k-means++ seeding
+        centers = [points[rng.choice(len(points), p=weights / weights.sum())]]
+        closest = ((points - centers[0]) ** 2).sum(axis=1)
+        for _ in range(1, k):
+            p = weights * closest
+            if p.sum() <= 0:
+                break
+            centers.append(points[rng.choice(len(points), p=p / p.sum())])
+            closest = np.minimum(closest, ((points - centers[-1]) ** 2).sum(axis=1))
+        codebook = np.array(centers)
+
+        # Lloyd iterations on weighted points
+        for _ in range(self.iterations):
+            labels, _ = self.assign(points, codebook)
+            totals = np.bincount(labels, weights=weights, minlength=len(codebook))
+            sums = np.stack([np.bincount(labels, weights=weights * points[:, d], minlength=len(codebook))
+                             for d in range(points.shape[1])], axis=1)
+            used = totals > 0
+            updated = codebook.copy()
+            updated[used] = sums[used] / totals[used, None]
+            if np.allclose(updated, codebook):
+                break
+            codebook = updated
+        return codebook
+
+    # Table
+
+    def quantize_table(self, table: SentenceTable) -> Dict[str, Any]:
+        """
+        Replaces the emotion vector of voiced rows with their prototype when
+        within max_error, keeping the prototype index and the previous vector in
+        metadata. Returns a report, also stored in table.book.metadata["emotion_quantization"].
+        """
+        start = time.perf_counter()
+        unquantized = table.column(UNQUANTIZED_KEY)
+        has_previous = np.array([bool(v) for v in unquantized], dtype=bool)
+        previous_ok = np.array([bool(v) and len(v) == EMOTION_DIMS for v in unquantized], dtype=bool)
+        voiced = np.flatnonzero(~table.is_noise & np.where(has_previous, previous_ok, table.has_emotion))
+        if not len(voiced):
+            return {"sentences": 0}
+
+        # The vectors as stored (float32 column rounded back, or the pre-quantization list)
+        matrix = np.round(table.emotions[voiced].astype(np.float64), 6)
+        from_previous = np.flatnonzero(has_previous[voiced])
+        if len(from_previous):
+            matrix[from_previous] = np.array([unquantized[i] for i in voiced[from_previous].tolist()])
+        rows = matrix.tolist()
+        codebook = np.round(self.fit(matrix), 4)
+        labels, errors = self.assign(matrix, codebook)
+        snapped = errors <= self.max_error
+
+        prototypes = codebook.tolist()
+        voice_column, voiced_rows = table.column("voice_id"), voiced.tolist()
+        voices = [voice_column[i] or table.speaker(i) for i in voiced_rows]
+        texts = [" ".join(table.text(i).split()) for i in voiced_rows]
+        # Keys as the clip cache sees them (vectors rounded to 2 decimals there)
+        before = [tuple(row) for row in np.round(matrix, 2).tolist()]
+        after = []
+        for k, i in enumerate(voiced_rows):
+            if snapped[k]:
+                label = int(labels[k])
+                table.set_metadata(i, UNQUANTIZED_KEY, rows[k])
+                table.set_metadata(i, PROTOTYPE_KEY, label)
+                after.append(label)
+            else:
+                table.pop_metadata(i, UNQUANTIZED_KEY)
+                table.pop_metadata(i, PROTOTYPE_KEY)
+                after.append(before[k])
+        table.emotions[voiced] = np.where(snapped[:, None], codebook[labels], matrix)
+        table.has_emotion[voiced] = True
+
+        report = {
+            "method": self.method,
+            **({"grid_levels": self.levels} if self.method == "grid" else {}),
+            "sentences": len(voiced_rows),
+            "prototypes": prototypes,
+            "snapped": int(snapped.sum()),
+            "max_error": self.max_error,
+            "mean_error": round(float(errors[snapped].mean()), 4) if snapped.any() else 0.0,
+            # What the TTS cache can reuse: distinct emotions per voice, and distinct lines
+            "voice_emotions_before": len(set(zip(voices, before))),
+            "voice_emotions_after": len(set(zip(voices, after))),
+            "distinct_clips_before": len(set(zip(texts, voices, before))),
+            "distinct_clips_after": len(set(zip(texts, voices, after))),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+        table.book.metadata["emotion_quantization"] = report
+        return report
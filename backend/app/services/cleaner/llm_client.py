@@ -1,13 +1,28 @@
 import os
 import json
+import asyncio
 import httpx
 from typing import Dict, Any, Optional
+from app.services.cleaner.llm_cache import LLMCache, get_llm_cache
+from app.services.http_clients import get_http_clients
 
 class LLMClient:
-    def __init__(self, api_key: str = None, base_url: str = "https://api.openai.com/v1"):
+    def __init__(self,
+                 api_key: str = None,
+                 base_url: str = "https://api.openai.com/v1",
+                 cache: Optional[LLMCache] = None,
+                 use_cache: bool = True,
+                 client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=60.0)
+        # Defaults to the shared, pooled application client (see http_clients)
+        self._client = client
+        # Responses are cached in the shared on-disk cache unless use_cache=False
+        self.cache = cache or (get_llm_cache() if use_cache else None)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_http_clients().get("llm")
 
     async def chat_completion(self, 
                             messages: list, 
@@ -19,7 +34,25 @@ class LLMClient:
             print("Warning: OPENAI_API_KEY not set. Returning mock response.")
             # Mock response based on system prompt content to guess type
             system_content = messages[0]["content"]
-            if "清洗助手" in system_content:
+            if "批量分析" in system_content:
+                user_content = messages[-1]["content"]
+                items = json.loads(user_content[user_content.index("["):user_content.rindex("]") + 1])
+                mock_data = {
+                    "results": [
+                        {
+                            "id": item["id"],
+                            "is_noise": False,
+                            "content_type": "narration",
+                            "speaker": "无",
+                            "cleaned_text": None,
+                            "emotion_vector": [0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.3],
+                            "primary_emotion": "平静",
+                            "emotion_intensity": 0.5
+                        }
+                        for item in items
+                    ]
+                }
+            elif "清洗助手" in system_content:
                 mock_data = {
                     "original_text": "Mock text",
                     "is_noise": False,
@@ -44,6 +77,14 @@ class LLMClient:
                 return mock_data
             return json.dumps(mock_data)
 
+        cache_key = None
+        if self.cache:
+            cache_key = LLMCache.make_key(model, temperature, messages, json_mode)
+            # SQLite lookups (and writes below) run in a thread, not on the event loop
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -69,7 +110,9 @@ class LLMClient:
             content = result["choices"][0]["message"]["content"]
             
             if json_mode:
-                return json.loads(content)
+                content = json.loads(content)
+            if cache_key:
+                await asyncio.to_thread(self.cache.set, cache_key, content)
             return content
             
         except Exception as e:
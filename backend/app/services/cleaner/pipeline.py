@@ -0,0 +1,148 @@
+import os
+import asyncio
+from typing import List, Optional
+from app.models.table import SentenceTable
+from app.services.cleaner.cleaner import TextCleaner
+from app.services.cleaner.emotion import EmotionAnalyzer
+from app.services.cleaner.emotion_post import DERIVED_KEYS
+from app.services.cleaner.batch import BatchAnalyzer
+
+# Max number of LLM requests in flight across the whole book
+DEFAULT_MAX_CONCURRENT = int(os.getenv("ANALYSIS_MAX_CONCURRENT", "8"))
+# Sentences packed into one request in batched mode (1 = one request per sentence per stage)
+DEFAULT_BATCH_SIZE = int(os.getenv("ANALYSIS_BATCH_SIZE", "1"))
+
+class AnalysisPipeline:
+    """
+    Runs cleaning + emotion analysis for a whole book concurrently, on its
+    SentenceTable. Every chapter fans out its rows at once; a shared
+    semaphore caps the number of LLM requests in flight, and results are
+    written back into their rows, so the original order is untouched.
+    """
+    def __init__(self,
+                 cleaner: TextCleaner,
+                 emotion_analyzer: EmotionAnalyzer,
+                 max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 batch_analyzer: Optional[BatchAnalyzer] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.cleaner = cleaner
+        self.emotion_analyzer = emotion_analyzer
+        self.batch_analyzer = batch_analyzer
+        self.batch_size = max(1, batch_size)
+        self.max_concurrent = max(1, max_concurrent)
+        self.semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.progress = None
+        self.checkpoint = None
+
+    async def run(self, table: SentenceTable, progress=None, checkpoint=None, resume: bool = False) -> SentenceTable:
+        """
+        progress, if given, gets advance(n) as sentences finish (see JobProgress);
+        checkpoint gets mark(chapter) with the table's chapter shells (see
+        Checkpointer). With resume=True, sentences analyzed by an earlier,
+        interrupted run are skipped.
+        """
+        self.progress = progress
+        self.checkpoint = checkpoint
+        prefilter = self.cleaner.prefilter
+        if prefilter:
+            # Running headers/footers are only visible across the whole book
+            # (one pass over every sentence, in a thread: about 1s for a 60k-sentence book)
+            await asyncio.to_thread(prefilter.fit, table)
+        analyzed = self.analyzed_rows(table) if resume else None
+        await asyncio.gather(*(self._analyze_chapter(table, c, analyzed) for c in range(len(table.chapters))))
+        if prefilter:
+            table.book.metadata["prefilter"] = prefilter.stats()
+        return table
+
+    @staticmethod
+    def analyzed_rows(table: SentenceTable) -> List[bool]:
+        return [bool(v) for v in table.column("analyzed")]
+
+    async def _analyze_chapter(self, table: SentenceTable, c: int, analyzed: Optional[List[bool]]):
+        pending = [i for i in table.chapter_rows(c) if not (analyzed and analyzed[i])]
+
+        if self.batch_analyzer and self.batch_size > 1:
+            if self.cleaner.prefilter:
+                pending = self._prefilter_noise(table, c, pending)
+            batches = [pending[i:i + self.batch_size]
+                       for i in range(0, len(pending), self.batch_size)]
+            await asyncio.gather(*(self._analyze_batch(table, c, b) for b in batches))
+            return
+
+        await asyncio.gather(*(self._analyze_row(table, c, i) for i in pending))
+
+    def _prefilter_noise(self, table: SentenceTable, c: int, rows: List[int]) -> List[int]:
+        """
+        Resolves locally detected noise before batching; returns the rest.
+        Narration still goes in the batch, which also carries its emotion.
+        """
+        rest = []
+        for i in rows:
+            result = self.cleaner.prefilter.classify(table.text(i), narration=False)
+            if result:
+                with table.lock:
+                    self.cleaner.apply_row(table, i, result)
+                    table.set_metadata(i, "analyzed", True)
+            else:
+                rest.append(i)
+        self._done(table, c, len(rows) - len(rest))
+        return rest
+
+    async def _analyze_batch(self, table: SentenceTable, c: int, batch: List[int]):
+        async with self.semaphore:
+            unresolved = await self.batch_analyzer.analyze_rows(table, batch)
+        left = set(unresolved)
+        resolved = [i for i in batch if i not in left]
+        with table.lock:
+            for i in resolved:
+                table.set_metadata(i, "analyzed", True)
+        self._done(table, c, len(resolved))
+
+        if not unresolved:
+            return
+        if len(unresolved) == 1:
+            # A single sentence the batch prompt cannot handle goes through the per-sentence prompts
+            await self._analyze_row(table, c, unresolved[0])
+            return
+
+        # Partial or malformed response: retry the remainder as two smaller batches
+        mid = len(unresolved) // 2
+        await asyncio.gather(
+            self._analyze_batch(table, c, unresolved[:mid]),
+            self._analyze_batch(table, c, unresolved[mid:])
+        )
+
+    async def _analyze_row(self, table: SentenceTable, c: int, i: int):
+        # The per-sentence prompts take a Sentence: one is built for the row in
+        # flight and written back when both calls are done
+        sentence = table.sentence(i)
+        sentence.metadata.pop("analyzed", None)
+        # Success is read from these fields below, so an earlier run's results must not count
+        sentence.metadata.pop("content_type", None)
+        # One slot for both calls (they are sequential anyway), so sentences finish
+        # in submission order instead of all cleaning calls queueing ahead of emotion
+        async with self.semaphore:
+            sentence = await self.cleaner.clean_sentence(sentence)
+            # apply_result always records content_type, so its absence means the call failed
+            ok = "content_type" in sentence.metadata
+
+            if ok and not sentence.is_noise:
+                sentence.emotion_vector = None
+                for key in DERIVED_KEYS:
+                    sentence.metadata.pop(key, None)
+                sentence = await self.emotion_analyzer.analyze_sentence(sentence)
+                ok = sentence.emotion_vector is not None
+
+        if ok:
+            sentence.metadata["analyzed"] = True
+        with table.lock:
+            table.set_sentence(i, sentence)
+        self._done(table, c, 1)
+
+    def _done(self, table: SentenceTable, c: int, n: int):
+        if not n:
+            return
+        if self.progress:
+            self.progress.advance(n)
+        if self.checkpoint:
+            self.checkpoint.mark(table.chapters[c], n)
@@ -0,0 +1,162 @@
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, Optional, Set
+from app.models.table import SentenceTable
+
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "1") != "0"
+# Also resolve plain narration locally (noise is always resolved when enabled)
+PREFILTER_NARRATION = os.getenv("PREFILTER_NARRATION", "1") != "0"
+# A short line found in at least this many chapters is a running header/footer
+PREFILTER_REPEAT_MIN_CHAPTERS = int(os.getenv("PREFILTER_REPEAT_MIN_CHAPTERS", "3"))
+PREFILTER_REPEAT_MAX_LEN = int(os.getenv("PREFILTER_REPEAT_MAX_LEN", "40"))
+
+PAGE_NUMBER_RE = re.compile(
+    r"^[\s\-—–_\[\(（【<]*(第\s*)?\d{1,4}\s*(页|/\s*\d{1,4})?[\s\-—–_\]\)）】>]*$"
+    r"|^(?i:page)\s*\d{1,4}(\s*(?i:of|/)\s*\d{1,4})?$"
+)
+URL_RE = re.compile(
+    r"(?i)(https?://|www\.)\S+|[\w.-]+@[\w-]+\.[\w.]+|\b[\w-]+(\.[\w-]+)*\.(com|net|org|cn|cc|info|me|io|top|xyz)\b"
+)
+# Site watermarks and reader boilerplate of web novel dumps
+WATERMARK_RE = re.compile(
+    r"本书由|本书来自|更多(精彩|好书|小说|章节)|免费(下载|阅读|小说)|请(记住|收藏)本站|手机(阅读|用户|看书)"
+    r"|最新章节|电子书下载|(?i:txt)(下载|全集|电子书)|整理制作|版权归.{0,20}所有|未完待续|本章完"
+)
+CHAPTER_HEADING_RE = re.compile(r"^第[\d一二三四五六七八九十百千零〇两]+[章节回卷部篇集]")
+# Anything that makes a line dialogue, a quote, a footnote or a heading; left to the LLM
+NOT_PLAIN_RE = re.compile(r"[“”‘’「」『』\"'：:（）()【】\[\]<>《》]|^注")
+# Kept off the separator rule: a lone "……" or "——" can be a spoken pause
+PAUSE_CHARS = set("…—“”‘’「」『』\"'?？!！")
+QUOTE_CHARS = set("“”「」『』\"")
+# Story lines end like sentences; headers, footers and page furniture do not
+SENTENCE_END = "。！？!?…”."
+
+def is_cjk(c: str) -> bool:
+    return "\u4e00" <= c <= "\u9fff" or "\u3400" <= c <= "\u4dbf" or "\uf900" <= c <= "\ufaff"
+
+def char_classes(text: str) -> Dict[str, int]:
+    counts = {"cjk": 0, "letter": 0, "digit": 0, "other": 0}
+    for c in text:
+        if c.isspace():
+            continue
+        if is_cjk(c):
+            counts["cjk"] += 1
+        elif c.isascii() and c.isalpha():
+            counts["letter"] += 1
+        elif c.isdigit():
+            counts["digit"] += 1
+        else:
+            counts["other"] += 1
+    return counts
+
+class SentencePrefilter:
+    """
+    Local rules run before the cleaning LLM call. Returns a result in the
+    cleaner's format for high-confidence noise (page numbers, separators, URLs,
+    watermarks, non-CJK lines in a CJK book, running headers/footers) and,
+    optionally, plain narration; anything ambiguous goes to the LLM.
+    fit(table) learns the repeated lines and the book's script first.
+    """
+    def __init__(self,
+                 narration: bool = PREFILTER_NARRATION,
+                 repeat_min_chapters: int = PREFILTER_REPEAT_MIN_CHAPTERS,
+                 repeat_max_len: int = PREFILTER_REPEAT_MAX_LEN):
+        self.narration = narration
+        self.repeat_min_chapters = max(2, repeat_min_chapters)
+        self.repeat_max_len = repeat_max_len
+        self.cjk_book = True
+        self._repeated: Set[str] = set()
+        self.checked = 0
+        self.rules: Counter = Counter()
+
+    @staticmethod
+    def _line_key(text: str) -> str:
+        # Page and chapter numbers change from chapter to chapter
+        return re.sub(r"\d+", "#", "".join(text.split()))
+
+    def fit(self, table: SentenceTable) -> "SentencePrefilter":
+        chapters_with: Counter = Counter()
+        classes: Counter = Counter()
+        for c in range(len(table.chapters)):
+            keys = set()
+            for i in table.chapter_rows(c):
+                text = table.text(i).strip()
+                classes.update(char_classes(text))
+                if (text and len(text) <= self.repeat_max_len
+                        and not CHAPTER_HEADING_RE.match(text)
+                        and not NOT_PLAIN_RE.search(text)
+                        and text[-1] not in SENTENCE_END):
+                    keys.add(self._line_key(text))
+            chapters_with.update(keys)
+        self._repeated = {key for key, n in chapters_with.items() if n >= self.repeat_min_chapters}
+        letters = classes["cjk"] + classes["letter"]
+        self.cjk_book = not letters or classes["cjk"] / letters >= 0.3
+        return self
+
+    def classify(self, text: str, narration: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        """
+        Cleaner result for a sentence's text, or None if it needs the LLM.
+        The matching rule is in result["noise_type"] / result["prefilter"].
+        """
+        self.checked += 1
+        text = text.strip()
+        rule = self._noise_rule(text)
+        if rule:
+            self.rules[rule] += 1
+            return {"is_noise": True, "content_type": "noise", "speaker": None,
+                    "noise_type": rule, "cleaned_text": None, "prefilter": rule}
+
+        if (self.narration if narration is None else narration) and self._is_plain_narration(text):
+            self.rules["narration"] += 1
+            return {"is_noise": False, "content_type": "narration", "speaker": None,
+                    "noise_type": None, "cleaned_text": None, "prefilter": "narration"}
+        return None
+
+    def _noise_rule(self, text: str) -> Optional[str]:
+        if not text:
+            return "empty"
+        if PAGE_NUMBER_RE.match(text):
+            return "page_number"
+        if WATERMARK_RE.search(text):
+            return "watermark"
+
+        classes = char_classes(text)
+        visible = sum(classes.values())
+        if not classes["cjk"] and not classes["letter"] and not classes["digit"]:
+            return None if PAUSE_CHARS & set(text) else "separator"
+        url_chars = sum(len(m.group(0)) for m in URL_RE.finditer(text))
+        if url_chars and url_chars * 2 >= visible:
+            return "url"
+        # Latin lines that end like a sentence or are quoted can be spoken ("OK。", "No!", "I love you.")
+        if (self.cjk_book and not classes["cjk"] and classes["letter"]
+                and text[-1] not in SENTENCE_END and not QUOTE_CHARS & set(text)):
+            return "non_cjk"
+        # Numbers said as a line ("“12点。”", "3000元。") are quoted or end like a sentence
+        if (classes["cjk"] <= 2 and (classes["digit"] + classes["other"]) >= 0.7 * visible
+                and text[-1] not in SENTENCE_END and not QUOTE_CHARS & set(text)):
+            return "symbols"
+        if self._line_key(text) in self._repeated:
+            return "repeated"
+        return None
+
+    def _is_plain_narration(self, text: str) -> bool:
+        if not self.cjk_book or not 6 <= len(text) <= 300:
+            return False
+        if not text.endswith("。") or NOT_PLAIN_RE.search(text) or URL_RE.search(text):
+            return False
+        classes = char_classes(text)
+        return classes["cjk"] >= 0.75 * sum(classes.values()) and classes["letter"] == 0
+
+    def stats(self) -> Dict[str, Any]:
+        skipped = sum(self.rules.values())
+        return {
+            "checked": self.checked,
+            "skipped": skipped,
+            "noise": skipped - self.rules["narration"],
+            "narration": self.rules["narration"],
+            "sent_to_llm": self.checked - skipped,
+            "skip_rate": skipped / self.checked if self.checked else 0.0,
+            "rules": dict(self.rules),
+            "repeated_lines": len(self._repeated)
+        }
@@ -1,6 +1,6 @@
 import os
 from typing import Dict, Optional
-from app.models.book import Sentence, Book
+from app.models.table import SentenceTable
 
 # Voice Configuration
 VOICE_LIBRARY = {
@@ -17,28 +17,27 @@ class SpeakerAssigner:
         self.assets_dir = assets_dir
         self.character_map: Dict[str, str] = {} # character_name -> voice_id
 
-    def assign_voices(self, book: Book) -> Book:
+    def assign_voices(self, table: SentenceTable) -> SentenceTable:
         """
         Assigns a voice_id and audio_path to each sentence.
         """
-        for chapter in book.chapters:
-            for sentence in chapter.sentences:
-                voice_id = self._get_voice_id(sentence)
-                sentence.metadata["voice_id"] = voice_id
-                
-                # Resolve absolute path
-                voice_file = VOICE_LIBRARY[voice_id]["file"]
-                sentence.metadata["speaker_audio_path"] = os.path.join(self.assets_dir, "voices", voice_file)
+        content_types = table.column("content_type")
+        for i in range(len(table)):
+            voice_id = self._get_voice_id(content_types[i], table.speaker(i))
+            table.set_metadata(i, "voice_id", voice_id)
+            
+            # Resolve absolute path
+            voice_file = VOICE_LIBRARY[voice_id]["file"]
+            table.set_metadata(i, "speaker_audio_path", os.path.join(self.assets_dir, "voices", voice_file))
                 
-        return book
+        return table
 
-    def _get_voice_id(self, sentence: Sentence) -> str:
+    def _get_voice_id(self, content_type: Optional[str], speaker: Optional[str]) -> str:
         # 1. Narration
-        if sentence.metadata.get("content_type") != "dialogue":
+        if content_type != "dialogue":
             return "V01" # Default narration
 
         # 2. Dialogue - Check speaker
-        speaker = sentence.speaker
         if not speaker:
             return "V03" # Default male dialogue if unknown
             
@@ -1,5 +1,5 @@
 import re
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
 from app.models.book import Book, Chapter, Sentence
 
 class ChapterSplitter:
@@ -19,112 +19,237 @@ class ChapterSplitter:
         'extra': r'^(番外|外传|特别篇)\s*'
     }
 
+    @staticmethod
+    def _line_pattern(pattern: str) -> str:
+        """
+        Rewrites a pattern written against a single stripped line so it can run
+        over the whole text with re.MULTILINE: whitespace may not cross a line
+        break, and a trailing \\s+ still needs text after it on the same line
+        (on a stripped line it could never match trailing whitespace).
+        """
+        pattern = pattern.lstrip('^').replace(r'\s', r'[^\S\n]')
+        if pattern.endswith(r'[^\S\n]+'):
+            pattern += r'(?=\S)'
+        return pattern
+
+    @classmethod
+    def _compile_header(cls) -> re.Pattern:
+        # One alternation for every header kind; the named group that matched is the kind
+        groups = [f"(?P<chapter>{'|'.join(cls._line_pattern(p) for p in cls.CHAPTER_PATTERNS)})"]
+        groups += [f"(?P<{kind}>{cls._line_pattern(p)})" for kind, p in cls.SPECIAL_CHAPTERS.items()]
+        return re.compile(r'^[^\S\n]*(?:' + '|'.join(groups) + ')', re.MULTILINE)
+
+    # A raw chapter up to this many characters is kept whole
+    RAW_MIN_CHARS = 1000
+
     def split(self, book: Book) -> Book:
-        # If book already has structured chapters (e.g. from EPUB), we might skip or refine
-        # For TXT, we have one raw chapter.
-        
-        new_chapters = []
-        
-        for chapter in book.chapters:
+        book.chapters = list(self.iter_split(book.chapters))
+        return book
+
+    def iter_split(self, chapters: Iterable[Chapter]) -> Iterator[Chapter]:
+        """
+        Splits raw chapters (one huge sentence) on chapter headers, passing
+        structured ones through. Lazy, so chapters can come from a generator.
+        """
+        for chapter in chapters:
             # If chapter seems raw (one huge sentence), split it
-            if len(chapter.sentences) == 1 and len(chapter.sentences[0].text) > 1000:
-                raw_text = chapter.sentences[0].text
-                split_chapters = self._split_text(raw_text)
-                new_chapters.extend(split_chapters)
+            if not (len(chapter.sentences) == 1 and len(chapter.sentences[0].text) > self.RAW_MIN_CHARS):
+                yield chapter
+            elif chapter.id == "raw":
+                # Whole TXT book
+                yield from self._split_text(chapter.sentences[0].text)
             else:
-                new_chapters.append(chapter)
-                
-        book.chapters = new_chapters
-        return book
+                # A document of a structured book (e.g. EPUB) keeps its id and title
+                # unless it really holds several chapters
+                parts = self._split_text(chapter.sentences[0].text, prefix=f"{chapter.id}_", title=chapter.title)
+                if len(parts) == 1:
+                    yield chapter
+                else:
+                    yield from parts
 
-    def _split_text(self, text: str) -> List[Chapter]:
-        lines = text.split('\n')
+    def _split_text(self, text: str, prefix: str = "ch_", title: str = "Start") -> List[Chapter]:
+        """
+        Single pass over the whole text: every header is found by one finditer
+        and chapter bodies are sliced out between header lines by offset.
+        """
         chapters = []
+        current_title = title
+        current_kind = None
+        body_start = 0
+
+        for m in HEADER_RE.finditer(text):
+            line_start = m.start()
+            line_end = text.find('\n', m.end())
+            if line_end == -1:
+                line_end = len(text)
+
+            # Body = the lines between the previous header and this one (possibly a single empty line)
+            if body_start <= line_start - 1:
+                chapters.append(self._make_chapter(
+                    f"{prefix}{len(chapters)}", current_title, text[body_start:line_start - 1], current_kind
+                ))
+            current_title = text[line_start:line_end].strip()
+            current_kind = m.lastgroup
+            body_start = line_end + 1
+
+        if body_start <= len(text):
+            chapters.append(self._make_chapter(f"{prefix}{len(chapters)}", current_title, text[body_start:], current_kind))
+        return chapters
+
+    def iter_chapters(self, lines: Iterable[str]) -> Iterator[Chapter]:
+        """
+        Yields each chapter as soon as the next header (or the end) is reached,
+        so only one chapter's lines are held at a time.
+        """
+        count = 0
         current_chapter_lines = []
         current_title = "Start"
-        
-        # Compile regexes
-        patterns = [re.compile(p) for p in self.CHAPTER_PATTERNS]
-        special_patterns = [re.compile(p) for p in self.SPECIAL_CHAPTERS.values()]
+        current_kind = None
         
         for line in lines:
-            line_stripped = line.strip()
-            is_header = False
-            
-            # Check if line matches chapter header
-            for p in patterns + special_patterns:
-                if p.match(line_stripped):
-                    is_header = True
-                    break
-            
-            if is_header:
-                # Save previous chapter
+            m = HEADER_RE.match(line)
+            if m:
+                # Emit previous chapter
                 if current_chapter_lines:
-                    chapters.append(Chapter(
-                        id=f"ch_{len(chapters)}",
-                        title=current_title,
-                        sentences=[Sentence(id=f"s_{len(chapters)}", text='\n'.join(current_chapter_lines))]
-                    ))
-                current_title = line_stripped
+                    yield self._make_chapter(f"ch_{count}", current_title, '\n'.join(current_chapter_lines), current_kind)
+                    count += 1
+                current_title = line.strip()
+                current_kind = m.lastgroup
                 current_chapter_lines = []
             else:
                 current_chapter_lines.append(line)
                 
-        # Add last chapter
+        # Emit last chapter
         if current_chapter_lines:
-            chapters.append(Chapter(
-                id=f"ch_{len(chapters)}",
-                title=current_title,
-                sentences=[Sentence(id=f"s_{len(chapters)}", text='\n'.join(current_chapter_lines))]
-            ))
-            
-        return chapters
+            yield self._make_chapter(f"ch_{count}", current_title, '\n'.join(current_chapter_lines), current_kind)
+
+    def _make_chapter(self, chapter_id: str, title: str, text: str, kind: Optional[str] = None) -> Chapter:
+        return Chapter(
+            id=chapter_id,
+            title=title,
+            kind=kind,
+            # Same id scheme as SentenceSplitter, so ids stay unique across chapters
+            sentences=[Sentence(id=f"{chapter_id}_s0", text=text)]
+        )
+
+# Compiled once for all splitters
+HEADER_RE = ChapterSplitter._compile_header()
 
 class SentenceSplitter:
+    # PRD 2.2.2
+    CHINESE_TERMINATORS = '。！？…'
+    ENGLISH_TERMINATORS = '.!?'
+    ABBREVIATIONS = ['Mr.', 'Mrs.', 'Dr.', 'Prof.', 'St.', 'etc.', 'e.g.', 'i.e.', 'vs.', 'No.']
+    OPEN_QUOTES = '「“『'
+    CLOSE_QUOTES = '」”』'
+
     def split(self, book: Book) -> Book:
         for chapter in book.chapters:
-            new_sentences = []
-            for sent in chapter.sentences:
-                # If sentence is too long (raw text), split it
-                if len(sent.text) > 200: # Threshold for "raw" text
-                    split_sents = self._split_text_to_sentences(sent.text)
-                    new_sentences.extend(split_sents)
-                else:
-                    new_sentences.append(sent)
-            chapter.sentences = new_sentences
+            self.split_chapter(chapter)
         return book
 
-    def _split_text_to_sentences(self, text: str) -> List[Sentence]:
-        # Simple splitting for MVP
-        # PRD 2.2.2: Chinese and English splitters
-        
-        # Regex for splitting
-        # (?<=[。！？…]) matches position after these chars
-        # Avoid splitting inside quotes is harder with simple regex, 
-        # but for MVP we can start with basic split.
-        
-        # Better regex that keeps delimiters
-        pattern = r'([。！？…]+|\. )'
-        
-        parts = re.split(pattern, text)
-        sentences = []
-        current_sent = ""
-        
-        for part in parts:
-            current_sent += part
-            # If part ends with delimiter, finalize sentence
-            if re.search(r'[。！？…]+|\. $', part):
-                if current_sent.strip():
-                    sentences.append(Sentence(
-                        id=f"sub_{len(sentences)}",
-                        text=current_sent.strip()
+    def split_chapter(self, chapter: Chapter) -> Chapter:
+        new_sentences = []
+        for sent in chapter.sentences:
+            # If sentence is too long (raw text), split it
+            if len(sent.text) > 200: # Threshold for "raw" text
+                base = sent.start_pos or 0
+                for start, end in self.segment(sent.text):
+                    new_sentences.append(Sentence(
+                        # Unique within the book (chapter ids are), and used for clip file names
+                        id=f"{chapter.id}_s{len(new_sentences)}",
+                        text=sent.text[start:end],
+                        start_pos=base + start,
+                        end_pos=base + end
                     ))
-                current_sent = ""
-        
-        if current_sent.strip():
-             sentences.append(Sentence(
-                id=f"sub_{len(sentences)}",
-                text=current_sent.strip()
-            ))
-            
-        return sentences
+            else:
+                new_sentences.append(sent)
+        chapter.sentences = new_sentences
+        return chapter
+
+    def segment(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Single scan over text returning (start, end) offsets of each sentence,
+        trimmed of surrounding whitespace.
+
+        - 。！？… always end a sentence, .!? only before whitespace, a non-ASCII
+          character or the end, and not after one of ABBREVIATIONS
+        - nothing splits inside 「」“”『』 or "..." dialogue; a quote that closes
+          right after a terminator ends the sentence after the quote (unless
+          lowercase English text follows)
+        - a line break always ends a sentence and closes any unbalanced quote
+        """
+        spans = []
+        start = 0
+        depth = 0 # nesting of CJK quotes
+        in_ascii_quote = False
+        # Hot loop: bind lookups once
+        emit = self._emit
+        cjk_terminators, open_quotes, close_quotes = self.CHINESE_TERMINATORS, self.OPEN_QUOTES, self.CLOSE_QUOTES
+
+        for m in SENTENCE_SCAN_RE.finditer(text):
+            pos, end = m.span()
+            ch = text[pos]
+
+            if ch in cjk_terminators:
+                if not depth and not in_ascii_quote:
+                    emit(text, start, end, spans)
+                    start = end
+            elif ch == '\n':
+                depth, in_ascii_quote = 0, False
+                emit(text, start, pos, spans)
+                start = end
+            elif ch in open_quotes:
+                depth += 1
+            elif ch in close_quotes or ch == '"':
+                if ch == '"':
+                    in_ascii_quote = not in_ascii_quote
+                    if in_ascii_quote:
+                        continue
+                else:
+                    depth = max(0, depth - 1)
+                if (not depth and not in_ascii_quote and pos and text[pos - 1] in TERMINATORS
+                        and not self._continues_lowercase(text, end)):
+                    emit(text, start, end, spans)
+                    start = end
+            elif not depth and not in_ascii_quote and self._ends_english_sentence(text, pos, end):
+                emit(text, start, end, spans)
+                start = end
+
+        emit(text, start, len(text), spans)
+        return spans
+
+    def _ends_english_sentence(self, text: str, pos: int, end: int) -> bool:
+        if end < len(text) and not (text[end].isspace() or ord(text[end]) > 127):
+            return False # 3.14, example.com, ...
+        # Only a single period can belong to an abbreviation
+        return not (end - pos == 1 and text[pos] == '.' and ABBREVIATION_RE.search(text, max(0, pos - 5), end))
+
+    @staticmethod
+    def _continues_lowercase(text: str, end: int) -> bool:
+        # "Stop!" he said. -- the quote is part of a longer sentence
+        i = end
+        while i < len(text) and text[i] in ' \t':
+            i += 1
+        return i < len(text) and 'a' <= text[i] <= 'z'
+
+    @staticmethod
+    def _emit(text: str, start: int, end: int, spans: List[Tuple[int, int]]):
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            spans.append((start, end))
+
+TERMINATORS = SentenceSplitter.CHINESE_TERMINATORS + SentenceSplitter.ENGLISH_TERMINATORS
+# Everything the segmenter reacts to; terminator runs (……, ?!) come back as one match
+SENTENCE_SCAN_RE = re.compile(
+    '[' + re.escape(SentenceSplitter.CHINESE_TERMINATORS) + ']+'
+    '|[' + re.escape(SentenceSplitter.ENGLISH_TERMINATORS) + ']+'
+    '|[' + re.escape(SentenceSplitter.OPEN_QUOTES + SentenceSplitter.CLOSE_QUOTES) + '"\n]'
+)
+# Abbreviation ending exactly at the searched window's end, not preceded by a letter
+ABBREVIATION_RE = re.compile(
+    r'(?<![A-Za-z])(?:' + '|'.join(re.escape(a) for a in SentenceSplitter.ABBREVIATIONS) + r')$'
+)
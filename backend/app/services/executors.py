@@ -0,0 +1,79 @@
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+# Execution model for the API process:
+# - the event loop only awaits; it never parses, hashes big files or blocks on disk/subprocesses
+# - CPU-bound work (parsing, HTML extraction, splitting) runs in worker processes
+# - blocking I/O (book shards, SQLite, ffmpeg) runs in a thread pool, installed as the
+#   loop's default executor so asyncio.to_thread uses it too
+PROCESS_WORKERS = int(os.getenv("PROCESS_WORKERS", "0")) or os.cpu_count() or 1
+IO_WORKERS = int(os.getenv("IO_WORKERS", "32"))
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_thread_pool: Optional[ThreadPoolExecutor] = None
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # spawn, not fork: the parent holds SQLite connections, threads and an event loop
+        _process_pool = ProcessPoolExecutor(
+            max_workers=PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io")
+    return _thread_pool
+
+def install_thread_pool(loop: asyncio.AbstractEventLoop):
+    """
+    Makes the I/O pool the loop's default executor (asyncio.to_thread, run_in_executor(None, ...)).
+    """
+    loop.set_default_executor(get_thread_pool())
+
+async def run_in_process(fn: Callable[..., Any], *args) -> Any:
+    """
+    Runs a picklable top-level function in the process pool without blocking the event loop.
+    """
+    global _process_pool
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # A crashed worker (e.g. OOM on a huge book) breaks the whole pool; start a fresh one next time
+        if _process_pool is pool:
+            _process_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+def executor_stats() -> Dict[str, Any]:
+    stats = {
+        "threads": {"max_workers": IO_WORKERS, "started": 0, "queued": 0},
+        "processes": {"max_workers": PROCESS_WORKERS, "started": 0, "pending": 0}
+    }
+    # Queue depths come from executor internals; absent attributes just read as zero
+    if _thread_pool is not None:
+        stats["threads"]["started"] = len(getattr(_thread_pool, "_threads", ()))
+        queue = getattr(_thread_pool, "_work_queue", None)
+        stats["threads"]["queued"] = queue.qsize() if queue is not None else 0
+    if _process_pool is not None:
+        stats["processes"]["started"] = len(getattr(_process_pool, "_processes", None) or {})
+        stats["processes"]["pending"] = len(getattr(_process_pool, "_pending_work_items", {}))
+    return stats
+
+def shutdown_executors():
+    global _process_pool, _thread_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=True, cancel_futures=True)
+        _thread_pool = None
@@ -0,0 +1,107 @@
+import os
+import asyncio
+import importlib.util
+from typing import Any, Dict, Optional
+import httpx
+
+# LLM endpoint (usually remote, TLS): HTTP/2 multiplexes concurrent analysis calls over few connections
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "16"))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "1") == "1"
+# TTS server (usually local, HTTP/1.1): one connection per request in flight
+TTS_MAX_CONNECTIONS = int(os.getenv("TTS_MAX_CONNECTIONS", "16"))
+TTS_MAX_KEEPALIVE = int(os.getenv("TTS_MAX_KEEPALIVE", "16"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "60"))
+
+class _CountingTransport(httpx.AsyncHTTPTransport):
+    """
+    Transport that keeps request counters for the pool metrics.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+class HTTPClients:
+    """
+    Application-scoped httpx clients, one connection pool per upstream ("llm", "tts").
+    Opened in the FastAPI lifespan and closed on shutdown; LLMClient/TTSClient
+    borrow them instead of creating (and leaking) their own.
+    """
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, _CountingTransport] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.http2 = LLM_HTTP2 and importlib.util.find_spec("h2") is not None
+        if LLM_HTTP2 and not self.http2:
+            print("HTTP/2 for the LLM client needs the 'h2' package (pip install httpx[http2]); using HTTP/1.1")
+
+    def open(self):
+        for name in ("llm", "tts"):
+            self.get(name)
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        # Connections belong to the loop that opened them (scripts may run several loops)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._clients, self._transports, self._loop = {}, {}, loop
+
+        if name not in self._clients:
+            if name == "llm":
+                limits = httpx.Limits(max_connections=LLM_MAX_CONNECTIONS,
+                                      max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                                      keepalive_expiry=HTTP_KEEPALIVE_EXPIRY)
+                transport = _CountingTransport(limits=limits, http2=self.http2)
+            elif name == "tts":
+                limits = httpx.Limits(max_connections=TTS_MAX_CONNECTIONS,
+                                      max_keepalive_connections=TTS_MAX_KEEPALIVE,
+                                      keepalive_expiry=HTTP_KEEPALIVE_EXPIRY)
+                transport = _CountingTransport(limits=limits)
+            else:
+                raise ValueError(f"Unknown HTTP client: {name}")
+            self._transports[name] = transport
+            self._clients[name] = httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT)
+        return self._clients[name]
+
+    async def aclose(self):
+        clients, self._clients, self._transports = self._clients, {}, {}
+        await asyncio.gather(*(c.aclose() for c in clients.values()), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        result = {}
+        for name, transport in self._transports.items():
+            # httpcore's pool has no public stats API; read its connection list defensively
+            connections = list(getattr(getattr(transport, "_pool", None), "connections", []))
+            result[name] = {
+                "requests": transport.requests,
+                "errors": transport.errors,
+                "in_flight": transport.in_flight,
+                "max_in_flight": transport.max_in_flight,
+                "connections": len(connections),
+                "idle_connections": sum(1 for c in connections if c.is_idle()),
+                "http2": self.http2 if name == "llm" else False
+            }
+        return result
+
+_default_clients: Optional[HTTPClients] = None
+
+def get_http_clients() -> HTTPClients:
+    global _default_clients
+    if _default_clients is None:
+        _default_clients = HTTPClients()
+    return _default_clients
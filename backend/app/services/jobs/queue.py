@@ -0,0 +1,226 @@
+import os
+import time
+import uuid
+import asyncio
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from app.models.job import Job, JobStatus, JobType
+from app.services.jobs.store import JobStore
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Progress is persisted at most this often while a job is running
+PROGRESS_SAVE_INTERVAL = 1.0
+
+class JobProgress:
+    """
+    Handed to job handlers to report sentences done/total.
+    Throughput and ETA are derived from the counters.
+
+    Saves run in a worker thread, one at a time, each writing the latest
+    snapshot of the job; call drain() before writing the job yourself.
+    """
+    def __init__(self, job: Job, store: JobStore):
+        self.job = job
+        self.store = store
+        self._start = time.monotonic()
+        self._baseline = job.done
+        self._last_save = 0.0
+        self._snapshot: Optional[Job] = None
+        self._saving: Optional[asyncio.Task] = None
+
+    def set_total(self, total: int, done: int = 0):
+        self.job.total = total
+        self.job.done = done
+        self._start = time.monotonic()
+        self._baseline = done
+        self._save(force=True)
+
+    def advance(self, n: int = 1):
+        self.job.done += n
+        self._save()
+
+    def _save(self, force: bool = False):
+        now = time.monotonic()
+        elapsed = now - self._start
+        processed = self.job.done - self._baseline
+        if elapsed > 0 and processed > 0:
+            self.job.throughput = processed / elapsed
+            self.job.eta_seconds = max(0, self.job.total - self.job.done) / self.job.throughput
+        if force or now - self._last_save >= PROGRESS_SAVE_INTERVAL:
+            self._last_save = now
+            # The job keeps changing while the thread writes it
+            self._snapshot = self.job.model_copy()
+            if self._saving is None:
+                self._saving = asyncio.ensure_future(self._flush())
+
+    async def drain(self):
+        """
+        Waits until the latest snapshot has been written.
+        """
+        while self._saving is not None:
+            await asyncio.shield(self._saving)
+
+    async def _flush(self):
+        try:
+            while self._snapshot is not None:
+                snapshot, self._snapshot = self._snapshot, None
+                try:
+                    await asyncio.to_thread(self.store.save, snapshot)
+                except Exception as e:
+                    # Progress is informational; the next save catches up
+                    print(f"Saving progress of job {snapshot.id} failed: {e}")
+        finally:
+            self._saving = None
+
+# handler(project_id, progress, resume=...)
+Handler = Callable[..., Awaitable[object]]
+
+class JobQueue:
+    """
+    In-process job queue: jobs are persisted in SQLite and executed by a pool
+    of asyncio workers. Handlers are registered per JobType and receive the
+    project id, a JobProgress and the job's resume flag.
+    """
+    def __init__(self, store: Optional[JobStore] = None, workers: int = JOB_WORKERS):
+        self.store = store or JobStore()
+        self.workers = max(1, workers)
+        self._handlers: Dict[JobType, Handler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._progress: Dict[str, JobProgress] = {}
+        # Picked up by a worker, handler not started yet / cancelled before their handler started
+        self._starting: Set[str] = set()
+        self._cancelled: Set[str] = set()
+        # Serializes submit's check-then-insert now that it awaits the store
+        self._submit_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+
+    def register(self, job_type: JobType, handler: Handler):
+        self._handlers[job_type] = handler
+
+    async def start(self):
+        self._stopping = False
+        self._queue = asyncio.Queue()
+        self._submit_lock = asyncio.Lock()
+        for job_id in await asyncio.to_thread(self._recover):
+            self._queue.put_nowait(job_id)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        self._stopping = True
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    def _recover(self) -> List[str]:
+        # Jobs that were running when the process died resume from their last checkpoint
+        for job in self.store.list_by_status(JobStatus.RUNNING):
+            job.status = JobStatus.QUEUED
+            job.resume = True
+            self.store.save(job)
+        return [job.id for job in self.store.list_by_status(JobStatus.QUEUED)]
+
+    async def submit(self, project_id: str, job_type: JobType, resume: bool = False) -> Job:
+        async with self._submit_lock:
+            # One active job per project and type; resubmitting returns the existing one
+            for job in await asyncio.to_thread(self.store.list, project_id):
+                if job.type == job_type and job.is_active:
+                    return job
+
+            job = Job(id=str(uuid.uuid4()), project_id=project_id, type=job_type, resume=resume)
+            await asyncio.to_thread(self.store.save, job)
+        self._queue.put_nowait(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    def list(self, project_id: Optional[str] = None) -> List[Job]:
+        return self.store.list(project_id)
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if not job or not job.is_active:
+            return job
+        task = self._running.get(job_id)
+        if task:
+            # The worker records the cancellation when the task unwinds
+            task.cancel()
+            return job
+        # Checked by the worker before it starts the handler
+        self._cancelled.add(job_id)
+        if job_id in self._starting:
+            return job # The worker records the cancellation
+        return await self._finish(job, JobStatus.CANCELLED)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if not job or job.status != JobStatus.QUEUED or job_id in self._cancelled:
+            self._cancelled.discard(job_id)
+            return # Cancelled while queued
+
+        self._starting.add(job_id)
+        try:
+            job.status = JobStatus.RUNNING
+            job.started_at = datetime.now()
+            await asyncio.to_thread(self.store.save, job)
+        finally:
+            self._starting.discard(job_id)
+        if job_id in self._cancelled:
+            self._cancelled.discard(job_id)
+            await self._finish(job, JobStatus.CANCELLED)
+            return
+        progress = JobProgress(job, self.store)
+
+        task = asyncio.create_task(self._handlers[job.type](job.project_id, progress, resume=job.resume))
+        self._running[job_id] = task
+        self._progress[job_id] = progress
+        try:
+            await task
+            await self._finish(job, JobStatus.COMPLETED)
+        except asyncio.CancelledError:
+            if self._stopping:
+                # Shutdown, not a user cancel: resume it on the next start
+                job.status = JobStatus.QUEUED
+                job.resume = True
+                await progress.drain()
+                await asyncio.to_thread(self.store.save, job)
+                raise
+            await self._finish(job, JobStatus.CANCELLED)
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            await self._finish(job, JobStatus.FAILED, str(e))
+        finally:
+            self._running.pop(job_id, None)
+            self._progress.pop(job_id, None)
+
+    async def _finish(self, job: Job, status: JobStatus, error: Optional[str] = None) -> Job:
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.now()
+        if status == JobStatus.COMPLETED:
+            job.eta_seconds = 0
+        # A progress save still in flight must not land after the final state
+        progress = self._progress.get(job.id)
+        if progress:
+            await progress.drain()
+        await asyncio.to_thread(self.store.save, job)
+        return job
+
+_default_queue: Optional[JobQueue] = None
+
+def get_job_queue() -> JobQueue:
+    global _default_queue
+    if _default_queue is None:
+        _default_queue = JobQueue()
+    return _default_queue
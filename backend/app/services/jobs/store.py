@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import threading
+from typing import List, Optional
+from app.models.job import Job, JobStatus
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "backend/data/jobs.db")
+
+class JobStore:
+    """
+    Persists jobs in SQLite so their state survives worker restarts.
+    """
+    def __init__(self, path: str = JOBS_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                project_id TEXT NOT NULL,
+                type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_project ON jobs(project_id, created_at)")
+        self._conn.commit()
+
+    def save(self, job: Job):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, project_id, type, status, created_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+                (job.id, job.project_id, job.type.value, job.status.value, job.created_at.isoformat(), job.model_dump_json())
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.model_validate_json(row[0]) if row else None
+
+    def list(self, project_id: Optional[str] = None, limit: int = 50) -> List[Job]:
+        query = "SELECT data FROM jobs"
+        args = []
+        if project_id:
+            query += " WHERE project_id = ?"
+            args.append(project_id)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        args.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+        return [Job.model_validate_json(r[0]) for r in rows]
+
+    def list_by_status(self, *statuses: JobStatus) -> List[Job]:
+        placeholders = ",".join("?" for _ in statuses)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at",
+                [s.value for s in statuses]
+            ).fetchall()
+        return [Job.model_validate_json(r[0]) for r in rows]
@@ -0,0 +1,75 @@
+import os
+import asyncio
+from collections import deque
+from typing import Any, Dict, Optional
+
+LOOP_LAG_INTERVAL_S = float(os.getenv("LOOP_LAG_INTERVAL_S", "0.1"))
+# Lag above this is counted (and logged) as a stall
+LOOP_LAG_WARN_MS = float(os.getenv("LOOP_LAG_WARN_MS", "200"))
+
+class LoopLagMonitor:
+    """
+    Measures event-loop responsiveness: a task sleeps for a fixed interval and
+    records how late it is woken up. Anything that blocks the loop (sync I/O,
+    CPU work in a handler) shows up directly as lag.
+    """
+    def __init__(self,
+                 interval_s: float = LOOP_LAG_INTERVAL_S,
+                 warn_ms: float = LOOP_LAG_WARN_MS,
+                 window: int = 600):
+        self.interval_s = interval_s
+        self.warn_ms = warn_ms
+        self.max_lag_ms = 0.0
+        self.stalls = 0
+        self._samples: deque = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval_s)
+            lag_ms = max(0.0, loop.time() - start - self.interval_s) * 1000
+            self._samples.append(lag_ms)
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            if lag_ms >= self.warn_ms:
+                self.stalls += 1
+                print(f"Event loop blocked for {lag_ms:.0f}ms")
+
+    def stats(self) -> Dict[str, Any]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"running": self._task is not None, "samples": 0}
+
+        def pct(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 2)
+
+        return {
+            "running": self._task is not None,
+            "interval_ms": self.interval_s * 1000,
+            "samples": len(samples), # recent window the percentiles cover
+            "last_ms": round(self._samples[-1], 2),
+            "p50_ms": pct(0.5),
+            "p99_ms": pct(0.99),
+            "window_max_ms": round(samples[-1], 2),
+            "max_ms": round(self.max_lag_ms, 2), # since start
+            "stalls": self.stalls
+        }
+
+_default_monitor: Optional[LoopLagMonitor] = None
+
+def get_loop_monitor() -> LoopLagMonitor:
+    global _default_monitor
+    if _default_monitor is None:
+        _default_monitor = LoopLagMonitor()
+    return _default_monitor
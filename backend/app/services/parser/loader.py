@@ -1,10 +1,14 @@
 import abc
 import os
+import codecs
+import zipfile
+import posixpath
 import chardet
 import ebooklib
 from ebooklib import epub
 from bs4 import BeautifulSoup
-from typing import List, Optional
+from lxml import etree, html as lxml_html
+from typing import Iterator, List, Optional
 from app.models.book import Book, Chapter, Sentence
 
 class BaseLoader(abc.ABC):
@@ -13,20 +17,11 @@ class BaseLoader(abc.ABC):
         pass
 
 class TextLoader(BaseLoader):
-    def load(self, file_path: str) -> Book:
-        # Detect encoding
-        with open(file_path, 'rb') as f:
-            raw = f.read(10000)
-            result = chardet.detect(raw)
-            encoding = result['encoding'] or 'utf-8'
+    # Bytes read (and decoded) per step when streaming
+    CHUNK_SIZE = 1024 * 1024
 
-        try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            # Fallback to utf-8 with errors ignore/replace if detection failed
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+    def load(self, file_path: str) -> Book:
+        content = "\n".join(self.iter_lines(file_path))
 
         # For TXT, we initially create one big chapter or just raw content
         # Splitting will happen in the next step (ChapterSplitter)
@@ -35,9 +30,6 @@ class TextLoader(BaseLoader):
         # The PRD says "Chapter Splitter" is a separate module (2.2.1).
         # So here we just load the text.
         
-        filename = os.path.basename(file_path)
-        title = os.path.splitext(filename)[0]
-        
         # Create a temporary single chapter with all text
         # The splitter will later take this text and restructure the book
         chapter = Chapter(
@@ -50,21 +42,190 @@ class TextLoader(BaseLoader):
             # Better: The ChapterSplitter will likely take a Book object and refine it.
         )
         
+        book = self.new_book(file_path)
+        book.chapters = [chapter]
+        return book
+
+    def new_book(self, file_path: str) -> Book:
+        """
+        Book-level fields only; chapters come from iter_lines + ChapterSplitter.
+        """
+        filename = os.path.basename(file_path)
         return Book(
             id=filename, # Use filename as ID for now
-            title=title,
-            chapters=[chapter]
+            title=os.path.splitext(filename)[0],
+            chapters=[]
         )
 
+    def iter_lines(self, file_path: str) -> Iterator[str]:
+        """
+        Yields the file's lines (without line endings) while decoding it chunk by chunk.
+        """
+        pending = ""
+        for text in self.iter_text(file_path):
+            # Hold back a trailing \r, its \n may start the next chunk
+            text = (pending + text)
+            carry_cr = text.endswith("\r")
+            if carry_cr:
+                text = text[:-1]
+            lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+            pending = lines.pop() + ("\r" if carry_cr else "")
+            yield from lines
+        if pending:
+            yield pending.rstrip("\r")
+
+    def iter_text(self, file_path: str) -> Iterator[str]:
+        """
+        Decodes the file incrementally. If the detected encoding turns out to be
+        wrong part way through, the rest is decoded as utf-8 ignoring bad bytes.
+        """
+        decoder = codecs.getincrementaldecoder(self._detect_encoding(file_path))()
+        with open(file_path, 'rb') as f:
+            while True:
+                raw = f.read(self.CHUNK_SIZE)
+                try:
+                    text = decoder.decode(raw, final=not raw)
+                except UnicodeDecodeError:
+                    # Fallback to utf-8 with errors ignore if detection failed
+                    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+                    text = decoder.decode(raw, final=not raw)
+                if text:
+                    yield text
+                if not raw:
+                    break
+
+    def _detect_encoding(self, file_path: str) -> str:
+        with open(file_path, 'rb') as f:
+            raw = f.read(10000)
+        encoding = chardet.detect(raw)['encoding'] or 'utf-8'
+        # A pure ASCII head says nothing about the rest of the file
+        return 'utf-8' if encoding.lower() == 'ascii' else encoding
+
 class EpubLoader(BaseLoader):
+    """
+    Reads the container/OPF straight from the zip and walks the spine (reading
+    order), parsing one document at a time with lxml. Title and text come out
+    of a single tree walk. EPUBs whose package cannot be read this way go
+    through ebooklib + BeautifulSoup as before.
+    """
+    SKIP_TAGS = {'script', 'style', 'head'}
+    TITLE_TAGS = {'h1', 'h2'}
+
     def load(self, file_path: str) -> Book:
+        book = self.new_book(file_path)
+        book.chapters = list(self.iter_chapters(file_path))
+        return book
+
+    def new_book(self, file_path: str) -> Book:
+        """
+        Book-level fields only; chapters come from iter_chapters.
+        """
+        try:
+            with zipfile.ZipFile(file_path) as zf:
+                opf, _ = self._read_package(zf)
+            title = self._dc(opf, 'title')
+            author = self._dc(opf, 'creator')
+        except (KeyError, etree.XMLSyntaxError):
+            book = epub.read_epub(file_path)
+            title = book.get_metadata('DC', 'title')[0][0] if book.get_metadata('DC', 'title') else None
+            author = book.get_metadata('DC', 'creator')[0][0] if book.get_metadata('DC', 'creator') else None
+
+        return Book(
+            id=os.path.basename(file_path),
+            title=title or "Unknown",
+            author=author or "Unknown",
+            chapters=[]
+        )
+
+    def iter_chapters(self, file_path: str) -> Iterator[Chapter]:
+        """
+        Yields one chapter per non-empty spine document, reading and parsing
+        each document only when the consumer asks for it.
+        """
+        with zipfile.ZipFile(file_path) as zf:
+            try:
+                opf, opf_dir = self._read_package(zf)
+            except (KeyError, etree.XMLSyntaxError):
+                yield from self._iter_chapters_ebooklib(file_path)
+                return
+
+            # Only (X)HTML content documents; the EPUB3 nav document is a table of contents
+            manifest = {
+                item.get('id'): item.get('href')
+                for item in opf.iter('{*}item')
+                if 'html' in (item.get('media-type') or '') and 'nav' not in (item.get('properties') or '').split()
+            }
+            for itemref in opf.iter('{*}itemref'):
+                item_id = itemref.get('idref')
+                href = manifest.get(item_id)
+                if not href:
+                    continue
+                try:
+                    content = zf.read(posixpath.normpath(posixpath.join(opf_dir, href.split('#')[0])))
+                except KeyError:
+                    print(f"EPUB spine item missing from archive: {href}")
+                    continue
+
+                chapter_title, text = self._extract(content)
+                if text.strip():
+                    yield Chapter(
+                        id=item_id,
+                        title=chapter_title,
+                        sentences=[Sentence(id=f"{item_id}_raw", text=text)]
+                    )
+
+    def _read_package(self, zf: zipfile.ZipFile):
+        container = etree.fromstring(zf.read('META-INF/container.xml'))
+        rootfile = next(container.iter('{*}rootfile'), None)
+        if rootfile is None:
+            raise KeyError('rootfile')
+        opf_path = rootfile.get('full-path')
+        return etree.fromstring(zf.read(opf_path)), posixpath.dirname(opf_path)
+
+    def _dc(self, opf, name: str) -> Optional[str]:
+        el = next(opf.iter('{http://purl.org/dc/elements/1.1/}' + name), None)
+        return el.text.strip() if el is not None and el.text else None
+
+    def _extract(self, content: bytes):
+        """
+        (title, text) in one walk: text nodes joined by newlines like
+        BeautifulSoup's get_text(separator='\\n'), title = first h1/h2.
+        """
+        try:
+            root = lxml_html.document_fromstring(content)
+        except (etree.ParserError, ValueError):
+            # Empty or unparseable document: let the lenient parser try
+            soup = BeautifulSoup(content, 'html.parser')
+            header = soup.find(['h1', 'h2'])
+            return (header.get_text().strip() if header else "Untitled"), soup.get_text(separator='\n')
+
+        parts = []
+        chapter_title = None
+        title_el, title_start = None, 0
+        walker = etree.iterwalk(root, events=('start', 'end'))
+        for event, el in walker:
+            is_element = isinstance(el.tag, str) # comments and PIs have no text of their own
+            if event == 'start':
+                if not is_element:
+                    continue
+                if el.tag in self.SKIP_TAGS:
+                    walker.skip_subtree()
+                    continue
+                if chapter_title is None and title_el is None and el.tag in self.TITLE_TAGS:
+                    title_el, title_start = el, len(parts)
+                if el.text:
+                    parts.append(el.text)
+            else:
+                if el is title_el:
+                    chapter_title = ''.join(parts[title_start:]).strip()
+                    title_el = None
+                if el.tail:
+                    parts.append(el.tail)
+
+        return chapter_title or "Untitled", '\n'.join(parts)
+
+    def _iter_chapters_ebooklib(self, file_path: str) -> Iterator[Chapter]:
         book = epub.read_epub(file_path)
-        title = book.get_metadata('DC', 'title')[0][0] if book.get_metadata('DC', 'title') else "Unknown"
-        author = book.get_metadata('DC', 'creator')[0][0] if book.get_metadata('DC', 'creator') else "Unknown"
-        
-        chapters = []
-        
-        # Iterate items
         for item in book.get_items():
             if item.get_type() == ebooklib.ITEM_DOCUMENT:
                 # Extract text from HTML
@@ -78,18 +239,11 @@ class EpubLoader(BaseLoader):
                     chapter_title = header.get_text().strip()
                 
                 if text.strip():
-                    chapters.append(Chapter(
+                    yield Chapter(
                         id=item.get_id(),
                         title=chapter_title,
                         sentences=[Sentence(id=f"{item.get_id()}_raw", text=text)]
-                    ))
-                    
-        return Book(
-            id=os.path.basename(file_path),
-            title=title,
-            author=author,
-            chapters=chapters
-        )
+                    )
 
 class LoaderFactory:
     @staticmethod
@@ -1,8 +1,10 @@
 import os
+import asyncio
 from fastapi import UploadFile, HTTPException
 
 class FileValidator:
     MAX_SIZE_MB = 100
+    CHUNK_SIZE = 1024 * 1024
     ALLOWED_EXTENSIONS = {'.txt', '.md', '.epub', '.pdf', '.mobi', '.docx'}
 
     @classmethod
@@ -23,6 +25,31 @@ class FileValidator:
         # For now, we'll skip strict size check here or do it during read.
         return True
 
+    @classmethod
+    async def save_upload(cls, file: UploadFile, dest_path: str) -> int:
+        """
+        Streams an upload to dest_path in chunks, enforcing MAX_SIZE_MB as it goes
+        (413 as soon as the limit is crossed). Returns the number of bytes written.
+        """
+        await cls.validate(file)
+        max_bytes = cls.MAX_SIZE_MB * 1024 * 1024
+        size = 0
+        try:
+            with open(dest_path, "wb") as out:
+                while chunk := await file.read(cls.CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"File too large. Max: {cls.MAX_SIZE_MB}MB"
+                        )
+                    await asyncio.to_thread(out.write, chunk)
+        except BaseException:
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            raise
+        return size
+
     @classmethod
     def validate_path(cls, file_path: str):
         if not os.path.exists(file_path):
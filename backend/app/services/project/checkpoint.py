@@ -0,0 +1,75 @@
+import os
+import time
+import asyncio
+from typing import Callable, List, Optional
+from app.models.book import Chapter
+
+CHECKPOINT_INTERVAL_S = float(os.getenv("CHECKPOINT_INTERVAL_S", "30"))
+CHECKPOINT_EVERY = int(os.getenv("CHECKPOINT_EVERY", "500"))
+
+class Checkpointer:
+    """
+    Periodically persists per-sentence progress during long runs.
+    Pipelines call mark(chapter) whenever a sentence of that chapter is done;
+    save(dirty_chapters) runs once CHECKPOINT_EVERY sentences or
+    CHECKPOINT_INTERVAL_S seconds have passed since the last save.
+
+    save runs in a worker thread, at most one at a time; chapters marked while
+    it runs go into the next one. Call drain() before writing the book yourself.
+    """
+    def __init__(self,
+                 save: Callable[[List[Chapter]], None],
+                 interval_s: float = CHECKPOINT_INTERVAL_S,
+                 every: int = CHECKPOINT_EVERY):
+        self.save = save
+        self.interval_s = interval_s
+        self.every = every
+        self.saves = 0
+        self._pending = 0
+        self._dirty: List[Chapter] = []
+        self._last_save = time.monotonic()
+        self._saving: Optional[asyncio.Task] = None
+
+    def mark(self, chapter: Optional[Chapter] = None, n: int = 1):
+        if chapter is not None and not any(c is chapter for c in self._dirty):
+            self._dirty.append(chapter)
+        self._pending += n
+        if self._saving is None and (
+            self._pending >= self.every or time.monotonic() - self._last_save >= self.interval_s
+        ):
+            self._saving = asyncio.ensure_future(self._flush())
+
+    async def flush(self):
+        """
+        Saves everything marked so far, after any save already in flight.
+        """
+        await self.drain()
+        self._saving = asyncio.ensure_future(self._flush())
+        await self.drain()
+
+    async def drain(self):
+        """
+        Waits for the save in flight, if any.
+        """
+        while self._saving is not None:
+            await asyncio.shield(self._saving)
+
+    async def _flush(self):
+        try:
+            if not self._pending and not self._dirty:
+                return
+            # The list is snapshotted here; each chapter is serialized in one call into
+            # pydantic-core, which holds the GIL, so it is consistent even though the
+            # loop keeps updating other sentences while the thread runs
+            dirty, self._dirty = self._dirty, []
+            self._pending = 0
+            self._last_save = time.monotonic()
+            try:
+                await asyncio.to_thread(self.save, dirty)
+                self.saves += 1
+            except Exception as e:
+                # A failed checkpoint must not kill the run; the next one retries
+                print(f"Checkpoint failed: {e}")
+                self._dirty.extend(c for c in dirty if not any(c is d for d in self._dirty))
+        finally:
+            self._saving = None
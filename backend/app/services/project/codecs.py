@@ -0,0 +1,128 @@
+import os
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Format of newly written chapter shards: json or json.zst.
+# Shards are read by their file extension, so stores can mix formats and are
+# converted to the configured one on their next full save.
+BOOK_STORE_FORMAT = os.getenv("BOOK_STORE_FORMAT", "json")
+BOOK_STORE_ZSTD_LEVEL = int(os.getenv("BOOK_STORE_ZSTD_LEVEL", "3"))
+
+FORMATS = ("json", "json.zst")
+
+class ShardCodec(ABC):
+    """
+    Encodes one chapter (a model or its model_dump() dict) to shard bytes and back to a dict.
+    """
+    extension = ""
+
+    @abstractmethod
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        ...
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        ...
+
+    def encode_model(self, model: BaseModel) -> bytes:
+        return self.encode(model.model_dump())
+
+    def to_json(self, data: bytes) -> bytes:
+        """
+        Shard bytes as JSON, for serving a stored chapter without building the model.
+        """
+        return to_json(self.decode(data))
+
+class JsonCodec(ShardCodec):
+    extension = "json"
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        # Same bytes as model_dump_json
+        return to_json(data)
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        return orjson.loads(data) if orjson else json.loads(data)
+
+    def encode_model(self, model: BaseModel) -> bytes:
+        return model.model_dump_json().encode("utf-8")
+
+    def to_json(self, data: bytes) -> bytes:
+        return data
+
+class ZstdCodec(ShardCodec):
+    def __init__(self, inner: ShardCodec, level: int = BOOK_STORE_ZSTD_LEVEL):
+        self.inner = inner
+        self.level = level
+        self.extension = f"{inner.extension}.zst"
+
+    # (De)compressor objects are not thread-safe; shards are written from worker threads
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(self.inner.encode(data))
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        return self.inner.decode(zstandard.ZstdDecompressor().decompress(data))
+
+    def encode_model(self, model: BaseModel) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(self.inner.encode_model(model))
+
+    def to_json(self, data: bytes) -> bytes:
+        # Compressed JSON only needs decompressing
+        return self.inner.to_json(zstandard.ZstdDecompressor().decompress(data))
+
+_REQUIRES = {"zst": ("zstandard", zstandard)}
+
+def missing_package(fmt: str) -> Optional[str]:
+    """
+    Name of a missing package the format needs, or None.
+    """
+    for part in fmt.split("."):
+        package, module = _REQUIRES.get(part, (None, True))
+        if module is None:
+            return package
+    return None
+
+_codecs: Dict[str, ShardCodec] = {}
+
+def codec_for(fmt: str) -> ShardCodec:
+    codec = _codecs.get(fmt)
+    if codec is None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown book store format: {fmt}")
+        missing = missing_package(fmt)
+        if missing:
+            raise RuntimeError(f"Book store format '{fmt}' needs the '{missing}' package (pip install {missing})")
+        codec = _codecs[fmt] = ZstdCodec(JsonCodec()) if fmt.endswith(".zst") else JsonCodec()
+    return codec
+
+def shard_format(shard: str) -> str:
+    # "00012.json.zst" -> "json.zst"
+    return shard.split(".", 1)[1]
+
+def is_shard(name: str) -> bool:
+    parts = name.split(".", 1)
+    return len(parts) == 2 and parts[0].isdigit() and parts[1] in FORMATS
+
+_default_codec: Optional[ShardCodec] = None
+
+def get_default_codec() -> ShardCodec:
+    global _default_codec
+    if _default_codec is None:
+        missing = missing_package(BOOK_STORE_FORMAT)
+        if missing:
+            print(f"BOOK_STORE_FORMAT={BOOK_STORE_FORMAT} needs the '{missing}' package; writing json shards")
+            _default_codec = JsonCodec()
+        else:
+            _default_codec = codec_for(BOOK_STORE_FORMAT)
+    return _default_codec
@@ -0,0 +1,122 @@
+import os
+import json
+import sqlite3
+import threading
+from typing import List, Optional, Tuple
+from app.models.project import Project, ProjectStatus
+
+PROJECT_INDEX_PATH = os.getenv("PROJECT_INDEX_PATH", "backend/data/projects.db")
+
+SORT_COLUMNS = ("updated_at", "created_at", "name", "status")
+
+class ProjectIndex:
+    """
+    SQLite catalog of project.json contents, so listing projects does not read
+    every project directory. project.json stays the source of truth: the index
+    is updated on every save and can be rebuilt from disk at any time.
+    """
+    def __init__(self, path: str = PROJECT_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS projects (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+        """)
+        for column in SORT_COLUMNS:
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_projects_{column} ON projects({column})")
+        self._conn.commit()
+
+    def upsert(self, project: Project):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO projects (id, name, status, created_at, updated_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+                self._row(project)
+            )
+            self._conn.commit()
+
+    def remove(self, project_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+            self._conn.commit()
+
+    def list(self,
+             status: Optional[ProjectStatus] = None,
+             sort: str = "updated_at",
+             descending: bool = True,
+             offset: int = 0,
+             limit: Optional[int] = None) -> Tuple[List[Project], int]:
+        """
+        Returns one page of projects plus the total number matching the filter.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort}")
+
+        where, args = "", []
+        if status:
+            where = " WHERE status = ?"
+            args.append(ProjectStatus(status).value)
+
+        order = "DESC" if descending else "ASC"
+        query = f"SELECT data FROM projects{where} ORDER BY {sort} {order}, id LIMIT ? OFFSET ?"
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM projects{where}", args).fetchone()[0]
+            rows = self._conn.execute(query, args + [-1 if limit is None else limit, offset]).fetchall()
+        return [Project.model_validate_json(r[0]) for r in rows], total
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    def rebuild(self, projects_dir: str) -> int:
+        """
+        Re-reads every project.json under projects_dir and replaces the index contents.
+        """
+        rows = []
+        if os.path.exists(projects_dir):
+            for pid in os.listdir(projects_dir):
+                p_file = os.path.join(projects_dir, pid, "project.json")
+                if not os.path.exists(p_file):
+                    continue
+                try:
+                    with open(p_file, "r") as f:
+                        rows.append(self._row(Project(**json.load(f))))
+                except Exception as e:
+                    print(f"Error indexing project {pid}: {e}")
+
+        with self._lock:
+            self._conn.execute("DELETE FROM projects")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO projects (id, name, status, created_at, updated_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def _row(self, project: Project):
+        return (
+            project.id,
+            project.name,
+            project.status.value,
+            project.created_at.isoformat(),
+            project.updated_at.isoformat(),
+            project.model_dump_json()
+        )
+
+_default_index: Optional[ProjectIndex] = None
+
+def get_project_index() -> ProjectIndex:
+    global _default_index
+    if _default_index is None:
+        _default_index = ProjectIndex()
+    return _default_index
@@ -0,0 +1,62 @@
+import time
+import itertools
+from typing import Any, Dict, Iterable, Iterator
+from app.models.book import Chapter, Sentence
+from app.services.parser.loader import LoaderFactory, TextLoader, EpubLoader
+from app.services.cleaner.splitter import ChapterSplitter, SentenceSplitter
+from app.services.project.storage import BookStore
+
+def iter_text_chapters(splitter: ChapterSplitter, lines: Iterable[str]) -> Iterator[Chapter]:
+    """
+    splitter.iter_chapters over the lines, except that a text of at most
+    RAW_MIN_CHARS stays one raw chapter, as TextLoader.load + split gives it.
+    """
+    lines = iter(lines)
+    head = []
+    size = -1
+    for line in lines:
+        head.append(line)
+        size += len(line) + 1
+        if size > splitter.RAW_MIN_CHARS:
+            yield from splitter.iter_chapters(itertools.chain(head, lines))
+            return
+    yield Chapter(id="raw", title="Raw Content", sentences=[Sentence(id="raw_s", text="\n".join(head))])
+
+def parse_book(file_path: str, book_id: str, book_path: str) -> Dict[str, Any]:
+    """
+    Load -> chapter split -> sentence split -> sharded store at book_path.
+
+    Top-level and free of shared state so it can run in a worker process
+    (see app.services.executors); only the small stats dict is sent back.
+    """
+    start = time.perf_counter()
+    loader = LoaderFactory.get_loader(file_path)
+    splitter = ChapterSplitter()
+    sent_splitter = SentenceSplitter()
+
+    if isinstance(loader, TextLoader):
+        # Plain text is streamed: decode -> lines -> chapters -> shards,
+        # so at most one chapter is in memory at a time
+        book = loader.new_book(file_path)
+        chapters = iter_text_chapters(splitter, loader.iter_lines(file_path))
+    elif isinstance(loader, EpubLoader):
+        # Spine documents are parsed one at a time as the store pulls them
+        book = loader.new_book(file_path)
+        chapters = splitter.iter_split(loader.iter_chapters(file_path))
+    else:
+        book = splitter.split(loader.load(file_path))
+        chapters = iter(book.chapters)
+    book.id = book_id
+
+    stats = {"chapters": 0, "sentences": 0}
+
+    def split(chapters: Iterable[Chapter]) -> Iterator[Chapter]:
+        for chapter in chapters:
+            sent_splitter.split_chapter(chapter)
+            stats["sentences"] += len(chapter.sentences)
+            yield chapter
+
+    # Sentence split and save each chapter as it comes
+    stats["chapters"] = BookStore(book_path).save_stream(book, split(chapters))
+    stats["parse_seconds"] = time.perf_counter() - start
+    return stats
@@ -2,48 +2,79 @@ import os
 import json
 import uuid
 import shutil
+import time
+import asyncio
 from datetime import datetime
-from typing import List, Optional
-from app.models.project import Project, ProjectStatus
-from app.models.book import Book
-from app.services.parser.loader import LoaderFactory
-from app.services.cleaner.splitter import ChapterSplitter, SentenceSplitter
+from typing import List, Optional, Tuple
+from app.models.project import Project, ProjectStatus, ImportResult
+from app.models.book import Book, Chapter, Sentence, SentencePatch, ChapterSummary
 
 from app.services.cleaner.llm_client import LLMClient
 from app.services.cleaner.cleaner import TextCleaner
+from app.services.cleaner.prefilter import SentencePrefilter, PREFILTER_ENABLED
 from app.services.cleaner.emotion import EmotionAnalyzer
 from app.services.cleaner.speaker import SpeakerAssigner
-from app.services.tts.client import TTSClient, TTSBatchProcessor
+from app.services.cleaner.batch import BatchAnalyzer
+from app.services.cleaner.pipeline import AnalysisPipeline
+from app.services.cleaner.emotion_post import EmotionPostProcessor, EMOTION_POSTPROCESS, DERIVED_KEYS
+from app.services.cleaner.emotion_quant import EmotionQuantizer, EMOTION_QUANTIZE, METHODS as EMOTION_QUANT_METHODS
+from app.services.tts.client import TTSClient
+from app.services.tts.scheduler import SynthesisScheduler
 from app.services.audio.assembler import AudioAssembler
+from app.services.project.checkpoint import Checkpointer
+from app.services.project.storage import BookStore
+from app.services.project.index import ProjectIndex, get_project_index
+from app.services.project.ingest import parse_book
+from app.services.executors import run_in_process
 
 PROJECTS_DIR = "backend/data/projects"
 OUTPUT_DIR = "backend/data/outputs"
+# Delete per-sentence clips once their chapter has been assembled
+ASSEMBLY_CLEANUP_CLIPS = os.getenv("ASSEMBLY_CLEANUP_CLIPS", "0") == "1"
 
 class ProjectManager:
-    def __init__(self):
+    def __init__(self, index: Optional[ProjectIndex] = None):
         os.makedirs(PROJECTS_DIR, exist_ok=True)
         os.makedirs(OUTPUT_DIR, exist_ok=True)
+        self.index = index or get_project_index()
+        self._migrate_legacy_books()
+        # First start with an index (or a deleted one): build it from the project files
+        if self.index.count() == 0 and os.listdir(PROJECTS_DIR):
+            self.index.rebuild(PROJECTS_DIR)
 
-    def list_projects(self) -> List[Project]:
-        projects = []
-        if not os.path.exists(PROJECTS_DIR):
-            return []
-            
-        for pid in os.listdir(PROJECTS_DIR):
-            p_dir = os.path.join(PROJECTS_DIR, pid)
-            if os.path.isdir(p_dir):
-                p_file = os.path.join(p_dir, "project.json")
-                if os.path.exists(p_file):
-                    try:
-                        with open(p_file, "r") as f:
-                            data = json.load(f)
-                            projects.append(Project(**data))
-                    except Exception as e:
-                        print(f"Error loading project {pid}: {e}")
-        
-        # Sort by updated_at desc
-        projects.sort(key=lambda x: x.updated_at, reverse=True)
-        return projects
+    def _migrate_legacy_books(self):
+        """
+        Projects created before sharded storage point at a monolithic book.json;
+        converted once at startup, before any request, so reads never write.
+        """
+        for project_id in os.listdir(PROJECTS_DIR):
+            p_file = os.path.join(PROJECTS_DIR, project_id, "project.json")
+            if not os.path.isfile(p_file):
+                continue
+            try:
+                with open(p_file, "r") as f:
+                    project = Project(**json.load(f))
+                if project.book_path and project.book_path.endswith(".json") and os.path.isfile(project.book_path):
+                    book_dir = os.path.join(PROJECTS_DIR, project_id, "book")
+                    BookStore.migrate_from_json(project.book_path, book_dir)
+                    project.book_path = book_dir
+                    self._save_project_file(project)
+            except Exception as e:
+                print(f"Migration of project {project_id} failed: {e}")
+
+    def list_projects(self,
+                      status: Optional[ProjectStatus] = None,
+                      sort: str = "updated_at",
+                      descending: bool = True,
+                      offset: int = 0,
+                      limit: Optional[int] = None) -> Tuple[List[Project], int]:
+        """
+        One page of projects and the total matching the filter, from the index.
+        """
+        return self.index.list(status, sort, descending, offset, limit)
+
+    def rebuild_index(self) -> int:
+        return self.index.rebuild(PROJECTS_DIR)
 
     def get_project(self, project_id: str) -> Optional[Project]:
         p_file = os.path.join(PROJECTS_DIR, project_id, "project.json")
@@ -53,52 +84,146 @@ class ProjectManager:
             return Project(**json.load(f))
 
     def create_project(self, file_path: str, filename: str) -> Project:
+        """
+        Parses in the calling thread; servers should use import_book instead.
+        """
         project_id = str(uuid.uuid4())
-        project_dir = os.path.join(PROJECTS_DIR, project_id)
-        os.makedirs(project_dir, exist_ok=True)
-
-        # 1. Parse Book
+        book_path = self._book_dir(project_id)
         try:
-            loader = LoaderFactory.get_loader(file_path)
-            book = loader.load(file_path)
-            book.id = project_id
-            
-            # Initial Split
-            splitter = ChapterSplitter()
-            book = splitter.split(book)
-            sent_splitter = SentenceSplitter()
-            book = sent_splitter.split(book)
-            
-            # Save Book Content
-            book_path = os.path.join(project_dir, "book.json")
-            self._save_book_file(book, book_path)
-            
-            # Create Project Metadata
-            project = Project(
-                id=project_id,
-                name=filename,
-                status=ProjectStatus.STRUCTURED,
-                book_path=book_path,
-                created_at=datetime.now(),
-                updated_at=datetime.now()
-            )
-            self._save_project_file(project)
-            
-            return project
-            
+            parse_book(file_path, project_id, book_path)
         except Exception as e:
             # Cleanup if failed
-            shutil.rmtree(project_dir)
+            shutil.rmtree(os.path.dirname(book_path), ignore_errors=True)
+            raise e
+        return self._register_project(project_id, filename, book_path)
+
+    async def import_book(self, file_path: str, filename: str) -> Project:
+        """
+        Same as create_project, with parsing done in the process pool.
+        """
+        return (await self._import(file_path, filename))[0]
+
+    async def import_books(self, files: List[Tuple[str, str]]) -> List[ImportResult]:
+        """
+        Imports (file_path, filename) pairs in parallel across the process pool.
+        Failures are reported per book and do not stop the others.
+        """
+        async def run(file_path: str, filename: str) -> ImportResult:
+            start = time.perf_counter()
+            try:
+                project, stats = await self._import(file_path, filename)
+                return ImportResult(
+                    filename=filename,
+                    project_id=project.id,
+                    chapters=stats["chapters"],
+                    sentences=stats["sentences"],
+                    parse_seconds=stats["parse_seconds"],
+                    total_seconds=time.perf_counter() - start
+                )
+            except Exception as e:
+                print(f"Import of {filename} failed: {e}")
+                return ImportResult(filename=filename, error=str(e), total_seconds=time.perf_counter() - start)
+
+        return await asyncio.gather(*(run(path, name) for path, name in files))
+
+    async def _import(self, file_path: str, filename: str):
+        # Parsing in a worker process, file and index writes in a thread: the loop only awaits
+        project_id = str(uuid.uuid4())
+        book_path = await asyncio.to_thread(self._book_dir, project_id)
+        try:
+            stats = await run_in_process(parse_book, file_path, project_id, book_path)
+        except Exception as e:
+            await asyncio.to_thread(shutil.rmtree, os.path.dirname(book_path), ignore_errors=True)
             raise e
+        return await asyncio.to_thread(self._register_project, project_id, filename, book_path), stats
+
+    def _book_dir(self, project_id: str) -> str:
+        project_dir = os.path.join(PROJECTS_DIR, project_id)
+        os.makedirs(project_dir, exist_ok=True)
+        return os.path.join(project_dir, "book")
+
+    def _register_project(self, project_id: str, filename: str, book_path: str) -> Project:
+        project = Project(
+            id=project_id,
+            name=filename,
+            status=ProjectStatus.STRUCTURED,
+            book_path=book_path,
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+        self._save_project_file(project)
+        return project
 
     def get_book_content(self, project_id: str) -> Optional[Book]:
         project = self.get_project(project_id)
-        if not project or not project.book_path or not os.path.exists(project.book_path):
+        if not project or not project.book_path:
             return None
-        
-        with open(project.book_path, "r") as f:
-            data = json.load(f)
-            return Book(**data)
+
+        store = BookStore(project.book_path)
+        if not store.exists():
+            return None
+        return store.load()
+
+    def get_book_store(self, project_id: str) -> Optional[BookStore]:
+        project = self.get_project(project_id)
+        if not project or not project.book_path:
+            return None
+        store = BookStore(project.book_path)
+        return store if store.exists() else None
+
+    def get_chapter(self, project_id: str, chapter_id: str) -> Optional[Chapter]:
+        project = self.get_project(project_id)
+        if not project or not project.book_path:
+            return None
+        store = BookStore(project.book_path)
+        return store.load_chapter(chapter_id) if store.exists() else None
+
+    def list_chapters(self, project_id: str) -> Optional[List[ChapterSummary]]:
+        """
+        Chapter index from the book's meta file; no chapter shard is read.
+        """
+        project = self.get_project(project_id)
+        if not project or not project.book_path:
+            return None
+        store = BookStore(project.book_path)
+        if not store.exists():
+            return None
+        return [ChapterSummary(**entry) for entry in store.load_meta()["chapters"]]
+
+    def patch_sentences(self, project_id: str, chapter_id: str, patches: List[SentencePatch]) -> List[Sentence]:
+        """
+        Partial sentence edits with optimistic versioning (raises VersionConflict).
+        """
+        project = self.get_project(project_id)
+        if not project:
+            raise ValueError("Project not found")
+
+        # A hand-edited vector is final: drop what post-processing and quantization
+        # kept of the LLM's, so a later run does not start from those
+        patches = [
+            p.model_copy(update={"metadata": {**{key: None for key in DERIVED_KEYS}, **(p.metadata or {})}})
+            if "emotion_vector" in p.model_fields_set else p
+            for p in patches
+        ]
+        sentences = BookStore(project.book_path).patch_sentences(chapter_id, patches)
+
+        project.updated_at = datetime.now()
+        self._save_project_file(project)
+        return sentences
+
+    def update_sentences(self, project_id: str, chapter_id: str, sentences: List[Sentence]) -> Chapter:
+        """
+        Replaces individual sentences of one chapter; only that chapter's shard is rewritten.
+        """
+        project = self.get_project(project_id)
+        if not project:
+            raise ValueError("Project not found")
+
+        chapter = BookStore(project.book_path).update_sentences(chapter_id, sentences)
+
+        project.updated_at = datetime.now()
+        self._save_project_file(project)
+        return chapter
 
     def update_book_content(self, project_id: str, book: Book) -> Project:
         project = self.get_project(project_id)
@@ -121,70 +246,133 @@ class ProjectManager:
         self._save_project_file(project)
         return project
 
-    async def analyze_project(self, project_id: str) -> Project:
-        project = self.get_project(project_id)
+    async def analyze_project(self, project_id: str, progress=None, resume: bool = False) -> Project:
+        project = await asyncio.to_thread(self.get_project, project_id)
         if not project:
             raise ValueError("Project not found")
-            
-        book = self.get_book_content(project_id)
-        if not book:
+        return await self._run_holding(self._analyze, project, progress, resume)
+
+    async def synthesize_project(self, project_id: str, progress=None, resume: bool = False) -> Project:
+        project = await asyncio.to_thread(self.get_project, project_id)
+        if not project:
+            raise ValueError("Project not found")
+        return await self._run_holding(self._synthesize, project, progress, resume)
+
+    async def _run_holding(self, run, project: Project, progress, resume: bool) -> Project:
+        store = await asyncio.to_thread(self.get_book_store, project.id)
+        if not store:
             raise ValueError("Book content not found")
+        # The job works on an in-memory copy of the book: edits through the API
+        # answer 409 until it has been written back, rather than being overwritten
+        await asyncio.to_thread(store.hold)
+        try:
+            return await run(project, store, progress, resume)
+        finally:
+            store.release()
+
+    async def _analyze(self, project: Project, store: BookStore, progress, resume: bool) -> Project:
+        # Columnar from load to save: Sentence models only exist for the rows in
+        # flight to the per-sentence prompts, not for the whole book
+        table = await asyncio.to_thread(store.load_table)
 
         # Initialize Services
         llm_client = LLMClient()
-        cleaner = TextCleaner(llm_client)
+        cleaner = TextCleaner(llm_client, prefilter=SentencePrefilter() if PREFILTER_ENABLED else None)
         emotion_analyzer = EmotionAnalyzer(llm_client)
         speaker_assigner = SpeakerAssigner("backend/assets")
+        batch_analyzer = BatchAnalyzer(llm_client, cleaner, emotion_analyzer)
+        pipeline = AnalysisPipeline(cleaner, emotion_analyzer, batch_analyzer=batch_analyzer)
 
-        # Run Analysis
-        for chapter in book.chapters:
-            for sentence in chapter.sentences:
-                # Clean
-                sentence = await cleaner.clean_sentence(sentence)
-                # Analyze Emotion
-                if not sentence.is_noise:
-                    sentence = await emotion_analyzer.analyze_sentence(sentence)
+        if progress:
+            progress.set_total(len(table), done=sum(pipeline.analyzed_rows(table)) if resume else 0)
+
+        # Persist partial results periodically so a crash can resume from here
+        checkpoint = Checkpointer(lambda chapters: store.save_table_chapters(table, chapters))
+
+        # Run Analysis (clean + emotion, concurrently across chapters and sentences)
+        table = await pipeline.run(table, progress=progress, checkpoint=checkpoint, resume=resume)
+        if cleaner.prefilter:
+            stats = cleaner.prefilter.stats()
+            print(f"Prefilter: {stats['skipped']}/{stats['checked']} sentences resolved without the LLM "
+                  f"({stats['noise']} noise, {stats['narration']} narration)")
+        # The stages below rewrite whole columns in a thread
+        await checkpoint.drain()
+
+        # Normalize and smooth emotion vectors before they reach TTS
+        if EMOTION_POSTPROCESS:
+            await asyncio.to_thread(EmotionPostProcessor().process_table, table)
         
         # Assign Voices
-        book = speaker_assigner.assign_voices(book)
+        table = await asyncio.to_thread(speaker_assigner.assign_voices, table)
+
+        # Snap emotions to per-book prototypes so repeated lines share cached clips
+        if EMOTION_QUANTIZE in EMOTION_QUANT_METHODS:
+            report = await asyncio.to_thread(EmotionQuantizer().quantize_table, table)
+            if report["sentences"]:
+                print(f"Emotion quantization: {len(report['prototypes'])} prototypes, "
+                      f"{report['voice_emotions_before']} -> {report['voice_emotions_after']} (voice, emotion) combinations")
         
         # Save
-        self._save_book_file(book, project.book_path)
-        return self.update_project_status(project_id, ProjectStatus.ANALYZED)
+        await asyncio.to_thread(store.save_table, table)
+        return await asyncio.to_thread(self.update_project_status, project.id, ProjectStatus.ANALYZED)
 
-    async def synthesize_project(self, project_id: str) -> Project:
-        project = self.get_project(project_id)
-        if not project:
-            raise ValueError("Project not found")
-            
-        book = self.get_book_content(project_id)
-        if not book:
-            raise ValueError("Book content not found")
+    async def _synthesize(self, project: Project, store: BookStore, progress, resume: bool) -> Project:
+        book = await asyncio.to_thread(store.load)
 
         # Initialize TTS Client
         tts_client = TTSClient() # Uses default URL from env or default
-        batch_processor = TTSBatchProcessor(tts_client)
+        scheduler = SynthesisScheduler(tts_client)
         audio_assembler = AudioAssembler()
         
         # Output dir for this project
-        project_output_dir = os.path.join(OUTPUT_DIR, project_id)
+        project_output_dir = os.path.join(OUTPUT_DIR, project.id)
         clips_dir = os.path.join(project_output_dir, "clips")
         os.makedirs(clips_dir, exist_ok=True)
 
-        # Synthesize
+        # Chapters are assembled as soon as their clips are done, while later ones synthesize
+        final_dir = await asyncio.to_thread(audio_assembler.prepare_book, book, project_output_dir)
+        # On resume, chapters assembled by the earlier run keep their audio and are skipped
+        assembled = set()
+        if resume:
+            assembled = await asyncio.to_thread(lambda: {c.id for c in book.chapters if scheduler.is_assembled(c)})
         for chapter in book.chapters:
-            for sentence in chapter.sentences:
-                if sentence.is_noise:
-                    continue
-                
-                speaker_audio = sentence.metadata.get("speaker_audio_path")
-                if not speaker_audio or not os.path.exists(speaker_audio):
-                    speaker_audio = "backend/assets/ref_audio.wav"
-                
-                await batch_processor.process_sentence(sentence, speaker_audio, clips_dir)
-
-        # Assemble
-        final_dir = audio_assembler.assemble_book(book, project_output_dir)
+            if chapter.id not in assembled:
+                chapter.audio_path = None
+                chapter.duration = 0.0
+        assembly_lock = asyncio.Lock()
+
+        async def assemble_chapter(chapter):
+            async with assembly_lock:
+                await asyncio.to_thread(audio_assembler.assemble_chapter, chapter, final_dir, project_output_dir)
+                if ASSEMBLY_CLEANUP_CLIPS:
+                    await asyncio.to_thread(audio_assembler.cleanup_chapter_clips, chapter)
+                await asyncio.to_thread(audio_assembler.write_metadata, book, final_dir)
+            # Persist the chapter's audio_path, the marker a resumed run skips it by
+            checkpoint.mark(chapter, 0)
+
+        if progress:
+            voiced = [(c, s) for c in book.chapters for s in c.sentences if not s.is_noise]
+            # Checking clips reads a WAV header per sentence
+            done = await asyncio.to_thread(lambda: sum(
+                1 for c, s in voiced if resume and (c.id in assembled or scheduler.is_synthesized(s))
+            ))
+            progress.set_total(len(voiced), done=done)
+
+        # Persist audio paths periodically so a crash can resume from here
+        checkpoint = Checkpointer(lambda chapters: store.save_chapters(book, chapters))
+
+        # Synthesize (all sentences in flight, concurrency adapted to the TTS server)
+        try:
+            book = await scheduler.run(
+                book, clips_dir,
+                on_chapter_done=assemble_chapter,
+                progress=progress,
+                checkpoint=checkpoint,
+                resume=resume,
+                skip_chapters=assembled
+            )
+        finally:
+            await asyncio.to_thread(audio_assembler.finish_book, project_output_dir)
         
         # Update Project
         project.audio_dir = final_dir
@@ -192,8 +380,9 @@ class ProjectManager:
         project.updated_at = datetime.now()
         
         # Save updated book (with audio paths) and project
-        self._save_book_file(book, project.book_path)
-        self._save_project_file(project)
+        await checkpoint.drain()
+        await asyncio.to_thread(store.save, book)
+        await asyncio.to_thread(self._save_project_file, project)
         
         return project
 
@@ -201,7 +390,7 @@ class ProjectManager:
         p_dir = os.path.join(PROJECTS_DIR, project.id)
         with open(os.path.join(p_dir, "project.json"), "w") as f:
             f.write(project.model_dump_json(indent=2))
+        self.index.upsert(project)
 
     def _save_book_file(self, book: Book, path: str):
-        with open(path, "w") as f:
-            f.write(book.model_dump_json(indent=2))
+        BookStore(path).save(book)
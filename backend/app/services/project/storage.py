@@ -0,0 +1,349 @@
+import os
+import json
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from app.models.book import Book, Chapter, Sentence, SentencePatch
+from app.models.table import SentenceTable
+from app.services.project.codecs import (
+    ShardCodec, codec_for, get_default_codec, is_shard, shard_format
+)
+
+META_FILE = "meta.json"
+CHAPTERS_DIR = "chapters"
+
+# Read-modify-write of a shard must not interleave between requests
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+def _lock_for(root: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(os.path.abspath(root), threading.Lock())
+
+# Roots a long-running job has loaded and will write back (see BookStore.hold)
+_held: Set[str] = set()
+
+class VersionConflict(Exception):
+    def __init__(self, conflicts: List[Dict[str, Any]]):
+        super().__init__(f"Version conflict on {len(conflicts)} sentence(s)")
+        self.conflicts = conflicts
+
+class StoreBusy(Exception):
+    pass
+
+def _write_atomic(path: str, data: bytes):
+    # Write beside and swap in, so readers never see a half-written shard
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class BookStore:
+    """
+    Sharded on-disk book.
+
+        <root>/meta.json            book fields + chapter index (id, title, shard, audio, duration, size)
+        <root>/chapters/00000.json  one chapter with all of its sentences
+
+    Reads and writes can target a single chapter, so the cost of an edit scales
+    with the chapter, not with the book.
+
+    Shards are encoded with codec (BOOK_STORE_FORMAT by default: json,
+    optionally zstd-compressed); the extension names the format, so shards are
+    always read with the codec that wrote them. Partial writes keep a shard's
+    format, full saves convert the whole book to the store's codec.
+
+    Every write holds the root's lock. A job that keeps the book in memory
+    while it runs holds the store (hold/release); writes through any other
+    BookStore of that root raise StoreBusy meanwhile, instead of being
+    overwritten by the job's next save.
+    """
+    def __init__(self, root: str, codec: Optional[ShardCodec] = None):
+        self.root = root
+        self.chapters_dir = os.path.join(root, CHAPTERS_DIR)
+        self.codec = codec or get_default_codec()
+        self._holding = False
+
+    def exists(self) -> bool:
+        return os.path.exists(os.path.join(self.root, META_FILE))
+
+    def hold(self):
+        """
+        Reserves the store for this instance; waits for writes in flight.
+        """
+        with _lock_for(self.root):
+            self._check_writable()
+            _held.add(os.path.abspath(self.root))
+            self._holding = True
+
+    def release(self):
+        if self._holding:
+            _held.discard(os.path.abspath(self.root))
+            self._holding = False
+
+    # Reads
+
+    def load_meta(self) -> Dict[str, Any]:
+        with open(os.path.join(self.root, META_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load(self) -> Book:
+        meta = self.load_meta()
+        chapters = [self._read_chapter(entry["shard"]) for entry in meta["chapters"]]
+        return Book(**{k: v for k, v in meta.items() if k != "chapters"}, chapters=chapters)
+
+    def load_chapter(self, chapter_id: str) -> Optional[Chapter]:
+        entry = self._find(self.load_meta(), chapter_id)
+        return self._read_chapter(entry["shard"]) if entry else None
+
+    def load_table(self) -> SentenceTable:
+        """
+        Columnar form for pipeline work, built one shard at a time so the full
+        Book model never exists in memory.
+        """
+        meta = self.load_meta()
+        book = Book(**{k: v for k, v in meta.items() if k != "chapters"})
+        return SentenceTable.from_chapter_dicts(book, (self._read_chapter_dict(e["shard"]) for e in meta["chapters"]))
+
+    def iter_json(self) -> Iterator[bytes]:
+        """
+        The whole book as Book JSON, assembled from the stored shards without
+        parsing or re-serializing them, one chapter at a time.
+        """
+        meta = self.load_meta()
+        entries = meta.pop("chapters")
+        head = json.dumps(meta, ensure_ascii=False)
+        yield (head[:-1] + (', ' if meta else '') + '"chapters": [').encode("utf-8")
+        for index, entry in enumerate(entries):
+            if index:
+                yield b", "
+            with open(os.path.join(self.chapters_dir, entry["shard"]), "rb") as f:
+                yield codec_for(shard_format(entry["shard"])).to_json(f.read())
+        yield b"]}"
+
+    # Writes
+
+    def save(self, book: Book):
+        """
+        Rewrites every shard; use save_chapters for partial updates.
+        """
+        with _lock_for(self.root):
+            self._check_writable()
+            self._save(book)
+
+    def _save(self, book: Book):
+        os.makedirs(self.chapters_dir, exist_ok=True)
+        shards = []
+        for index, chapter in enumerate(book.chapters):
+            shard = f"{index:05d}.{self.codec.extension}"
+            _write_atomic(os.path.join(self.chapters_dir, shard), self.codec.encode_model(chapter))
+            shards.append(shard)
+        self._write_meta(book, shards)
+        self._remove_stale(shards)
+
+    def save_stream(self, book: Book, chapters: Iterable[Chapter]) -> int:
+        """
+        Writes chapters one shard at a time as the iterable produces them, so only
+        one chapter has to be in memory. book supplies the book-level fields; its
+        own chapters list is ignored. Returns the number of chapters written.
+        """
+        return self._save_shards(book, (
+            (self._entry(chapter, None), self.codec.encode_model(chapter)) for chapter in chapters
+        ))
+
+    def _save_shards(self, book: Book, shards: Iterable[Tuple[Dict[str, Any], bytes]]) -> int:
+        # shards yields (meta entry, encoded shard) per chapter; the entry's shard name is filled in here
+        with _lock_for(self.root):
+            self._check_writable()
+            return self._write_shards(book, shards)
+
+    def _write_shards(self, book: Book, shards: Iterable[Tuple[Dict[str, Any], bytes]]) -> int:
+        os.makedirs(self.chapters_dir, exist_ok=True)
+        entries = []
+        for index, (entry, data) in enumerate(shards):
+            entry["shard"] = f"{index:05d}.{self.codec.extension}"
+            _write_atomic(os.path.join(self.chapters_dir, entry["shard"]), data)
+            entries.append(entry)
+        self._write_meta_entries(book, entries)
+        self._remove_stale([e["shard"] for e in entries])
+        return len(entries)
+
+    def save_table(self, table: SentenceTable) -> int:
+        """
+        Writes a SentenceTable from plain chapter dicts, without building models.
+        """
+        return self._save_shards(table.book, self._table_shards(table))
+
+    def _table_shards(self, table: SentenceTable) -> Iterator[Tuple[Dict[str, Any], bytes]]:
+        for c, chapter in enumerate(table.chapters):
+            yield self._entry(chapter, None, len(table.chapter_rows(c))), self.codec.encode(table.chapter_dict(c))
+
+    def save_chapters(self, book: Book, chapters: List[Chapter]):
+        """
+        Writes only the given chapters' shards (plus the small meta file).
+        Falls back to a full save if the chapter layout changed.
+        """
+        with _lock_for(self.root):
+            self._check_writable()
+            if not self.exists():
+                self._save(book)
+                return
+            meta = self.load_meta()
+            if [e["id"] for e in meta["chapters"]] != [c.id for c in book.chapters]:
+                self._save(book)
+                return
+
+            shards = [e["shard"] for e in meta["chapters"]]
+            by_id = {e["id"]: e["shard"] for e in meta["chapters"]}
+            for chapter in chapters:
+                self._write_shard(by_id[chapter.id], chapter)
+            self._write_meta(book, shards)
+
+    def save_table_chapters(self, table: SentenceTable, chapters: List[Chapter]):
+        """
+        save_chapters for a SentenceTable; chapters are its chapter shells.
+        """
+        with _lock_for(self.root):
+            self._check_writable()
+            entries = self.load_meta()["chapters"] if self.exists() else None
+            if not entries or [e["id"] for e in entries] != [c.id for c in table.chapters]:
+                self._write_shards(table.book, self._table_shards(table))
+                return
+
+            index = {c.id: k for k, c in enumerate(table.chapters)}
+            for chapter in chapters:
+                shard = entries[index[chapter.id]]["shard"]
+                data = codec_for(shard_format(shard)).encode(table.chapter_dict(index[chapter.id]))
+                _write_atomic(os.path.join(self.chapters_dir, shard), data)
+            self._write_meta_entries(table.book, [
+                self._entry(chapter, entry["shard"], len(table.chapter_rows(c)))
+                for c, (chapter, entry) in enumerate(zip(table.chapters, entries))
+            ])
+
+    def update_sentences(self, chapter_id: str, sentences: List[Sentence]) -> Chapter:
+        """
+        Replaces sentences (matched by id) inside one chapter shard.
+        """
+        with _lock_for(self.root):
+            self._check_writable()
+            entry, chapter = self._load_for_update(chapter_id, [s.id for s in sentences])
+            updates = {s.id: s for s in sentences}
+            chapter.sentences = [updates.get(s.id, s) for s in chapter.sentences]
+            self._write_shard(entry["shard"], chapter)
+        return chapter
+
+    def patch_sentences(self, chapter_id: str, patches: List[SentencePatch]) -> List[Sentence]:
+        """
+        Applies partial updates to sentences of one chapter if every patch's
+        version matches the stored one (all or nothing), bumping each version.
+        metadata is merged into the stored dict (a None value removes the key).
+        Returns the updated sentences.
+        """
+        ids = [p.id for p in patches]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Each sentence may be patched only once per request")
+
+        with _lock_for(self.root):
+            self._check_writable()
+            entry, chapter = self._load_for_update(chapter_id, [p.id for p in patches])
+            by_id = {s.id: s for s in chapter.sentences}
+
+            conflicts = [
+                {"id": p.id, "expected": p.version, "actual": by_id[p.id].version}
+                for p in patches if by_id[p.id].version != p.version
+            ]
+            if conflicts:
+                raise VersionConflict(conflicts)
+
+            updated = []
+            for patch in patches:
+                sentence = by_id[patch.id]
+                fields = patch.model_dump(exclude_unset=True, exclude={"id", "version"})
+                metadata = fields.pop("metadata", None)
+                for field, value in fields.items():
+                    setattr(sentence, field, value)
+                for key, value in (metadata or {}).items():
+                    if value is None:
+                        sentence.metadata.pop(key, None)
+                    else:
+                        sentence.metadata[key] = value
+                sentence.version += 1
+                updated.append(sentence)
+
+            self._write_shard(entry["shard"], chapter)
+        return updated
+
+    # Helpers
+
+    def _check_writable(self):
+        # Called with the root's lock held
+        if not self._holding and os.path.abspath(self.root) in _held:
+            raise StoreBusy("Book is being processed by a running job")
+
+    def _load_for_update(self, chapter_id: str, sentence_ids: List[str]):
+        entry = self._find(self.load_meta(), chapter_id)
+        if not entry:
+            raise KeyError(f"Chapter not found: {chapter_id}")
+
+        chapter = self._read_chapter(entry["shard"])
+        missing = set(sentence_ids) - {s.id for s in chapter.sentences}
+        if missing:
+            raise KeyError(f"Sentences not found: {sorted(missing)}")
+        return entry, chapter
+
+    def _read_chapter(self, shard: str) -> Chapter:
+        # One validating pass over the JSON in pydantic-core, no intermediate dicts
+        with open(os.path.join(self.chapters_dir, shard), "rb") as f:
+            return Chapter.model_validate_json(codec_for(shard_format(shard)).to_json(f.read()))
+
+    def _read_chapter_dict(self, shard: str) -> Dict[str, Any]:
+        with open(os.path.join(self.chapters_dir, shard), "rb") as f:
+            return codec_for(shard_format(shard)).decode(f.read())
+
+    def _write_shard(self, shard: str, chapter: Chapter):
+        # In place, in the shard's own format
+        _write_atomic(os.path.join(self.chapters_dir, shard), codec_for(shard_format(shard)).encode_model(chapter))
+
+    def _remove_stale(self, shards: List[str]):
+        # Shards of chapters that no longer exist, or in another format
+        keep = set(shards)
+        for name in os.listdir(self.chapters_dir):
+            if is_shard(name) and name not in keep:
+                os.remove(os.path.join(self.chapters_dir, name))
+
+    def _find(self, meta: Dict[str, Any], chapter_id: str) -> Optional[Dict[str, Any]]:
+        for entry in meta["chapters"]:
+            if entry["id"] == chapter_id:
+                return entry
+        return None
+
+    def _write_meta(self, book: Book, shards: List[str]):
+        self._write_meta_entries(book, [self._entry(c, shard) for c, shard in zip(book.chapters, shards)])
+
+    def _write_meta_entries(self, book: Book, entries: List[Dict[str, Any]]):
+        meta = json.loads(book.model_dump_json(exclude={"chapters"}))
+        meta["chapters"] = entries
+        _write_atomic(os.path.join(self.root, META_FILE), json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def _entry(self, chapter: Chapter, shard: Optional[str], sentence_count: Optional[int] = None) -> Dict[str, Any]:
+        # sentence_count for chapter shells that do not carry their sentences (SentenceTable)
+        return {
+            "id": chapter.id,
+            "title": chapter.title,
+            "kind": chapter.kind,
+            "shard": shard,
+            "audio_path": chapter.audio_path,
+            "duration": chapter.duration,
+            "sentence_count": len(chapter.sentences) if sentence_count is None else sentence_count
+        }
+
+    @classmethod
+    def migrate_from_json(cls, json_path: str, root: str) -> "BookStore":
+        """
+        Converts a legacy monolithic book.json into a sharded store and removes it.
+        """
+        with open(json_path, "r", encoding="utf-8") as f:
+            book = Book(**json.load(f))
+        store = cls(root)
+        store.save(book)
+        os.remove(json_path)
+        return store
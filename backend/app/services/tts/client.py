@@ -1,13 +1,36 @@
 import httpx
 import asyncio
 import os
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from app.models.book import Sentence
+from app.services.tts.clip_cache import ClipCache, get_clip_cache
+from app.services.tts.limiter import AdaptiveLimiter
+from app.services.tts.voices import VoiceAudio, VoiceCache, get_voice_cache
+from app.services.http_clients import get_http_clients
 
 class TTSClient:
-    def __init__(self, api_url: str = "http://localhost:8000/api/tts"):
+    def __init__(self,
+                 api_url: str = "http://localhost:8000/api/tts",
+                 params: Optional[Dict[str, Any]] = None,
+                 client: Optional[httpx.AsyncClient] = None,
+                 voices_url: Optional[str] = None,
+                 voice_cache: Optional[VoiceCache] = None):
         self.api_url = api_url
-        self.client = httpx.AsyncClient(timeout=60.0)
+        # Voice registration endpoint, next to the synthesis endpoint by default
+        self.voices_url = voices_url or api_url.rsplit("/", 1)[0] + "/voices"
+        # Extra sampling params (temperature, top_p, ...) sent with every request
+        self.params = params or {}
+        # Defaults to the shared, pooled application client (see http_clients)
+        self._client = client
+        self.voice_cache = voice_cache or get_voice_cache()
+        self.voice_uploads = 0
+        self.voice_upload_bytes = 0
+        # Voice sha256 -> pending registration, so concurrent sentences upload a voice once
+        self._registering: Dict[str, asyncio.Future] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_http_clients().get("tts")
 
     async def synthesize(self, 
                          text: str, 
@@ -16,14 +39,12 @@ class TTSClient:
                          emotion_mode: int = 0,
                          emotion_vector: Optional[List[float]] = None) -> Optional[bytes]:
         
-        if not os.path.exists(speaker_audio_path):
-            raise FileNotFoundError(f"Speaker audio not found: {speaker_audio_path}")
-
-        files = {
-            "speaker_audio": open(speaker_audio_path, "rb")
-        }
+        # Read once per voice file and kept in memory, not reopened per sentence
+        # (raises FileNotFoundError for a missing file)
+        voice = await asyncio.to_thread(self.voice_cache.load, speaker_audio_path)
         
         data = {
+            **self.params,
             "text": text,
             "output_filename": output_filename,
             "emotion_mode": emotion_mode
@@ -34,28 +55,132 @@ class TTSClient:
             data["emotion_vector"] = ",".join(map(str, emotion_vector))
 
         try:
-            response = await self.client.post(self.api_url, data=data, files=files)
+            for _ in range(2):
+                voice_id = await self._voice_id(voice)
+                if voice_id is None:
+                    # Stock IndexTTS API: the reference voice goes with every request
+                    response = await self.client.post(self.api_url, data=data, files=self._voice_files(voice))
+                    break
+                response = await self.client.post(self.api_url, data={**data, "voice_id": voice_id})
+                if response.status_code != 404:
+                    break
+                # The server no longer knows the voice (e.g. it restarted): register it again
+                self.voice_cache.set_voice_id(self.voices_url, voice.sha256, None)
             response.raise_for_status()
             return response.content
         except httpx.HTTPError as e:
             print(f"TTS API Error: {e}")
             return None
+
+    def _voice_files(self, voice: VoiceAudio) -> Dict[str, Any]:
+        self.voice_uploads += 1
+        self.voice_upload_bytes += len(voice.data)
+        return {"speaker_audio": (os.path.basename(voice.path), voice.data, "audio/wav")}
+
+    async def _voice_id(self, voice: VoiceAudio) -> Optional[str]:
+        """
+        Server-side id for a reference voice, registering it on first use.
+        None means send the audio itself (registration unsupported or failed).
+        """
+        if not self.voice_cache.supports_registration(self.voices_url):
+            return None
+        voice_id = self.voice_cache.voice_id(self.voices_url, voice.sha256)
+        if voice_id:
+            return voice_id
+
+        pending = self._registering.get(voice.sha256)
+        if pending:
+            return await pending
+
+        future = asyncio.get_running_loop().create_future()
+        self._registering[voice.sha256] = future
+        voice_id = None
+        try:
+            voice_id = await self._register(voice)
         finally:
-            files["speaker_audio"].close()
+            future.set_result(voice_id)
+            del self._registering[voice.sha256]
+        return voice_id
+
+    async def _register(self, voice: VoiceAudio) -> Optional[str]:
+        try:
+            response = await self.client.post(
+                self.voices_url,
+                data={"voice_hash": voice.sha256},
+                files=self._voice_files(voice)
+            )
+            if response.status_code in (404, 405, 501):
+                print(f"TTS server has no voice registration at {self.voices_url}; uploading voices per request")
+                self.voice_cache.mark_unsupported(self.voices_url)
+                return None
+            response.raise_for_status()
+            voice_id = response.json()["voice_id"]
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            # Transient: this request goes multipart, the next one tries again
+            print(f"TTS voice registration failed: {e}")
+            return None
+        self.voice_cache.set_voice_id(self.voices_url, voice.sha256, voice_id)
+        return voice_id
 
 class TTSBatchProcessor:
-    def __init__(self, tts_client: TTSClient, max_concurrent: int = 3):
+    def __init__(self, tts_client: TTSClient, max_concurrent: int = 3,
+                 clip_cache: Optional[ClipCache] = None, use_cache: bool = True,
+                 limiter: Optional[AdaptiveLimiter] = None):
         self.client = tts_client
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        # Fixed limit unless an adaptive limiter with its own bounds is supplied
+        self.limiter = limiter or AdaptiveLimiter(initial=max_concurrent, min_limit=max_concurrent, max_limit=max_concurrent)
         self.retry_config = {
             "max_retries": 3,
             "base_delay": 2,
             "backoff_factor": 2
         }
+        self.clip_cache = clip_cache or (get_clip_cache() if use_cache else None)
+        # Cache key -> pending synthesis, so identical lines are synthesized once per run
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     async def process_sentence(self, sentence: Sentence, speaker_audio: str, output_dir: str) -> Sentence:
-        async with self.semaphore:
-            for attempt in range(self.retry_config["max_retries"]):
+        file_path = os.path.join(output_dir, f"{sentence.id}.wav")
+        emotion_mode = 2 if sentence.emotion_vector else 0
+
+        if not self.clip_cache:
+            await self._synthesize(sentence, speaker_audio, file_path, emotion_mode)
+            return sentence
+
+        # The key hashes the voice file and hits are hardlinks or copies: file I/O, so off the event loop
+        key, hit = await asyncio.to_thread(self._lookup, sentence, speaker_audio, emotion_mode, file_path)
+        if hit:
+            sentence.audio_path = file_path
+            return sentence
+
+        pending = self._inflight.get(key)
+        if pending:
+            # Same text/voice/emotion already being synthesized for another sentence
+            if await pending and await asyncio.to_thread(self.clip_cache.materialize, key, file_path):
+                sentence.audio_path = file_path
+            return sentence
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        ok = False
+        try:
+            ok = await self._synthesize(sentence, speaker_audio, file_path, emotion_mode)
+            if ok:
+                await asyncio.to_thread(self.clip_cache.store, key, file_path)
+        finally:
+            future.set_result(ok)
+            del self._inflight[key]
+        return sentence
+
+    def _lookup(self, sentence: Sentence, speaker_audio: str, emotion_mode: int, file_path: str):
+        key = self.clip_cache.make_key(
+            sentence.text, speaker_audio, emotion_mode, sentence.emotion_vector, self.client.params
+        )
+        return key, self.clip_cache.materialize(key, file_path)
+
+    async def _synthesize(self, sentence: Sentence, speaker_audio: str, file_path: str, emotion_mode: int) -> bool:
+        for attempt in range(self.retry_config["max_retries"]):
+            # One limiter slot per attempt, so backoff sleeps do not hold capacity
+            async with self.limiter.slot() as slot:
                 try:
                     output_filename = f"{sentence.id}"
                     # Note: API might return WAV content directly or save it.
@@ -66,26 +191,33 @@ class TTSBatchProcessor:
                         text=sentence.text,
                         speaker_audio_path=speaker_audio,
                         output_filename=output_filename,
-                        emotion_mode=2 if sentence.emotion_vector else 0,
+                        emotion_mode=emotion_mode,
                         emotion_vector=sentence.emotion_vector
                     )
                     
                     if audio_content:
-                        file_path = os.path.join(output_dir, f"{output_filename}.wav")
-                        with open(file_path, "wb") as f:
-                            f.write(audio_content)
+                        await asyncio.to_thread(self._write_clip, file_path, audio_content)
                         
                         sentence.audio_path = file_path
-                        return sentence
+                        return True
                     else:
                         raise Exception("Empty response from TTS API")
 
                 except Exception as e:
+                    slot.failed()
                     if attempt == self.retry_config["max_retries"] - 1:
                         print(f"Failed to synthesize sentence {sentence.id}: {e}")
                         # We might want to mark it as failed or return None
-                        return sentence # Return without audio_path
+                        return False # Leave audio_path untouched
                     
-                    delay = self.retry_config["base_delay"] * (self.retry_config["backoff_factor"] ** attempt)
-                    await asyncio.sleep(delay)
-        return sentence
+            delay = self.retry_config["base_delay"] * (self.retry_config["backoff_factor"] ** attempt)
+            await asyncio.sleep(delay)
+        return False
+
+    @staticmethod
+    def _write_clip(file_path: str, audio_content: bytes):
+        # Write beside and swap in, so a clip hardlinked from the cache is never overwritten
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio_content)
+        os.replace(tmp_path, file_path)
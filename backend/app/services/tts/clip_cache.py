@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+CLIP_CACHE_DIR = os.getenv("CLIP_CACHE_DIR", "backend/data/cache/clips")
+CLIP_CACHE_MAX_MB = float(os.getenv("CLIP_CACHE_MAX_MB", "4096"))
+CLIP_CACHE_ENABLED = os.getenv("CLIP_CACHE_ENABLED", "1") != "0"
+# Emotion vectors are rounded before hashing so float noise does not defeat the cache
+CLIP_CACHE_EMOTION_DECIMALS = int(os.getenv("CLIP_CACHE_EMOTION_DECIMALS", "2"))
+
+def link_or_copy(src: str, dest: str):
+    """
+    Points dest at the same data as src, preferring a hardlink.
+    dest is replaced atomically, never written through, so other links stay intact.
+    """
+    tmp = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.link(src, tmp)
+    except OSError:
+        # Cross-device or no hardlink support
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dest)
+
+class ClipCache:
+    """
+    Content-addressed store of synthesized clips.
+    Key = (normalized text, speaker audio hash, rounded emotion vector, TTS params).
+    Clips are shared with project clip dirs through hardlinks; the store keeps
+    an LRU index in SQLite and evicts by total bytes.
+    """
+    def __init__(self, root: str = CLIP_CACHE_DIR, max_bytes: int = int(CLIP_CACHE_MAX_MB * 1024 * 1024)):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._voice_hashes: Dict[Tuple[str, int, float], str] = {}
+
+        os.makedirs(root, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(root, "index.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS clips (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_clips_accessed ON clips(accessed_at)")
+        self._conn.commit()
+        # Running total of stored bytes, kept up to date by every insert and delete
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM clips").fetchone()[0]
+
+    def make_key(self,
+                 text: str,
+                 speaker_audio_path: str,
+                 emotion_mode: int = 0,
+                 emotion_vector: Optional[List[float]] = None,
+                 params: Optional[Dict[str, Any]] = None) -> str:
+        raw = json.dumps({
+            "text": self.normalize_text(text),
+            "voice": self.voice_hash(speaker_audio_path),
+            "emotion_mode": emotion_mode,
+            "emotion_vector": [round(v, CLIP_CACHE_EMOTION_DECIMALS) for v in emotion_vector] if emotion_vector else None,
+            "params": params or {}
+        }, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return " ".join(unicodedata.normalize("NFKC", text).split())
+
+    def voice_hash(self, path: str) -> str:
+        # Reference voices are large and reused for every sentence, hash each version once
+        st = os.stat(path)
+        memo_key = (os.path.abspath(path), st.st_size, st.st_mtime)
+        digest = self._voice_hashes.get(memo_key)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            self._voice_hashes[memo_key] = digest
+        return digest
+
+    def _clip_path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.wav")
+
+    def lookup(self, key: str) -> Optional[str]:
+        path = self._clip_path(key)
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM clips WHERE key = ?", (key,)).fetchone()
+            if row is None or not os.path.exists(path):
+                if row is not None:
+                    self._conn.execute("DELETE FROM clips WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self._total -= row[0]
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE clips SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return path
+
+    def materialize(self, key: str, dest_path: str) -> bool:
+        """
+        Links a cached clip to dest_path. Returns False on a miss.
+        """
+        path = self.lookup(key)
+        if not path:
+            return False
+        if not (os.path.exists(dest_path) and os.path.samefile(path, dest_path)):
+            link_or_copy(path, dest_path)
+        return True
+
+    def store(self, key: str, src_path: str):
+        path = self._clip_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.exists(path):
+            link_or_copy(src_path, path)
+
+        size = os.path.getsize(path)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM clips WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO clips (key, size, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, size, now, now)
+            )
+            self._conn.commit()
+            self._total += size - (row[0] if row else 0)
+            self.stores += 1
+            if self._total > self.max_bytes:
+                self._evict_locked()
+
+    def _evict_locked(self):
+        excess = self._total - self.max_bytes
+        freed = 0
+        keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM clips ORDER BY accessed_at"):
+            keys.append(key)
+            freed += size
+            if freed >= excess:
+                break
+
+        for key in keys:
+            # Project clips linked to this entry keep their own link to the data
+            try:
+                os.remove(self._clip_path(key))
+            except FileNotFoundError:
+                pass
+        self._conn.executemany("DELETE FROM clips WHERE key = ?", [(k,) for k in keys])
+        self._conn.commit()
+        self._total -= freed
+        self.evictions += len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM clips").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "root": self.root,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions
+        }
+
+_default_cache: Optional[ClipCache] = None
+
+def get_clip_cache() -> Optional[ClipCache]:
+    """
+    Process-wide clip store shared by every project, or None when disabled.
+    """
+    global _default_cache
+    if not CLIP_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        _default_cache = ClipCache()
+    return _default_cache
@@ -0,0 +1,113 @@
+import time
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts AIMD-style to the server's behaviour.
+    Each full window of healthy requests raises the limit by one; an error or
+    a request slower than latency_threshold halves it (at most once per window).
+
+        async with limiter.slot() as slot:
+            ...
+            slot.failed()   # optional, on error
+
+    Waiters queue FIFO; a freed slot (or a raised limit) wakes only as many of
+    them as there are free slots, and hands each its slot directly.
+    """
+    def __init__(self,
+                 initial: int = 3,
+                 min_limit: int = 1,
+                 max_limit: int = 16,
+                 latency_threshold: float = 30.0,
+                 backoff: float = 0.5):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_threshold = latency_threshold
+        self.backoff = backoff
+
+        self.in_flight = 0
+        self.completed = 0
+        self.errors = 0
+        self._healthy_in_window = 0
+        self._last_decrease = 0.0
+        self._latency_ewma = None
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def slot(self) -> "_Slot":
+        return _Slot(self)
+
+    async def acquire(self):
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # The slot is counted in in_flight by _wake before the future resolves
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Woken and cancelled in the same step: pass the slot on
+                self.in_flight -= 1
+                self._wake()
+            raise
+
+    async def release(self, latency: float, ok: bool):
+        self.in_flight -= 1
+        self.completed += 1
+        self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+
+        now = time.monotonic()
+        if not ok or latency > self.latency_threshold:
+            if not ok:
+                self.errors += 1
+            # Requests already in flight were admitted under the old limit;
+            # only back off once per latency window to avoid collapsing to min
+            if now - self._last_decrease > (self._latency_ewma or 0.0):
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+            self._healthy_in_window = 0
+        else:
+            self._healthy_in_window += 1
+            if self._healthy_in_window >= int(self.limit):
+                self.limit = min(self.max_limit, self.limit + 1)
+                self._healthy_in_window = 0
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            # Cancelled waiters are skipped here rather than searched for on cancel
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "errors": self.errors,
+            "latency_ewma": self._latency_ewma
+        }
+
+class _Slot:
+    def __init__(self, limiter: AdaptiveLimiter):
+        self.limiter = limiter
+        self.ok = True
+        self._start = 0.0
+
+    def failed(self):
+        self.ok = False
+
+    async def __aenter__(self) -> "_Slot":
+        await self.limiter.acquire()
+        self._start = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.limiter.release(time.monotonic() - self._start, self.ok and exc_type is None)
+        return False
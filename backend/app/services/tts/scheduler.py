@@ -0,0 +1,110 @@
+import os
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set
+from app.models.book import Book, Chapter, Sentence
+from app.services.tts.client import TTSClient, TTSBatchProcessor
+from app.services.tts.limiter import AdaptiveLimiter
+from app.services.audio.wav import is_valid_clip
+
+TTS_INITIAL_CONCURRENCY = int(os.getenv("TTS_INITIAL_CONCURRENCY", "3"))
+TTS_MIN_CONCURRENCY = int(os.getenv("TTS_MIN_CONCURRENCY", "1"))
+TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", "16"))
+# Requests slower than this count as overload and shrink the window
+TTS_LATENCY_THRESHOLD = float(os.getenv("TTS_LATENCY_THRESHOLD", "30"))
+
+DEFAULT_SPEAKER_AUDIO = "backend/assets/ref_audio.wav"
+
+class SynthesisScheduler:
+    """
+    Submits every non-noise sentence of a book to the TTS server at once and
+    lets an AIMD limiter decide how many requests are actually in flight.
+    Sentences are submitted in reading order, so earlier chapters finish first,
+    and on_chapter_done (if given) runs for each chapter as soon as all of its
+    clips are done, while later chapters keep synthesizing.
+    """
+    def __init__(self, tts_client: TTSClient, limiter: AdaptiveLimiter = None):
+        self.limiter = limiter or AdaptiveLimiter(
+            initial=TTS_INITIAL_CONCURRENCY,
+            min_limit=TTS_MIN_CONCURRENCY,
+            max_limit=TTS_MAX_CONCURRENCY,
+            latency_threshold=TTS_LATENCY_THRESHOLD
+        )
+        self.batch_processor = TTSBatchProcessor(tts_client, limiter=self.limiter)
+        self.progress = None
+        self.checkpoint = None
+        self._speaker_files: Set[str] = set()
+
+    async def run(self,
+                  book: Book,
+                  clips_dir: str,
+                  on_chapter_done: Optional[Callable[[Chapter], Awaitable[None]]] = None,
+                  progress=None,
+                  checkpoint=None,
+                  resume: bool = False,
+                  skip_chapters: Optional[Set[str]] = None) -> Book:
+        """
+        With resume=True, sentences whose clip from an earlier run is still valid
+        are not sent to the TTS server again. Chapters in skip_chapters (ids of
+        chapters already assembled, see is_assembled) are left untouched.
+        """
+        self.progress = progress
+        self.checkpoint = checkpoint
+        # Voice files are few: check each one once, off the event loop, not per sentence
+        paths = {s.metadata.get("speaker_audio_path") for c in book.chapters for s in c.sentences}
+        self._speaker_files = await asyncio.to_thread(lambda: {p for p in paths if p and os.path.exists(p)})
+        # Create every task up front, in reading order; the limiter admits them FIFO
+        chapter_tasks = []
+        for chapter in book.chapters:
+            if skip_chapters and chapter.id in skip_chapters:
+                continue
+            sentences: List[Sentence] = [s for s in chapter.sentences if not s.is_noise]
+            tasks = [asyncio.ensure_future(self._synthesize(chapter, s, clips_dir, resume)) for s in sentences]
+            chapter_tasks.append((chapter, sentences, tasks))
+
+        try:
+            await asyncio.gather(*(
+                self._finish_chapter(chapter, sentences, tasks, on_chapter_done)
+                for chapter, sentences, tasks in chapter_tasks
+            ))
+        finally:
+            for _, _, tasks in chapter_tasks:
+                for task in tasks:
+                    task.cancel()
+        return book
+
+    async def _finish_chapter(self,
+                              chapter: Chapter,
+                              sentences: List[Sentence],
+                              tasks: List[asyncio.Future],
+                              on_chapter_done: Optional[Callable[[Chapter], Awaitable[None]]]):
+        results = await asyncio.gather(*tasks)
+
+        # Write results back in submission (= reading) order
+        for sentence, result in zip(sentences, results):
+            sentence.audio_path = result.audio_path
+
+        if on_chapter_done:
+            await on_chapter_done(chapter)
+
+    @staticmethod
+    def is_synthesized(sentence: Sentence) -> bool:
+        return bool(sentence.audio_path) and is_valid_clip(sentence.audio_path)
+
+    @staticmethod
+    def is_assembled(chapter: Chapter) -> bool:
+        # The chapter file outlives its clips when those are cleaned up after assembly
+        return bool(chapter.audio_path) and is_valid_clip(chapter.audio_path)
+
+    async def _synthesize(self, chapter: Chapter, sentence: Sentence, clips_dir: str, resume: bool) -> Sentence:
+        if resume and await asyncio.to_thread(self.is_synthesized, sentence):
+            return sentence
+
+        speaker_audio = sentence.metadata.get("speaker_audio_path")
+        if speaker_audio not in self._speaker_files:
+            speaker_audio = DEFAULT_SPEAKER_AUDIO
+        sentence = await self.batch_processor.process_sentence(sentence, speaker_audio, clips_dir)
+        if self.progress:
+            self.progress.advance(1)
+        if self.checkpoint:
+            self.checkpoint.mark(chapter)
+        return sentence
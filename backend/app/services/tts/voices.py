@@ -0,0 +1,94 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+VOICE_CACHE_MAX_MB = float(os.getenv("VOICE_CACHE_MAX_MB", "256"))
+# Register reference voices with the TTS server once and send only their id per
+# sentence; servers without POST /api/voices fall back to multipart uploads
+TTS_VOICE_REGISTRATION = os.getenv("TTS_VOICE_REGISTRATION", "1") != "0"
+
+class VoiceAudio(NamedTuple):
+    path: str
+    data: bytes
+    sha256: str
+
+class VoiceCache:
+    """
+    In-memory reference voices, read and hashed once per file version.
+    Also remembers which voices each TTS server has registered (server url,
+    sha256 -> voice_id) and which servers do not support registration, so
+    every synthesis job after the first starts with nothing to upload.
+    """
+    def __init__(self, max_bytes: int = int(VOICE_CACHE_MAX_MB * 1024 * 1024)):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._voices: "OrderedDict[Tuple[str, int, float], VoiceAudio]" = OrderedDict()
+        self._bytes = 0
+        self._registered: Dict[Tuple[str, str], str] = {}
+        self._unsupported = set()
+
+    def load(self, path: str) -> VoiceAudio:
+        """
+        Blocking (reads the file on a miss); call from a worker thread.
+        """
+        st = os.stat(path)
+        memo_key = (os.path.abspath(path), st.st_size, st.st_mtime)
+        with self._lock:
+            voice = self._voices.get(memo_key)
+            if voice is not None:
+                self._voices.move_to_end(memo_key)
+                self.hits += 1
+                return voice
+
+        with open(path, "rb") as f:
+            data = f.read()
+        voice = VoiceAudio(path, data, hashlib.sha256(data).hexdigest())
+
+        with self._lock:
+            self.misses += 1
+            if memo_key not in self._voices:
+                self._voices[memo_key] = voice
+                self._bytes += len(data)
+            while self._bytes > self.max_bytes and len(self._voices) > 1:
+                _, evicted = self._voices.popitem(last=False)
+                self._bytes -= len(evicted.data)
+        return voice
+
+    def voice_id(self, server: str, sha256: str) -> Optional[str]:
+        return self._registered.get((server, sha256))
+
+    def set_voice_id(self, server: str, sha256: str, voice_id: Optional[str]):
+        if voice_id is None:
+            self._registered.pop((server, sha256), None)
+        else:
+            self._registered[(server, sha256)] = voice_id
+
+    def supports_registration(self, server: str) -> bool:
+        return TTS_VOICE_REGISTRATION and server not in self._unsupported
+
+    def mark_unsupported(self, server: str):
+        self._unsupported.add(server)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "voices": len(self._voices),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "registered": len(self._registered),
+                "unsupported_servers": sorted(self._unsupported)
+            }
+
+_default_cache: Optional[VoiceCache] = None
+
+def get_voice_cache() -> VoiceCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = VoiceCache()
+    return _default_cache
@@ -0,0 +1,106 @@
+"""
+Throughput benchmark for the analysis stage (clean + emotion) against a local
+mock LLM server with fixed latency.
+
+    python backend/benchmarks/bench_analysis.py --chapters 5 --sentences 40 --latency 0.05 --batch-size 10
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.book import Book, Chapter, Sentence
+from app.models.table import SentenceTable
+from app.services.cleaner.llm_client import LLMClient
+from app.services.cleaner.llm_cache import LLMCache
+from app.services.cleaner.cleaner import TextCleaner
+from app.services.cleaner.emotion import EmotionAnalyzer
+from app.services.cleaner.batch import BatchAnalyzer
+from app.services.cleaner.pipeline import AnalysisPipeline
+from app.services.http_clients import get_http_clients
+from mock_llm_server import MockLLMServer
+
+def make_book(chapters: int, sentences: int) -> Book:
+    return Book(id="bench", title="bench", chapters=[
+        Chapter(id=f"ch_{c}", title=f"第{c + 1}章", sentences=[
+            Sentence(id=f"ch_{c}_s{i}", text=f"这是第{c + 1}章的第{i + 1}句话。")
+            for i in range(sentences)
+        ])
+        for c in range(chapters)
+    ])
+
+async def run_serial(llm_client: LLMClient, book: Book):
+    cleaner = TextCleaner(llm_client)
+    emotion_analyzer = EmotionAnalyzer(llm_client)
+    for chapter in book.chapters:
+        for sentence in chapter.sentences:
+            sentence = await cleaner.clean_sentence(sentence)
+            if not sentence.is_noise:
+                await emotion_analyzer.analyze_sentence(sentence)
+
+async def run_pipeline(llm_client: LLMClient, book: Book, max_concurrent: int, batch_size: int = 1):
+    cleaner = TextCleaner(llm_client)
+    emotion_analyzer = EmotionAnalyzer(llm_client)
+    pipeline = AnalysisPipeline(
+        cleaner, emotion_analyzer,
+        max_concurrent=max_concurrent,
+        batch_analyzer=BatchAnalyzer(llm_client, cleaner, emotion_analyzer),
+        batch_size=batch_size
+    )
+    await pipeline.run(SentenceTable.from_book(book))
+
+async def main(args):
+    server = MockLLMServer(latency=args.latency)
+    await server.start()
+    llm_client = LLMClient(api_key="bench", base_url=server.base_url, use_cache=False)
+    total = args.chapters * args.sentences
+
+    print(f"{total} sentences, {args.latency * 1000:.0f}ms mock latency")
+    print(f"{'mode':<16}{'seconds':>10}{'sent/s':>10}{'requests':>10}{'peak':>6}")
+
+    runs = [("serial", None, 1)] + [(f"pipeline x{n}", n, 1) for n in args.concurrency]
+    runs += [(f"batch{args.batch_size} x{n}", n, args.batch_size) for n in args.concurrency]
+    for name, concurrency, batch_size in runs:
+        book = make_book(args.chapters, args.sentences)
+        server.request_count = 0
+        server.peak_in_flight = 0
+        start = time.perf_counter()
+        if concurrency is None:
+            await run_serial(llm_client, book)
+        else:
+            await run_pipeline(llm_client, book, concurrency, batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<16}{elapsed:>10.2f}{total / elapsed:>10.1f}{server.request_count:>10}{server.peak_in_flight:>6}")
+
+    # Cold vs warm response cache: the second pass should not reach the server
+    with tempfile.TemporaryDirectory() as tmp:
+        cached_client = LLMClient(api_key="bench", base_url=server.base_url,
+                                  cache=LLMCache(os.path.join(tmp, "llm_cache.db")))
+        for name in ("cache cold", "cache warm"):
+            book = make_book(args.chapters, args.sentences)
+            server.request_count = 0
+            server.peak_in_flight = 0
+            start = time.perf_counter()
+            await run_pipeline(cached_client, book, max(args.concurrency))
+            elapsed = time.perf_counter() - start
+            print(f"{name:<16}{elapsed:>10.2f}{total / elapsed:>10.1f}{server.request_count:>10}{server.peak_in_flight:>6}")
+        print(f"cache stats: {cached_client.cache.stats()}")
+        cached_client.cache.close()
+
+    # Both clients share the pooled application client
+    print(f"http pool: {get_http_clients().stats()['llm']}")
+    await get_http_clients().aclose()
+    await server.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chapters", type=int, default=5)
+    parser.add_argument("--sentences", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--batch-size", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,83 @@
+"""
+Chapter assembly benchmark: in-process PCM concatenation vs the ffmpeg path.
+
+Generates synthetic 24kHz mono clips and assembles them into chapters with
+both engines (the ffmpeg run is skipped when ffmpeg is not on PATH).
+
+    python backend/benchmarks/bench_assembly.py --chapters 10 --sentences 100
+"""
+import os
+import sys
+import math
+import time
+import wave
+import shutil
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.book import Book, Chapter, Sentence
+from app.services.audio.assembler import AudioAssembler
+
+def write_clip(path: str, seconds: float, framerate: int = 24000):
+    frames = int(seconds * framerate)
+    data = bytearray()
+    for i in range(frames):
+        sample = int(8000 * math.sin(2 * math.pi * 220 * i / framerate))
+        data += sample.to_bytes(2, "little", signed=True)
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(framerate)
+        w.writeframes(bytes(data))
+
+def make_book(clips_dir: str, chapters: int, sentences: int) -> Book:
+    # A handful of distinct clips, hardlinked per sentence, keeps setup fast
+    templates = []
+    for i in range(8):
+        path = os.path.join(clips_dir, f"template_{i}.wav")
+        write_clip(path, random.uniform(1.0, 4.0))
+        templates.append(path)
+
+    book = Book(id="bench", title="bench", chapters=[])
+    for c in range(chapters):
+        chapter = Chapter(id=f"ch_{c}", title=f"Chapter {c}")
+        for i in range(sentences):
+            path = os.path.join(clips_dir, f"ch_{c}_s{i}.wav")
+            os.link(templates[(c + i) % len(templates)], path)
+            chapter.sentences.append(Sentence(id=f"ch_{c}_s{i}", text="", audio_path=path))
+        book.chapters.append(chapter)
+    return book
+
+def run(assembler: AudioAssembler, book: Book, output_dir: str) -> float:
+    start = time.perf_counter()
+    assembler.assemble_book(book, output_dir)
+    return time.perf_counter() - start
+
+def main(args):
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        clips_dir = os.path.join(tmp, "clips")
+        os.makedirs(clips_dir)
+        book = make_book(clips_dir, args.chapters, args.sentences)
+        total = args.chapters * args.sentences
+        print(f"{args.chapters} chapters x {args.sentences} clips ({total} clips)")
+
+        elapsed = run(AudioAssembler(use_pcm=True), book, os.path.join(tmp, "pcm"))
+        duration = sum(c.duration for c in book.chapters)
+        print(f"{'pcm':<8}{elapsed:>8.2f}s  {duration / 3600:.2f}h of audio")
+
+        if shutil.which("ffmpeg") and shutil.which("ffprobe"):
+            elapsed = run(AudioAssembler(use_pcm=False), book, os.path.join(tmp, "ffmpeg"))
+            duration = sum(c.duration for c in book.chapters)
+            print(f"{'ffmpeg':<8}{elapsed:>8.2f}s  {duration / 3600:.2f}h of audio")
+        else:
+            print("ffmpeg/ffprobe not found, skipping the subprocess engine")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chapters", type=int, default=10)
+    parser.add_argument("--sentences", type=int, default=100)
+    main(parser.parse_args())
@@ -0,0 +1,101 @@
+"""
+Book store format benchmark: chapter shards as JSON and zstd-compressed JSON,
+loaded as models (validated) and as a SentenceTable (as the analysis job does).
+
+Every format is round-tripped (save -> load == original, iter_json parses to
+the original), a legacy monolithic book.json is migrated, and a JSON store is
+converted to each format by a full save.
+
+    python backend/benchmarks/bench_book_store.py --sentences 60000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.book import Book
+from app.services.project.codecs import FORMATS, codec_for, missing_package
+from app.services.project.storage import BookStore
+from sample_book import make_book
+
+def timed(fn, repeat: int = 3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+def main(args):
+    book = make_book(args.sentences, args.per_chapter)
+    expected = book.model_dump()
+    formats = [f for f in FORMATS if not missing_package(f)]
+    skipped = [f for f in FORMATS if f not in formats]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Legacy monolithic book.json, as written before sharded storage
+        legacy_path = os.path.join(tmp, "book.json")
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            f.write(book.model_dump_json(indent=2))
+        legacy_size = os.path.getsize(legacy_path)
+
+        start = time.perf_counter()
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            Book(**json.load(f))
+        legacy_load_s = time.perf_counter() - start
+
+        migrated = BookStore.migrate_from_json(legacy_path, os.path.join(tmp, "migrated"))
+        assert not os.path.exists(legacy_path)
+        assert migrated.load().model_dump() == expected, "migration changed the book"
+
+        print(f"{args.sentences} sentences in {len(book.chapters)} chapters")
+        print(f"{'format':<14} {'size MB':>8} {'save ms':>8} {'load ms':>8} {'table ms':>9} {'json ms':>8}")
+        print(f"{'book.json':<14} {legacy_size / (1024 * 1024):8.1f} {'':>8} {legacy_load_s * 1000:8.1f}")
+
+        for fmt in formats:
+            root = os.path.join(tmp, fmt)
+            codec = codec_for(fmt)
+            store = BookStore(root, codec=codec)
+            _, save_s = timed(lambda: store.save(book))
+
+            loaded, load_s = timed(store.load)
+            table, table_s = timed(store.load_table)
+            assert loaded.model_dump() == expected, f"{fmt}: load differs"
+            assert loaded.model_dump_json() == book.model_dump_json(), f"{fmt}: load serializes differently"
+            assert table.to_book().model_dump_json() == book.model_dump_json(), f"{fmt}: table load differs"
+
+            body, json_s = timed(lambda: b"".join(store.iter_json()))
+            assert Book.model_validate_json(body).model_dump() == expected, f"{fmt}: iter_json differs"
+
+            # Partial writes keep the shard format, edits survive a reload
+            chapter = loaded.chapters[0]
+            chapter.sentences[0].text = "改过的句子。"
+            store.save_chapters(loaded, [chapter])
+            assert store.load_chapter(chapter.id).sentences[0].text == "改过的句子。"
+
+            print(f"{fmt:<14} {dir_size(root) / (1024 * 1024):8.1f} {save_s * 1000:8.1f} "
+                  f"{load_s * 1000:8.1f} {table_s * 1000:9.1f} {json_s * 1000:8.1f}")
+
+            # A JSON store converts to this format on its next full save
+            converted = BookStore(os.path.join(tmp, "migrated"), codec=codec)
+            converted.save(converted.load())
+            shards = os.listdir(converted.chapters_dir)
+            assert shards and all(name.endswith(f".{codec.extension}") for name in shards), shards
+            assert converted.load().model_dump() == expected, f"{fmt}: conversion changed the book"
+
+    if skipped:
+        print(f"skipped (package not installed): {', '.join(skipped)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, default=60000)
+    parser.add_argument("--per-chapter", type=int, default=300)
+    main(parser.parse_args())
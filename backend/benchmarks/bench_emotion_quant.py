@@ -0,0 +1,63 @@
+"""
+Emotion quantization benchmark: how many distinct (voice, emotion) combinations
+and distinct clips (text, voice, emotion) a book needs from TTS before and after
+snapping vectors to per-book prototypes, for k-means and grid codebooks at a
+few error bounds (the grid's level count is derived from the bound).
+
+Books go through the post-processing stage first, as in analysis. Checks every
+snapped vector is within the bound of its original and re-quantizing is stable.
+
+    python backend/benchmarks/bench_emotion_quant.py --sentences 60000
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from app.models.table import SentenceTable
+from app.services.cleaner.emotion_post import EmotionPostProcessor
+from app.services.cleaner.emotion_quant import EmotionQuantizer, PROTOTYPE_KEY
+from sample_book import make_book
+
+def main(args):
+    source = SentenceTable.from_book(make_book(args.sentences, args.per_chapter))
+    EmotionPostProcessor().process_table(source)
+    book = source.to_book()
+
+    print(f"{args.sentences} sentences in {len(source.chapters)} chapters")
+    print(f"{'codebook':<14} {'bound':>6} {'protos':>7} {'snapped':>8} {'mean err':>9} "
+          f"{'voice x emotion':>16} {'distinct clips':>16} {'ms':>7}")
+    for method in ("kmeans", "grid"):
+        for bound in args.bounds:
+            table = SentenceTable.from_book(book)
+            voiced = ~table.is_noise & table.has_emotion
+            original = table.emotions[voiced].astype(np.float64)
+
+            quantizer = EmotionQuantizer(method=method, max_error=bound)
+            report = quantizer.quantize_table(table)
+
+            quantized = table.emotions[voiced].astype(np.float64)
+            assert np.abs(quantized - original).max() <= bound + 1e-4, "snap exceeds the error bound"
+            again = quantizer.quantize_table(table)
+            assert again["prototypes"] == report["prototypes"], "re-quantizing is not stable"
+            assert np.array_equal(quantized, table.emotions[voiced].astype(np.float64))
+            assert sum(v is not None for v in table.column(PROTOTYPE_KEY)) == report["snapped"]
+            if method == "grid":
+                # Levels follow the bound, so no vector is left unsnapped
+                assert report["snapped"] == report["sentences"], "grid left vectors outside the bound"
+
+            name = f"grid/{report['grid_levels']}" if method == "grid" else method
+            print(f"{name:<14} {bound:6.2f} {len(report['prototypes']):7d} "
+                  f"{report['snapped'] / report['sentences']:8.1%} {report['mean_error']:9.3f} "
+                  f"{report['voice_emotions_before']:>7} -> {report['voice_emotions_after']:<6} "
+                  f"{report['distinct_clips_before']:>7} -> {report['distinct_clips_after']:<6} "
+                  f"{report['elapsed_ms']:7.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, default=60000)
+    parser.add_argument("--per-chapter", type=int, default=300)
+    parser.add_argument("--bounds", type=float, nargs="+", default=[0.05, 0.1, 0.2])
+    main(parser.parse_args())
@@ -0,0 +1,122 @@
+"""
+Sentence representation benchmark: a fully analyzed book held as Pydantic
+models (Book -> Chapter -> Sentence, a metadata dict and an 8-float list per
+sentence) vs the columnar SentenceTable.
+
+The analysis job holds the book in this form from BookStore.load_table to
+save_table. Measures peak and retained memory of loading, conversion at the
+model boundary, serialization and a typical pipeline pass (mean emotion per
+speaker), and checks the table converts back to an identical Book.
+
+    python backend/benchmarks/bench_sentence_table.py --sentences 60000
+"""
+import gc
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+from pydantic_core import to_json
+from app.models.book import Book, Chapter
+from app.models.table import SentenceTable
+from sample_book import make_book
+
+def measure(fn):
+    # Timed without tracemalloc (it slows allocation-heavy code unevenly), then measured
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, retained, peak
+
+def speaker_means_models(book: Book):
+    sums, counts = {}, {}
+    for chapter in book.chapters:
+        for s in chapter.sentences:
+            if s.emotion_vector is None:
+                continue
+            acc = sums.setdefault(s.speaker, [0.0] * 8)
+            for d, v in enumerate(s.emotion_vector):
+                acc[d] += v
+            counts[s.speaker] = counts.get(s.speaker, 0) + 1
+    return {k: [v / counts[k] for v in acc] for k, acc in sums.items()}
+
+def speaker_means_table(table: SentenceTable):
+    rows = table.has_emotion
+    idx = table.speaker_idx[rows] + 1 # -1 (no speaker) -> bucket 0
+    counts = np.bincount(idx, minlength=len(table.speakers) + 1)
+    emotions = table.emotions[rows]
+    sums = np.stack([np.bincount(idx, weights=emotions[:, d], minlength=len(counts))
+                     for d in range(emotions.shape[1])], axis=1)
+    names = [None] + table.speakers
+    return {names[k]: (sums[k] / counts[k]).tolist() for k in range(len(names)) if counts[k]}
+
+def main(args):
+    # Shards as they come off disk
+    source = make_book(args.sentences, args.per_chapter)
+    shards = [c.model_dump_json() for c in source.chapters]
+    book_fields = source.model_copy(update={"chapters": []})
+    del source
+
+    book, load_book_s, book_mem, book_peak = measure(lambda: book_fields.model_copy(update={
+        "chapters": [Chapter.model_validate_json(s) for s in shards]
+    }))
+    # As BookStore.load_table: plain JSON, no models
+    table, load_table_s, table_mem, table_peak = measure(lambda: SentenceTable.from_chapter_dicts(
+        book_fields, (json.loads(s) for s in shards)
+    ))
+
+    start = time.perf_counter()
+    book_json = [c.model_dump_json() for c in book.chapters]
+    dump_book_s = time.perf_counter() - start
+    # As BookStore.save_table: plain dicts, no models
+    start = time.perf_counter()
+    table_json = [to_json(c).decode("utf-8") for c in table.iter_chapter_dicts()]
+    dump_table_s = time.perf_counter() - start
+    assert table_json == book_json, "table shards differ from the model shards"
+    assert [c.model_dump_json() for c in table.iter_chapters()] == book_json, "table does not round-trip to the same chapters"
+
+    start = time.perf_counter()
+    means_models = speaker_means_models(book)
+    means_models_s = time.perf_counter() - start
+    start = time.perf_counter()
+    means_table = speaker_means_table(table)
+    means_table_s = time.perf_counter() - start
+    for speaker, mean in means_models.items():
+        assert np.allclose(mean, means_table[speaker], atol=1e-5), speaker
+
+    start = time.perf_counter()
+    table.to_book()
+    to_book_s = time.perf_counter() - start
+
+    print(f"{args.sentences} sentences in {len(book.chapters)} chapters, "
+          f"{sum(len(s) for s in shards) / (1024 * 1024):.1f} MB of shard JSON")
+    print(f"{'':<28} {'models':>10} {'table':>10}")
+    print(f"{'retained memory (MB)':<28} {book_mem / (1024 * 1024):10.1f} {table_mem / (1024 * 1024):10.1f}"
+          f"  x{book_mem / table_mem:.1f}")
+    print(f"{'peak memory, load (MB)':<28} {book_peak / (1024 * 1024):10.1f} {table_peak / (1024 * 1024):10.1f}"
+          f"  x{book_peak / table_peak:.1f}")
+    print(f"{'load from shards (ms)':<28} {load_book_s * 1000:10.1f} {load_table_s * 1000:10.1f}")
+    print(f"{'serialize chapters (ms)':<28} {dump_book_s * 1000:10.1f} {dump_table_s * 1000:10.1f}")
+    print(f"{'speaker emotion means (ms)':<28} {means_models_s * 1000:10.1f} {means_table_s * 1000:10.1f}"
+          f"  x{means_models_s / means_table_s:.0f}")
+    print(f"{'table -> Book (ms)':<28} {'':>10} {to_book_s * 1000:10.1f}")
+    print(f"table columns: {table.nbytes() / (1024 * 1024):.1f} MB, "
+          f"{len(table.speakers)} speakers, {len(table.voices)} voices interned")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, default=60000)
+    parser.add_argument("--per-chapter", type=int, default=300)
+    main(parser.parse_args())
@@ -0,0 +1,88 @@
+"""
+Synthesis scheduler benchmark: whole books of increasing size submitted to
+the local mock TTS server at a fixed concurrency, clip cache off.
+
+Every sentence is queued on the limiter up front, so this shows whether a
+finished request costs O(1) or O(queued sentences): time should stay close to
+sentences * latency / concurrency, and event-loop lag flat, as books grow.
+
+    python backend/benchmarks/bench_synthesis.py --sentences 1000 4000 8000
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.book import Book, Chapter, Sentence
+from app.services.http_clients import get_http_clients
+from app.services.tts.client import TTSClient
+from app.services.tts.limiter import AdaptiveLimiter
+from app.services.tts.scheduler import SynthesisScheduler
+from app.services.tts.voices import VoiceCache
+from mock_tts_server import MockTTSServer, silent_wav
+
+def make_book(sentences: int, per_chapter: int, voice_path: str) -> Book:
+    chapters = []
+    for c in range((sentences + per_chapter - 1) // per_chapter):
+        items = [
+            Sentence(id=f"ch_{c}_s{k}", text=f"第{c}章第{k}句。", metadata={"speaker_audio_path": voice_path})
+            for k in range(min(per_chapter, sentences - c * per_chapter))
+        ]
+        chapters.append(Chapter(id=f"ch_{c}", title=f"第{c + 1}章", sentences=items))
+    return Book(id="bench", title="bench", chapters=chapters)
+
+async def run(server: MockTTSServer, args, sentences: int, tmp: str):
+    voice_path = os.path.join(tmp, "voice.wav")
+    clips_dir = os.path.join(tmp, f"clips_{sentences}")
+    os.makedirs(clips_dir)
+    book = make_book(sentences, args.per_chapter, voice_path)
+    limiter = AdaptiveLimiter(initial=args.concurrency, max_limit=args.concurrency)
+    scheduler = SynthesisScheduler(TTSClient(api_url=server.api_url, voice_cache=VoiceCache()), limiter=limiter)
+    scheduler.batch_processor.clip_cache = None
+
+    lag = 0.0
+    running = True
+
+    async def monitor():
+        nonlocal lag
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag = max(lag, time.perf_counter() - start - 0.01)
+
+    monitor_task = asyncio.ensure_future(monitor())
+    start = time.perf_counter()
+    await scheduler.run(book, clips_dir)
+    elapsed = time.perf_counter() - start
+    running = False
+    await monitor_task
+
+    done = sum(1 for c in book.chapters for s in c.sentences if s.audio_path)
+    assert done == sentences, f"{sentences - done} sentences failed"
+    ideal = sentences * args.latency / args.concurrency
+    print(f"{sentences:>9} {elapsed:9.2f} {ideal:9.2f} {lag * 1000:9.0f}")
+
+async def main(args):
+    server = MockTTSServer(latency=args.latency)
+    await server.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "voice.wav"), "wb") as f:
+            f.write(silent_wav(1.0))
+        print(f"{args.latency * 1000:.0f}ms mock latency, concurrency {args.concurrency}")
+        print(f"{'sentences':>9} {'seconds':>9} {'ideal':>9} {'lag ms':>9}")
+        for sentences in args.sentences:
+            await run(server, args, sentences, tmp)
+    await get_http_clients().aclose()
+    await server.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, nargs="+", default=[1000, 4000, 8000])
+    parser.add_argument("--per-chapter", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=16)
+    asyncio.run(main(parser.parse_args()))
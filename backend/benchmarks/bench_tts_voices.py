@@ -0,0 +1,81 @@
+"""
+TTS reference voice upload benchmark: the speaker WAV sent as multipart with
+every sentence (stock IndexTTS API) vs registered once and referenced by id.
+
+Runs the batch processor against the local mock TTS server, once with voice
+registration and once with the server's registration endpoint disabled, and
+once more with the server "restarted" mid-run to exercise re-registration.
+
+    python backend/benchmarks/bench_tts_voices.py --sentences 600 --voices 6 --voice-kb 800
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.book import Sentence
+from app.services.http_clients import get_http_clients
+from app.services.tts.client import TTSClient, TTSBatchProcessor
+from app.services.tts.voices import VoiceCache
+from mock_tts_server import MockTTSServer, silent_wav
+
+async def run(label: str, args, voice_paths, out_dir: str, voices: bool, restart: bool = False):
+    server = MockTTSServer(latency=args.latency, voices=voices)
+    await server.start()
+    client = TTSClient(api_url=server.api_url, voice_cache=VoiceCache())
+    processor = TTSBatchProcessor(client, max_concurrent=args.concurrency, use_cache=False)
+
+    sentences = [Sentence(id=f"s{i}", text=f"第{i}句，测试文本。") for i in range(args.sentences)]
+    half = len(sentences) // 2
+
+    async def process(batch):
+        await asyncio.gather(*(
+            processor.process_sentence(s, voice_paths[i % len(voice_paths)], out_dir)
+            for i, s in enumerate(batch)
+        ))
+
+    start = time.perf_counter()
+    await process(sentences[:half])
+    if restart:
+        server.forget_voices()
+    await process(sentences[half:])
+    elapsed = time.perf_counter() - start
+    await server.stop()
+
+    done = sum(1 for s in sentences if s.audio_path)
+    print(f"{label:<22} {elapsed:7.2f} {done:>6} {client.voice_uploads:>8} "
+          f"{server.voice_bytes / (1024 * 1024):10.1f} {server.body_bytes / (1024 * 1024):10.1f}")
+    assert done == len(sentences), f"{label}: {len(sentences) - done} sentences failed"
+
+async def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        voice_paths = []
+        for v in range(args.voices):
+            path = os.path.join(tmp, f"voice_{v:02d}.wav")
+            with open(path, "wb") as f:
+                # Roughly voice_kb of 22kHz mono PCM
+                f.write(silent_wav(args.voice_kb * 1024 / (2 * 22050)))
+            voice_paths.append(path)
+        out_dir = os.path.join(tmp, "clips")
+        os.makedirs(out_dir)
+
+        print(f"{args.sentences} sentences, {args.voices} voices x {args.voice_kb} KB, "
+              f"concurrency {args.concurrency}")
+        print(f"{'mode':<22} {'time s':>7} {'clips':>6} {'uploads':>8} {'voice MB':>10} {'sent MB':>10}")
+        await run("multipart per request", args, voice_paths, out_dir, voices=False)
+        await run("registered voices", args, voice_paths, out_dir, voices=True)
+        await run("registered + restart", args, voice_paths, out_dir, voices=True, restart=True)
+    await get_http_clients().aclose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, default=600)
+    parser.add_argument("--voices", type=int, default=6)
+    parser.add_argument("--voice-kb", type=int, default=800)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.01)
+    asyncio.run(main(parser.parse_args()))
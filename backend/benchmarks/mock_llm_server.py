@@ -0,0 +1,118 @@
+"""
+Minimal OpenAI-compatible chat completion server for local benchmarks.
+
+Speaks just enough HTTP/1.1 (keep-alive, Content-Length bodies) to serve
+POST /v1/chat/completions with a fixed artificial latency, so client-side
+concurrency can be measured without a real LLM endpoint.
+
+    python backend/benchmarks/mock_llm_server.py --port 8100 --latency 0.2
+"""
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List
+
+CLEAN_REPLY = {
+    "original_text": "",
+    "is_noise": False,
+    "content_type": "narration",
+    "speaker": "无",
+    "noise_type": None,
+    "process_suggestion": "保留",
+    "cleaned_text": None,
+    "confidence": 0.99
+}
+
+EMOTION_REPLY = {
+    "emotion_vector": [0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.3],
+    "primary_emotion": "平静",
+    "emotion_intensity": 0.5,
+    "reasoning": "mock"
+}
+
+def build_reply(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    system_content = messages[0]["content"] if messages else ""
+    if "批量分析" in system_content:
+        user_content = messages[-1]["content"]
+        items = json.loads(user_content[user_content.index("["):user_content.rindex("]") + 1])
+        return {"results": [
+            {"id": item["id"], **CLEAN_REPLY, **EMOTION_REPLY}
+            for item in items
+        ]}
+    if "清洗助手" in system_content:
+        return CLEAN_REPLY
+    if "情感色彩" in system_content:
+        return EMOTION_REPLY
+    return {}
+
+class MockLLMServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.2):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.request_count = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = {}
+                for line in head.decode("latin-1").split("\r\n")[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                self.request_count += 1
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                try:
+                    await asyncio.sleep(self.latency)
+                    payload = json.loads(body or b"{}")
+                    reply = build_reply(payload.get("messages", []))
+                finally:
+                    self.in_flight -= 1
+
+                data = json.dumps({
+                    "choices": [{"message": {"role": "assistant", "content": json.dumps(reply, ensure_ascii=False)}}]
+                }, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(data)).encode() + b"\r\n\r\n" + data
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+async def _serve(host: str, port: int, latency: float):
+    server = MockLLMServer(host, port, latency)
+    await server.start()
+    print(f"Mock LLM server listening on {server.base_url} (latency {latency}s)")
+    await asyncio.Event().wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+    asyncio.run(_serve(args.host, args.port, args.latency))
@@ -0,0 +1,157 @@
+"""
+Minimal IndexTTS-compatible server for local benchmarks and development.
+
+Serves POST /api/tts (multipart, same fields as the IndexTTS API) with a fixed
+artificial latency and returns a short silent WAV. It also implements the voice
+registration extension the TTS client uses:
+
+    POST /api/voices   multipart speaker_audio -> {"voice_id": "..."}
+    POST /api/tts      voice_id=... instead of the speaker_audio file
+                       (404 if the id is unknown, e.g. after a restart)
+
+Run with --no-voices to behave like a stock IndexTTS server (no registration,
+speaker_audio required on every request).
+
+    python backend/benchmarks/mock_tts_server.py --port 8000 --latency 0.2
+"""
+import io
+import json
+import wave
+import hashlib
+import argparse
+import asyncio
+from typing import Dict, Tuple
+from urllib.parse import parse_qsl
+
+def silent_wav(duration_s: float, framerate: int = 22050) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(framerate)
+        w.writeframes(b"\0\0" * int(framerate * duration_s))
+    return buf.getvalue()
+
+def parse_form(body: bytes, content_type: str) -> Tuple[Dict[str, str], Dict[str, bytes]]:
+    if "multipart/form-data" not in content_type:
+        # Requests without files (voice_id only) arrive urlencoded
+        return dict(parse_qsl(body.decode("utf-8"))), {}
+    boundary = content_type.split("boundary=", 1)[1].strip('"').encode("latin-1")
+    fields, files = {}, {}
+    for part in body.split(b"--" + boundary)[1:]:
+        if part.startswith(b"--"):
+            break
+        head, _, value = part[2:].partition(b"\r\n\r\n")
+        value = value[:-2] # trailing CRLF before the next boundary
+        disposition = head.decode("utf-8").split("\r\n")[0]
+        params = dict(
+            p.strip().split("=", 1) for p in disposition.split(";")[1:] if "=" in p
+        )
+        name = params["name"].strip('"')
+        if "filename" in params:
+            files[name] = value
+        else:
+            fields[name] = value.decode("utf-8")
+    return fields, files
+
+class MockTTSServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.2,
+                 voices: bool = True):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.voices = voices
+        self.request_count = 0
+        self.registrations = 0
+        # Reference audio bytes received, over registrations and per-request uploads
+        self.voice_bytes = 0
+        self.body_bytes = 0
+        self._voices: Dict[str, bytes] = {}
+        self._server = None
+
+    @property
+    def api_url(self) -> str:
+        return f"http://{self.host}:{self.port}/api/tts"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def forget_voices(self):
+        # Simulates a server restart
+        self._voices.clear()
+
+    async def _route(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, str, bytes]:
+        if method != "POST" or path not in ("/api/tts", "/api/voices") or (path == "/api/voices" and not self.voices):
+            return 404, "application/json", b'{"detail": "Not Found"}'
+
+        fields, files = parse_form(body, headers.get("content-type", ""))
+        speaker_audio = files.get("speaker_audio")
+        if speaker_audio is not None:
+            self.voice_bytes += len(speaker_audio)
+
+        if path == "/api/voices":
+            if not speaker_audio:
+                return 422, "application/json", b'{"detail": "speaker_audio required"}'
+            voice_id = hashlib.sha256(speaker_audio).hexdigest()[:16]
+            self._voices[voice_id] = speaker_audio
+            self.registrations += 1
+            return 200, "application/json", json.dumps({"voice_id": voice_id}).encode()
+
+        voice_id = fields.get("voice_id") if self.voices else None
+        if voice_id:
+            if voice_id not in self._voices:
+                return 404, "application/json", b'{"detail": "Unknown voice_id"}'
+        elif not speaker_audio:
+            return 422, "application/json", b'{"detail": "speaker_audio required"}'
+
+        self.request_count += 1
+        await asyncio.sleep(self.latency)
+        return 200, "audio/wav", silent_wav(0.05 + 0.01 * len(fields.get("text", "")))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, path = lines[0].split(" ")[:2]
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.body_bytes += len(body)
+
+                status, content_type, data = await self._route(method, path, headers, body)
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n".encode() +
+                    b"Content-Type: " + content_type.encode() + b"\r\n"
+                    b"Content-Length: " + str(len(data)).encode() + b"\r\n\r\n" + data
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+async def _serve(host: str, port: int, latency: float, voices: bool):
+    server = MockTTSServer(host, port, latency, voices)
+    await server.start()
+    print(f"Mock TTS server listening on {server.api_url} (latency {latency}s, "
+          f"voice registration {'on' if voices else 'off'})")
+    await asyncio.Event().wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--no-voices", action="store_true", help="stock IndexTTS behaviour, no /api/voices")
+    args = parser.parse_args()
+    asyncio.run(_serve(args.host, args.port, args.latency, not args.no_voices))
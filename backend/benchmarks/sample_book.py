@@ -0,0 +1,48 @@
+"""
+Synthetic fully analyzed book (speakers, emotion vectors, voice metadata) shared
+by the benchmarks.
+"""
+import random
+from app.models.book import Book, Chapter, Sentence
+
+TEXTS = [
+    "他抬起头，看着远处的山峦，久久没有说话。",
+    "“你真的要走吗？”她轻声问道。",
+    "风吹过竹林，沙沙作响。",
+    "第二天一早，他们便出发了。",
+]
+SPEAKERS = [None, None, "林远", "苏晴", "老陈", "阿九"]
+VOICES = {None: "V01", "林远": "V03", "苏晴": "V05", "老陈": "V04", "阿九": "V06"}
+EMOTIONS = ["平静", "高兴", "悲伤", "惊讶"]
+
+def make_book(sentences: int, per_chapter: int) -> Book:
+    random.seed(0)
+    chapters = []
+    for c in range((sentences + per_chapter - 1) // per_chapter):
+        chapter_id = f"ch_{c}"
+        items = []
+        pos = 0
+        for k in range(min(per_chapter, sentences - c * per_chapter)):
+            text = random.choice(TEXTS)
+            speaker = random.choice(SPEAKERS)
+            vector = [round(random.random(), 2) for _ in range(8)]
+            items.append(Sentence(
+                id=f"{chapter_id}_s{k}",
+                text=text,
+                start_pos=pos,
+                end_pos=pos + len(text),
+                speaker=speaker,
+                emotion_vector=vector,
+                metadata={
+                    "content_type": "dialogue" if speaker else "narration",
+                    "cleaned_text": None,
+                    "primary_emotion": random.choice(EMOTIONS),
+                    "emotion_intensity": round(random.random(), 2),
+                    "analyzed": True,
+                    "voice_id": VOICES[speaker],
+                    "speaker_audio_path": f"backend/assets/voices/voice_{VOICES[speaker][1:]}.wav"
+                }
+            ))
+            pos += len(text) + 1
+        chapters.append(Chapter(id=chapter_id, title=f"第{c + 1}章", kind="chapter", sentences=items))
+    return Book(id="bench", title="Bench Book", chapters=chapters)
@@ -0,0 +1,72 @@
+"""
+Bulk import of books (files or directories) as projects, parsed in parallel
+across a process pool. Run from the repository root so projects land in
+backend/data like the server's:
+
+    python backend/scripts/bulk_import.py ~/catalogue/*.epub ~/more_books --workers 8
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+SUPPORTED_EXTENSIONS = {".txt", ".md", ".epub"}
+
+def collect(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files += [os.path.join(root, n) for n in sorted(names)
+                          if os.path.splitext(n)[1].lower() in SUPPORTED_EXTENSIONS]
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            print(f"Skipping {path}: not found")
+    return files
+
+async def run(files):
+    # Imported here so --workers is applied before the pool is configured
+    from app.services.project.manager import ProjectManager
+    from app.services.executors import shutdown_executors
+
+    manager = ProjectManager()
+    try:
+        return await manager.import_books([(f, os.path.basename(f)) for f in files])
+    finally:
+        shutdown_executors()
+
+def main(args):
+    if args.workers:
+        os.environ["PROCESS_WORKERS"] = str(args.workers)
+
+    files = collect(args.paths)
+    if not files:
+        print("Nothing to import")
+        return 1
+
+    start = time.perf_counter()
+    results = asyncio.run(run(files))
+    elapsed = time.perf_counter() - start
+
+    print(f"{'file':<40} {'project':<36} {'chapters':>8} {'sentences':>9} {'parse s':>8} {'total s':>8}")
+    for r in results:
+        if r.error:
+            print(f"{r.filename[:40]:<40} FAILED: {r.error}")
+        else:
+            print(f"{r.filename[:40]:<40} {r.project_id:<36} {r.chapters:>8} {r.sentences:>9} "
+                  f"{r.parse_seconds:>8.2f} {r.total_seconds:>8.2f}")
+
+    failed = sum(1 for r in results if r.error)
+    print(f"\n{len(results) - failed}/{len(results)} imported in {elapsed:.2f}s "
+          f"({sum(r.parse_seconds for r in results):.2f}s of parsing)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="+", help="book files or directories to scan")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: CPU count)")
+    sys.exit(main(parser.parse_args()))
@@ -10,6 +10,21 @@ export interface Project {
   updated_at: string
 }
 
+export interface Job {
+  id: string
+  project_id: string
+  type: 'analyze' | 'synthesize'
+  status: 'queued' | 'running' | 'completed' | 'failed' | 'cancelled'
+  created_at: string
+  started_at?: string
+  finished_at?: string
+  error?: string
+  done: number
+  total: number
+  throughput?: number
+  eta_seconds?: number
+}
+
 export interface Book {
   id: string
   title: string
@@ -20,6 +35,7 @@ export interface Book {
 export interface Chapter {
   id: string
   title: string
+  kind?: 'chapter' | 'prologue' | 'epilogue' | 'extra'
   sentences: Sentence[]
 }
 
@@ -30,8 +46,30 @@ export interface Sentence {
   speaker?: string
   emotion_vector?: number[]
   metadata: Record<string, any>
+  version: number
+}
+
+export interface ChapterSummary {
+  id: string
+  title: string
+  kind?: Chapter['kind']
+  audio_path?: string
+  duration: number
+  sentence_count: number
+}
+
+export interface SentencePage {
+  chapter_id: string
+  total: number
+  offset: number
+  limit: number
+  sentences: Partial<Sentence>[]
 }
 
+// Only id, version and the changed fields need to be sent
+export type SentencePatch = Pick<Sentence, 'id' | 'version'> &
+  Partial<Omit<Sentence, 'id' | 'version'>>
+
 export const api = {
   // Projects
   listProjects: async () => {
@@ -62,16 +100,58 @@ export const api = {
     return res.data
   },
 
+  listChapters: async (id: string) => {
+    const res = await axios.get<ChapterSummary[]>(`${API_URL}/api/projects/${id}/chapters`)
+    return res.data
+  },
+
+  getChapterSentences: async (id: string, chapterId: string, offset = 0, limit = 200, fields?: string[]) => {
+    const res = await axios.get<SentencePage>(
+      `${API_URL}/api/projects/${id}/chapters/${chapterId}/sentences`,
+      { params: { offset, limit, fields: fields?.join(',') } }
+    )
+    return res.data
+  },
+
+  // Rejected with 409 if any sentence changed since its version was read
+  patchSentences: async (id: string, chapterId: string, patches: SentencePatch[]) => {
+    const res = await axios.patch<Sentence[]>(
+      `${API_URL}/api/projects/${id}/chapters/${chapterId}/sentences`,
+      patches
+    )
+    return res.data
+  },
+
   // Actions
   analyzeProject: async (id: string) => {
-    const res = await axios.post<Project>(`${API_URL}/api/projects/${id}/analyze`)
+    const res = await axios.post<Job>(`${API_URL}/api/projects/${id}/analyze`)
     return res.data
   },
 
   synthesizeProject: async (id: string) => {
-    const res = await axios.post<Project>(`${API_URL}/api/projects/${id}/synthesize`)
+    const res = await axios.post<Job>(`${API_URL}/api/projects/${id}/synthesize`)
+    return res.data
+  },
+
+  // Jobs
+  getJob: async (id: string) => {
+    const res = await axios.get<Job>(`${API_URL}/api/jobs/${id}`)
     return res.data
   },
+
+  cancelJob: async (id: string) => {
+    const res = await axios.post<Job>(`${API_URL}/api/jobs/${id}/cancel`)
+    return res.data
+  },
+
+  // Poll a job until it leaves the queued/running states
+  waitForJob: async (id: string, intervalMs = 2000) => {
+    for (;;) {
+      const job = await api.getJob(id)
+      if (job.status !== 'queued' && job.status !== 'running') return job
+      await new Promise((resolve) => setTimeout(resolve, intervalMs))
+    }
+  },
   
   checkHealth: async () => {
     const res = await axios.get(`${API_URL}/health`)
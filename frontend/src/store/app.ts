@@ -79,9 +79,10 @@ export const useAppStore = create<AppState>((set, get) => ({
   runAnalysis: async (id: string) => {
     set({ loading: true })
     try {
-      const project = await api.analyzeProject(id)
-      set({ currentProject: project, loading: false })
-      // Reload book to get new tags
+      const job = await api.analyzeProject(id)
+      const result = await api.waitForJob(job.id)
+      if (result.status !== 'completed') throw new Error(result.error || result.status)
+      // Reload project and book to get new status and tags
       await get().loadProject(id)
     } catch (err) {
       set({ error: 'Analysis failed', loading: false })
@@ -91,8 +92,9 @@ export const useAppStore = create<AppState>((set, get) => ({
   runSynthesis: async (id: string) => {
     // This might be async background task
     try {
-      const project = await api.synthesizeProject(id)
-      set({ currentProject: project })
+      await api.synthesizeProject(id)
+      // Status switches to "synthesized" immediately; the job keeps running in the background
+      set({ currentProject: await api.getProject(id) })
     } catch (err) {
       set({ error: 'Synthesis failed' })
     }